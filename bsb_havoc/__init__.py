@@ -7,7 +7,13 @@ __version__ = "1.0.0"
 __author__ = "Black Spammer Bd"
 __license__ = "MIT"
 
+from .api import LoadTest, run_load_test
 from .cli import main
-from .engine import HavocEngine
+from .engine import HavocEngine, Snapshot, TestResult
+from .histogram import LatencyHistogram
+from .sharding import ShardedHavocEngine
 
-__all__ = ['main', 'HavocEngine']
+__all__ = [
+    'main', 'HavocEngine', 'ShardedHavocEngine', 'TestResult', 'LatencyHistogram',
+    'LoadTest', 'run_load_test', 'Snapshot',
+]
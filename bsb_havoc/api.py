@@ -0,0 +1,162 @@
+"""
+BSB Havoc API - Embeddable Load Tests
+🧩 Run load tests from Python code: no signal handlers, no terminal output
+"""
+
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Union
+
+from .engine import HavocEngine, Snapshot, TestResult
+from .sharding import ShardedHavocEngine
+
+# Decides from the latest snapshot whether a test should stop early
+StopCondition = Callable[[Snapshot], bool]
+
+# Called with every snapshot; may be a coroutine function
+SnapshotCallback = Callable[[Snapshot], Union[None, Awaitable[None]]]
+
+
+class LoadTest:
+    """🧩 One load test, run as an async context manager
+
+    The load starts when the ``async with`` block is entered and stops
+    when it is left, when a stop condition is met, or once ``duration``
+    seconds of steady state or ``max_requests`` requests are done.
+    Iterating over the test yields a Snapshot per interval as it
+    happens; ``wait()`` just waits for the end. Tests never install
+    signal handlers or print, so many of them can run one after the
+    other, or side by side, on one event loop::
+
+        async with LoadTest('http://127.0.0.1:8080', concurrency=50, duration=10) as test:
+            async for snapshot in test:
+                print(snapshot.requests_per_second, snapshot.p99_response_time)
+        assert test.result.failed_requests == 0
+    """
+
+    def __init__(self, target_url: str, concurrency: int = 100, duration: Optional[float] = None,
+                 max_requests: Optional[int] = None, stop_when: Optional[StopCondition] = None,
+                 interval: float = 1.0, processes: int = 1, **engine_options):
+        """
+        Configure a load test
+
+        Args:
+            target_url: URL to load, or the base URL of a scenario
+            concurrency: Concurrent workers (caps requests in flight with a rate)
+            duration: Seconds of steady state (default: until stopped)
+            max_requests: Stop after this many requests
+            stop_when: Stop as soon as this returns True for a snapshot
+            interval: Seconds between snapshots
+            processes: Worker processes sharing the load
+            **engine_options: Further HavocEngine options (rate, warmup,
+                ramp, drain, backend, scenario, payload, ...)
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+
+        engine_options.update(handle_signals=False, headless=True, max_requests=max_requests)
+        if processes > 1:
+            self.engine: HavocEngine = ShardedHavocEngine(target_url, concurrency, processes, **engine_options)
+        else:
+            self.engine = HavocEngine(target_url, concurrency, **engine_options)
+
+        self.duration = duration
+        self.stop_when = stop_when
+        self.interval = interval
+        self.snapshots: List[Snapshot] = []
+        self.result: Optional[TestResult] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'LoadTest':
+        """Start the load"""
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drive())
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        """Stop the load and wait for the final results"""
+        self.engine.stop()
+        await asyncio.gather(self._task, return_exceptions=True)
+        if exc_type is None:
+            self._check_failure()
+        self.result = self.engine.results
+
+    async def _drive(self):
+        """Run the engine, keeping and handing out its snapshots"""
+        try:
+            async for snapshot in self.engine.snapshots(self.duration, self.interval):
+                self.snapshots.append(snapshot)
+                self._queue.put_nowait(snapshot)
+                if self.stop_when and self.stop_when(snapshot):
+                    self.engine.stop()
+        finally:
+            # End of the stream for anyone iterating
+            self._queue.put_nowait(None)
+
+    def _check_failure(self):
+        """Re-raise an error the engine stopped with"""
+        if self._task and self._task.done() and not self._task.cancelled() and self._task.exception():
+            raise self._task.exception()
+
+    def __aiter__(self) -> 'LoadTest':
+        return self
+
+    async def __anext__(self) -> Snapshot:
+        """Next interval's snapshot, as soon as it is taken"""
+        if self._task is None:
+            raise RuntimeError("Enter the LoadTest with 'async with' before iterating over it")
+
+        snapshot = await self._queue.get()
+        if snapshot is None:
+            self._queue.put_nowait(None)
+            self._check_failure()
+            raise StopAsyncIteration
+        return snapshot
+
+    def stop(self):
+        """Stop the load early; the results cover what ran until now"""
+        self.engine.stop()
+
+    async def wait(self) -> TestResult:
+        """Wait until a stop condition ends the test, then return its results"""
+        if self._task is None:
+            raise RuntimeError("Enter the LoadTest with 'async with' before waiting for it")
+
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._check_failure()
+        self.result = self.engine.results
+        return self.result
+
+
+async def run_load_test(target_url: str, concurrency: int = 100, duration: Optional[float] = None,
+                        max_requests: Optional[int] = None, stop_when: Optional[StopCondition] = None,
+                        on_snapshot: Optional[SnapshotCallback] = None, interval: float = 1.0,
+                        processes: int = 1, **engine_options) -> TestResult:
+    """
+    Run one load test to completion
+
+    Args:
+        target_url: URL to load, or the base URL of a scenario
+        concurrency: Concurrent workers
+        duration: Seconds of steady state
+        max_requests: Stop after this many requests
+        stop_when: Stop as soon as this returns True for a snapshot
+        on_snapshot: Called with every snapshot (plain or coroutine function)
+        interval: Seconds between snapshots
+        processes: Worker processes sharing the load
+        **engine_options: Further HavocEngine options
+
+    Returns:
+        TestResult of the measured phase
+    """
+    if duration is None and max_requests is None and stop_when is None:
+        raise ValueError("run_load_test needs duration, max_requests or stop_when to ever finish")
+
+    async with LoadTest(target_url, concurrency, duration, max_requests, stop_when, interval, processes,
+                        **engine_options) as test:
+        async for snapshot in test:
+            if on_snapshot:
+                outcome = on_snapshot(snapshot)
+                if asyncio.iscoroutine(outcome):
+                    await outcome
+    return test.result
@@ -0,0 +1,313 @@
+"""
+BSB Havoc Baseline - Stored Runs and Statistical Comparison
+⚖️ Tells a real regression apart from run-to-run noise
+"""
+
+import json
+import os
+import random
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from colorama import Fore, Style
+
+from .histogram import LatencyHistogram
+
+# Where saved run summaries live unless told otherwise
+RESULTS_DIR = os.path.join('.bsb-havoc', 'results')
+
+# Version of the saved run summary layout
+SUMMARY_FORMAT = 1
+
+# Compared metrics: label and whether a higher value is better
+COMPARED_METRICS = {
+    'p50': ('P50 latency', False),
+    'p90': ('P90 latency', False),
+    'p99': ('P99 latency', False),
+    'mean': ('Mean latency', False),
+    'rps': ('Requests/sec', True),
+    'error_rate': ('Error rate', False),
+}
+
+# Error rates are compared in absolute terms: this many percentage points is noise
+ERROR_RATE_TOLERANCE = 0.001
+
+# Consecutive seconds are folded into at most this many blocks before resampling
+MAX_BLOCKS = 60
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 1000
+DEFAULT_TOLERANCE = 0.05
+
+
+def summarize(engine, name: str) -> Dict[str, Any]:
+    """
+    Capture a finished run for later comparison
+
+    Args:
+        engine: HavocEngine after run() returned
+        name: Name the run is saved under
+
+    Returns:
+        Summary with the results, the full latency histogram and the
+        per-second counters and coarse histograms
+    """
+    return {
+        'format': SUMMARY_FORMAT,
+        'name': name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'target_url': engine.target_url,
+        'result': engine.results.to_dict(),
+        'histogram': engine.histogram.to_dict(),
+        'intervals': engine.interval_histograms,
+    }
+
+
+def _path(results_dir: str, name: str) -> str:
+    """File a run named ``name`` is stored in"""
+    if not re.match(r'^[\w.-]+$', name):
+        raise ValueError(f"Invalid run name '{name}' (letters, digits, '.', '_' and '-' only)")
+    return os.path.join(results_dir, f"{name}.json")
+
+
+def save(summary: Dict[str, Any], results_dir: str = RESULTS_DIR) -> str:
+    """
+    Store a run summary in the results directory
+
+    Returns:
+        Path of the written file
+    """
+    path = _path(results_dir, summary['name'])
+    os.makedirs(results_dir, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+    return path
+
+
+def load(reference: str, results_dir: str = RESULTS_DIR) -> Dict[str, Any]:
+    """Load a run summary by file path or by the name it was saved under"""
+    path = reference if os.path.isfile(reference) else _path(results_dir, reference)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No saved run '{reference}' in {results_dir}")
+
+    with open(path, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    if summary.get('format') != SUMMARY_FORMAT:
+        raise ValueError(f"{path} is not a BSB Havoc run summary (format {SUMMARY_FORMAT})")
+    return summary
+
+
+def list_runs(results_dir: str = RESULTS_DIR) -> List[Dict[str, Any]]:
+    """Saved run summaries, oldest first"""
+    if not os.path.isdir(results_dir):
+        return []
+
+    runs = []
+    for entry in sorted(os.listdir(results_dir)):
+        if entry.endswith('.json'):
+            try:
+                runs.append(load(os.path.join(results_dir, entry)))
+            except (ValueError, OSError):
+                continue
+    return sorted(runs, key=lambda run: run['created'])
+
+
+class _Block:
+    """Consecutive seconds of one run, folded together"""
+
+    __slots__ = ('duration', 'requests', 'failed', 'latency')
+
+    def __init__(self, duration: float, requests: int, failed: int, latency: Dict):
+        self.duration = duration
+        self.requests = requests
+        self.failed = failed
+        self.latency = latency
+
+
+def _blocks(summary: Dict[str, Any]) -> List[_Block]:
+    """Fold a run's per-second history into at most MAX_BLOCKS blocks"""
+    series = summary['result'].get('timeseries') or []
+    intervals = summary.get('intervals') or []
+    if not series or len(series) != len(intervals):
+        return []
+
+    size = -(-len(series) // MAX_BLOCKS)
+    blocks = []
+    for start in range(0, len(series), size):
+        previous = series[start - 1]['elapsed'] if start else 0.0
+        chunk = series[start:start + size]
+        histogram = LatencyHistogram.from_dict(intervals[start])
+        for latency in intervals[start + 1:start + size]:
+            histogram.merge_dict(latency)
+        blocks.append(_Block(
+            chunk[-1]['elapsed'] - previous,
+            sum(point['requests'] for point in chunk),
+            sum(point['failed'] for point in chunk),
+            histogram.to_dict(),
+        ))
+    return blocks
+
+
+def _metrics(histogram: LatencyHistogram, duration: float, requests: int, failed: int) -> Dict[str, float]:
+    """Compared metrics of a set of requests, latencies in seconds"""
+    p50, p90, p99 = histogram.percentiles([50, 90, 99])
+    return {
+        'p50': p50 / 1e9,
+        'p90': p90 / 1e9,
+        'p99': p99 / 1e9,
+        'mean': histogram.mean / 1e9,
+        'rps': requests / duration if duration else 0.0,
+        'error_rate': failed / requests if requests else 0.0,
+    }
+
+
+def _run_metrics(summary: Dict[str, Any]) -> Dict[str, float]:
+    """Compared metrics of a whole run, from its full-precision histogram"""
+    result = summary['result']
+    return _metrics(LatencyHistogram.from_dict(summary['histogram']), result['total_time'],
+                    result['total_requests'], result['failed_requests'])
+
+
+def _resample(blocks: List[_Block], rng: random.Random, histogram: LatencyHistogram) -> Dict[str, float]:
+    """Metrics of one bootstrap resample of a run's blocks"""
+    histogram.reset()
+    duration = requests = failed = 0
+    for block in rng.choices(blocks, k=len(blocks)):
+        histogram.merge_dict(block.latency)
+        duration += block.duration
+        requests += block.requests
+        failed += block.failed
+    return _metrics(histogram, duration, requests, failed)
+
+
+def _change(metric: str, baseline: float, candidate: float) -> Optional[float]:
+    """Relative change, or the absolute change for error rates"""
+    if metric == 'error_rate':
+        return candidate - baseline
+    return candidate / baseline - 1 if baseline else None
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Value at ``fraction`` of the sorted values"""
+    return values[min(len(values) - 1, max(0, int(round(fraction * (len(values) - 1)))))]
+
+
+def compare(baseline: Dict[str, Any], candidate: Dict[str, Any], confidence: float = DEFAULT_CONFIDENCE,
+            resamples: int = DEFAULT_RESAMPLES, tolerance: float = DEFAULT_TOLERANCE,
+            seed: int = 0) -> Dict[str, Any]:
+    """
+    Compare a candidate run against a baseline run
+
+    Point estimates come from each run's full-precision histogram.
+    Confidence intervals come from a block bootstrap: each run's seconds
+    are folded into consecutive blocks (so slow stretches stay together)
+    and blocks are resampled with replacement. A metric regressed or
+    improved only when its interval excludes zero and the change exceeds
+    the tolerance; runs without per-second history only get the tolerance
+    check.
+
+    Args:
+        baseline: Run summary of the reference build
+        candidate: Run summary of the build under test
+        confidence: Confidence level of the intervals (0-1)
+        resamples: Bootstrap resamples
+        tolerance: Relative change treated as noise (error rates use ERROR_RATE_TOLERANCE)
+        seed: Random seed, so a comparison is reproducible
+
+    Returns:
+        Dict with 'verdict' ('regressed', 'improved' or 'unchanged') and
+        one row per metric
+    """
+    base_point, cand_point = _run_metrics(baseline), _run_metrics(candidate)
+    base_blocks, cand_blocks = _blocks(baseline), _blocks(candidate)
+
+    samples: Dict[str, List[float]] = {metric: [] for metric in COMPARED_METRICS}
+    if len(base_blocks) > 1 and len(cand_blocks) > 1:
+        rng = random.Random(seed)
+        histogram = LatencyHistogram.from_dict(base_blocks[0].latency)
+        for _ in range(resamples):
+            base = _resample(base_blocks, rng, histogram)
+            cand = _resample(cand_blocks, rng, histogram)
+            for metric in COMPARED_METRICS:
+                change = _change(metric, base[metric], cand[metric])
+                if change is not None:
+                    samples[metric].append(change)
+
+    rows = []
+    for metric, (label, higher_is_better) in COMPARED_METRICS.items():
+        change = _change(metric, base_point[metric], cand_point[metric])
+        values = sorted(samples[metric])
+        low = _percentile(values, (1 - confidence) / 2) if values else None
+        high = _percentile(values, (1 + confidence) / 2) if values else None
+
+        verdict = 'unchanged'
+        limit = ERROR_RATE_TOLERANCE if metric == 'error_rate' else tolerance
+        significant = low is None or low > 0 or high < 0
+        if change is not None and significant and abs(change) > limit:
+            worse = change < 0 if higher_is_better else change > 0
+            verdict = 'regressed' if worse else 'improved'
+
+        rows.append({
+            'metric': metric,
+            'label': label,
+            'baseline': base_point[metric],
+            'candidate': cand_point[metric],
+            'change': change,
+            'low': low,
+            'high': high,
+            'verdict': verdict,
+        })
+
+    verdicts = {row['verdict'] for row in rows}
+    overall = 'regressed' if 'regressed' in verdicts else 'improved' if 'improved' in verdicts else 'unchanged'
+    return {
+        'baseline': baseline['name'],
+        'candidate': candidate['name'],
+        'confidence': confidence,
+        'resamples': resamples if samples['p50'] else 0,
+        'tolerance': tolerance,
+        'verdict': overall,
+        'rows': rows,
+    }
+
+
+def _format_value(metric: str, value: float) -> str:
+    """Human readable metric value"""
+    if metric == 'rps':
+        return f"{value:,.0f}"
+    if metric == 'error_rate':
+        return f"{value*100:.2f}%"
+    return f"{value*1000:.1f}ms"
+
+
+def _format_change(metric: str, value: Optional[float]) -> str:
+    """Human readable change"""
+    if value is None:
+        return 'n/a'
+    if metric == 'error_rate':
+        return f"{value*100:+.2f}pp"
+    return f"{value*100:+.1f}%"
+
+
+def print_comparison(report: Dict[str, Any]):
+    """Print a comparison produced by ``compare``"""
+    colors = {'regressed': Fore.RED, 'improved': Fore.GREEN, 'unchanged': Fore.WHITE}
+    interval = f"{report['confidence']*100:g}% CI" if report['resamples'] else "no CI"
+
+    print(f"\n{Fore.YELLOW}⚖️  {report['candidate']} vs {report['baseline']} "
+          f"({interval}, tolerance {report['tolerance']*100:g}%):{Style.RESET_ALL}")
+    print(f"  {Fore.WHITE}{'Metric':<15}{'Baseline':>12}{'Candidate':>12}{'Change':>10}"
+          f"{'Interval':>22}  Verdict{Style.RESET_ALL}")
+    for row in report['rows']:
+        metric = row['metric']
+        bounds = (f"[{_format_change(metric, row['low'])}, {_format_change(metric, row['high'])}]"
+                  if row['low'] is not None else '')
+        color = colors[row['verdict']]
+        print(f"  {row['label']:<15}{_format_value(metric, row['baseline']):>12}"
+              f"{_format_value(metric, row['candidate']):>12}{_format_change(metric, row['change']):>10}"
+              f"{bounds:>22}  {color}{row['verdict']}{Style.RESET_ALL}")
+
+    verdict = report['verdict']
+    icon = {'regressed': '❌', 'improved': '🚀', 'unchanged': '✅'}[verdict]
+    print(f"\n{colors[verdict]}{Style.BRIGHT}{icon} VERDICT: {verdict.upper()}{Style.RESET_ALL}")
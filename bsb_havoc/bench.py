@@ -0,0 +1,363 @@
+"""
+BSB Havoc Bench - Engine Self-Benchmark
+🏎️ Measures the load generator itself against a local loopback target
+"""
+
+import asyncio
+import json
+import multiprocessing
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from colorama import Fore, Style
+
+from .engine import HavocEngine, TestResult
+
+# Fixed responses served by the bench target
+TINY_BODY = b'ok'
+LARGE_BODY = b'x' * (1024 * 1024)
+DELAY_SECONDS = 0.05
+
+# Version of the bench JSON layout, bumped when metrics change meaning
+BENCH_FORMAT = 1
+
+# Metrics compared against a baseline, and whether higher values are better
+COMPARED_METRICS = {
+    'rps': True,
+    'rps_per_core': True,
+    'cpu_us_per_request': False,
+    'latency_floor_us': False,
+    'bytes_per_inflight': False,
+}
+
+
+def _response(body: bytes, close: bool) -> bytes:
+    headers = [b'HTTP/1.1 200 OK', b'Content-Type: text/plain', b'Content-Length: %d' % len(body)]
+    if close:
+        headers.append(b'Connection: close')
+    return b'\r\n'.join(headers) + b'\r\n\r\n' + body
+
+
+class _BenchTargetProtocol(asyncio.Protocol):
+    """Minimal HTTP/1.1 responder: fixed bodies, keep-alive, no request bodies"""
+
+    ROUTES = {
+        b'/tiny': TINY_BODY,
+        b'/large': LARGE_BODY,
+        b'/delay': TINY_BODY,
+    }
+    RESPONSES = {
+        (path, close): _response(body, close)
+        for path, body in ROUTES.items() for close in (False, True)
+    }
+    NOT_FOUND = b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n'
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.buffer = b''
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        while True:
+            end = self.buffer.find(b'\r\n\r\n')
+            if end < 0:
+                return
+            head, self.buffer = self.buffer[:end], self.buffer[end + 4:]
+            parts = head.split(b' ', 2)
+            path = parts[1].split(b'?', 1)[0] if len(parts) > 1 else b''
+            close = b'connection: close' in head.lower()
+
+            response = self.RESPONSES.get((path, close), self.NOT_FOUND)
+            if path == b'/delay':
+                asyncio.get_running_loop().call_later(DELAY_SECONDS, self._send, response, close)
+            else:
+                self._send(response, close)
+
+    def _send(self, response: bytes, close: bool):
+        if self.transport.is_closing():
+            return
+        self.transport.write(response)
+        if close:
+            self.transport.close()
+
+
+def _serve(port_queue):
+    """Entry point of the bench target process"""
+    async def serve():
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(_BenchTargetProtocol, '127.0.0.1', 0, backlog=4096)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+
+class BenchTarget:
+    """🎯 Loopback target running in its own process, so its CPU is not billed to the engine"""
+
+    def __init__(self):
+        self.port = 0
+        self._process = None
+
+    def start(self) -> str:
+        """
+        Start the target process
+
+        Returns:
+            Base URL of the target
+        """
+        context = multiprocessing.get_context('spawn')
+        port_queue = context.Queue()
+        self._process = context.Process(target=_serve, args=(port_queue,), daemon=True)
+        self._process.start()
+        self.port = port_queue.get(timeout=30)
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self):
+        """Terminate the target process"""
+        if self._process:
+            self._process.terminate()
+            self._process.join(timeout=5)
+            self._process = None
+
+
+@dataclass
+class BenchCase:
+    """One engine configuration measured by the suite"""
+    name: str
+    description: str
+    path: str = '/tiny'
+    concurrency: int = 64
+    options: Dict[str, Any] = field(default_factory=dict)
+    rate_share: float = 0.0
+    measure_memory: bool = False
+
+
+# Every case runs in this process; sharding multiplies these numbers by the process count
+BENCH_CASES = (
+    BenchCase('closed-tiny', 'Closed loop, keep-alive, tiny responses'),
+    BenchCase('open-tiny', 'Open loop at half the closed-loop throughput', rate_share=0.5),
+    BenchCase('close-tiny', 'New connection per request', options={'connection_mode': 'close'}),
+    BenchCase('stream-large', '1 MiB responses drained as a stream', path='/large', concurrency=16,
+              options={'stream_body': True}),
+    BenchCase('trace-tiny', 'Per-phase tracing enabled', options={'trace_phases': True}),
+    BenchCase('raw-tiny', 'Raw HTTP/1.1 backend, keep-alive', options={'backend': 'raw'}),
+    BenchCase('raw-pipelined', 'Raw HTTP/1.1 backend, 8 requests pipelined per connection',
+              concurrency=256, options={'backend': 'raw', 'pipeline_depth': 8}),
+    BenchCase('latency-floor', 'One request at a time', concurrency=1),
+    BenchCase('memory-inflight', f'{DELAY_SECONDS*1000:.0f} ms responses, memory per request in flight',
+              path='/delay', concurrency=1000, measure_memory=True),
+)
+
+
+class HavocBench:
+    """🏎️ Runs the engine against a loopback target and measures its own cost"""
+
+    def __init__(self, duration: float = 5.0, cases: Optional[List[str]] = None,
+                 inflight: int = 1000, verbose: bool = True):
+        """
+        Initialize the suite
+
+        Args:
+            duration: Seconds each case is measured for
+            cases: Names of the cases to run (default: all)
+            inflight: Requests held in flight by the memory case
+            verbose: Print a line per case
+        """
+        known = {case.name: case for case in BENCH_CASES}
+        unknown = [name for name in cases or () if name not in known]
+        if unknown:
+            raise ValueError(f"Unknown bench case(s): {', '.join(unknown)} (choose from {', '.join(known)})")
+
+        self.duration = duration
+        self.cases = [known[name] for name in cases] if cases else list(BENCH_CASES)
+        self.inflight = inflight
+        self.verbose = verbose
+        self._closed_rps = 0.0
+
+    async def _measure(self, base_url: str, case: BenchCase) -> Dict[str, float]:
+        """Run one case and derive its metrics"""
+        concurrency = self.inflight if case.measure_memory else case.concurrency
+        options = dict(case.options)
+        if case.rate_share:
+            # Stay below saturation so the schedule, not the target, sets the pace
+            options['rate'] = max(1.0, (self._closed_rps or 1000.0) * case.rate_share)
+
+        if case.measure_memory:
+            tracemalloc.start()
+        engine = HavocEngine(base_url + case.path, concurrency, handle_signals=False, **options)
+        memory_before = tracemalloc.get_traced_memory()[0] if case.measure_memory else 0
+
+        cpu_before = time.process_time()
+        result: TestResult = await engine.run_window(self.duration)
+        cpu = time.process_time() - cpu_before
+
+        metrics = {
+            'requests': result.total_requests,
+            'failed': result.failed_requests,
+            'rps': result.requests_per_second,
+            'rps_per_core': result.total_requests / cpu if cpu > 0 else 0.0,
+            'cpu_us_per_request': cpu / result.total_requests * 1e6 if result.total_requests else 0.0,
+            'cpu_utilization': cpu / result.total_time if result.total_time else 0.0,
+            'mb_per_second': result.bytes_per_second / 1e6,
+            'p50_us': result.median_response_time * 1e6,
+            'p99_us': result.p99_response_time * 1e6,
+        }
+
+        if options.get('rate'):
+            metrics['target_rate'] = options['rate']
+
+        if case.name == 'latency-floor' and result.successful_requests:
+            metrics['latency_floor_us'] = result.min_response_time * 1e6
+
+        if case.measure_memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            # Allocation tracing distorts timing, so only memory is reported
+            metrics = {
+                'requests': result.total_requests,
+                'failed': result.failed_requests,
+                'bytes_per_inflight': max(0, peak - memory_before) / concurrency,
+            }
+
+        if case.name == 'closed-tiny':
+            self._closed_rps = result.requests_per_second
+        return metrics
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run every selected case
+
+        Returns:
+            Machine-readable results, see ``save``
+        """
+        target = BenchTarget()
+        base_url = await asyncio.get_running_loop().run_in_executor(None, target.start)
+        report = {
+            'format': BENCH_FORMAT,
+            'created': time.time(),
+            'environment': environment(),
+            'duration': self.duration,
+            'cases': {},
+        }
+
+        try:
+            # Prime the closed-loop throughput that open-loop cases are scaled from
+            if any(case.rate_share for case in self.cases) and not any(case.name == 'closed-tiny' for case in self.cases):
+                await self._measure(base_url, BENCH_CASES[0])
+
+            for case in self.cases:
+                metrics = await self._measure(base_url, case)
+                report['cases'][case.name] = metrics
+                if self.verbose:
+                    self._print_case(case, metrics)
+        finally:
+            target.stop()
+
+        return report
+
+    def _print_case(self, case: BenchCase, metrics: Dict[str, float]):
+        failed = f" | {Fore.RED}FAILED: {metrics['failed']:,}" if metrics['failed'] else ""
+        if 'bytes_per_inflight' in metrics:
+            print(f"{Fore.CYAN}🏎️  {case.name:<16}{Style.RESET_ALL} | "
+                  f"MEM: {metrics['bytes_per_inflight']/1024:.1f} KiB per request in flight "
+                  f"({self.inflight:,} in flight){failed}{Style.RESET_ALL}")
+            return
+
+        extra = ""
+        if 'latency_floor_us' in metrics:
+            extra = f" | FLOOR: {metrics['latency_floor_us']:.0f}µs"
+        elif metrics['mb_per_second'] >= 1:
+            extra = f" | MB/s: {metrics['mb_per_second']:.0f}"
+
+        print(f"{Fore.CYAN}🏎️  {case.name:<16}{Style.RESET_ALL} | "
+              f"RPS: {metrics['rps']:>8,.0f} | "
+              f"RPS/CORE: {metrics['rps_per_core']:>8,.0f} | "
+              f"CPU: {metrics['cpu_us_per_request']:>6.1f}µs/req | "
+              f"P50: {metrics['p50_us']/1000:>6.2f}ms{extra}{failed}{Style.RESET_ALL}")
+
+
+def environment() -> Dict[str, str]:
+    """Describe the build and machine a bench ran on"""
+    from . import __version__
+    return {
+        'version': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'aiohttp': aiohttp.__version__,
+        'platform': f"{platform.system()} {platform.release()}",
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+    }
+
+
+def save(report: Dict[str, Any], path: str):
+    """Write a bench report as JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    """Read a bench report written by ``save``"""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if report.get('format') != BENCH_FORMAT:
+        raise ValueError(f"{path} is not a BSB Havoc bench report (format {BENCH_FORMAT})")
+    return report
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare two bench reports metric by metric
+
+    Args:
+        current: Report of the build under test
+        baseline: Report of the reference build
+        tolerance: Relative change in the worse direction accepted before flagging a regression
+
+    Returns:
+        One row per metric present in both reports, with 'change' as a
+        fraction and 'regression' set when it exceeds the tolerance
+    """
+    rows = []
+    for name, metrics in current['cases'].items():
+        reference = baseline['cases'].get(name)
+        if not reference:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            if metric not in metrics or not reference.get(metric):
+                continue
+            if metric == 'rps' and 'target_rate' in metrics:
+                # The schedule, not the engine, sets open-loop throughput
+                continue
+            change = metrics[metric] / reference[metric] - 1
+            worse = -change if higher_is_better else change
+            rows.append({
+                'case': name,
+                'metric': metric,
+                'baseline': reference[metric],
+                'current': metrics[metric],
+                'change': change,
+                'regression': worse > tolerance,
+            })
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, Any]], tolerance: float):
+    """Print a comparison table produced by ``compare``"""
+    print(f"\n{Fore.YELLOW}📊 COMPARISON WITH BASELINE (tolerance {tolerance*100:g}%):{Style.RESET_ALL}")
+    print(f"  {Fore.WHITE}{'Case':<18}{'Metric':<22}{'Baseline':>12}{'Current':>12}{'Change':>10}{Style.RESET_ALL}")
+    for row in rows:
+        color = Fore.RED if row['regression'] else Fore.GREEN
+        print(f"  {row['case']:<18}{row['metric']:<22}{row['baseline']:>12,.1f}{row['current']:>12,.1f}"
+              f"{color}{row['change']*100:>+9.1f}%{Style.RESET_ALL}")
+
+    regressions = sum(row['regression'] for row in rows)
+    if regressions:
+        print(f"\n{Fore.RED}❌ {regressions} metric(s) regressed beyond {tolerance*100:g}%{Style.RESET_ALL}")
+    else:
+        print(f"\n{Fore.GREEN}✅ No regressions beyond {tolerance*100:g}%{Style.RESET_ALL}")
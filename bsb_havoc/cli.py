@@ -4,14 +4,31 @@ BSB Havoc CLI - Professional Command Line Interface
 """
 
 import sys
+import json
 import argparse
 import asyncio
 import platform
-from colorama import Fore, Style, init as colorama_init
-from .engine import HavocEngine
+import signal
+import time
+from typing import Optional
+from colorama import Fore, Style, deinit as colorama_deinit, init as colorama_init
+from . import baseline, bench, report
+from .distributed import AGENT_REPORT_INTERVAL, DEFAULT_AGENT_PORT, DistributedHavocEngine, HavocAgent, parse_address
+from .engine import HavocEngine, BACKENDS, CONNECTION_MODES
+from .payloads import DEFAULT_POOL_SIZE, PayloadPool
+from .rawhttp import install_uvloop, running_uvloop
+from .recorder import RECORD_FORMATS
+from .scenario import METHODS, Scenario
+from .timeseries import LIVE_WINDOWS
+from .search import CapacitySearch, SEARCH_MODES, parse_slo
+from .sharding import ShardedHavocEngine
 from . import __version__
 
-colorama_init()
+
+# Exit codes of a load test run
+EXIT_PASSED = 0
+EXIT_THRESHOLDS_FAILED = 1
+EXIT_ERROR = 2
 
 class BSBHavocCLI:
     """Professional CLI for BSB Havoc"""
@@ -51,7 +68,21 @@ class BSBHavocCLI:
         
         return url
     
-    def parse_arguments(self):
+    def parse_rate(self, rate: str) -> float:
+        """Parse an arrival rate such as 5000, 5000/s, 300/m or 100000/h"""
+        units = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600}
+        count, _, unit = rate.strip().partition('/')
+        
+        try:
+            value = float(count) / units[unit.strip().lower() or 's']
+        except (ValueError, KeyError):
+            raise ValueError(f"Invalid rate '{rate}' (expected e.g. 5000/s, 300/m)")
+        
+        if value <= 0:
+            raise ValueError(f"Rate must be positive, got '{rate}'")
+        return value
+    
+    def parse_arguments(self, argv=None):
         """Parse command line arguments"""
         parser = argparse.ArgumentParser(
             description='BSB Havoc - Professional Load Testing Tool',
@@ -62,7 +93,7 @@ class BSBHavocCLI:
         parser.add_argument(
             'target',
             nargs='?',
-            help='Target website URL (e.g., example.com or http://example.com)'
+            help='Target website URL (e.g., example.com or http://example.com), or scenario base URL'
         )
         
         parser.add_argument(
@@ -72,6 +103,122 @@ class BSBHavocCLI:
             help='Maximum concurrent connections (default: 1000)'
         )
         
+        parser.add_argument(
+            '-r', '--rate',
+            help='Open-loop arrival rate, e.g. 5000/s (default: closed loop)'
+        )
+        
+        parser.add_argument(
+            '-d', '--duration',
+            type=float,
+            metavar='SEC',
+            help='Stop after SEC seconds of steady state (default: run until Ctrl+C)'
+        )
+        
+        parser.add_argument(
+            '--warmup',
+            type=float,
+            default=0.0,
+            metavar='SEC',
+            help='Seconds of load before the ramp, left out of the results (default: 0)'
+        )
+        
+        parser.add_argument(
+            '--ramp',
+            type=float,
+            default=0.0,
+            metavar='SEC',
+            help='Seconds over which the load rises to -c (or --rate) before the steady state (default: 0)'
+        )
+        
+        parser.add_argument(
+            '--drain',
+            type=float,
+            default=0.0,
+            metavar='SEC',
+            help='Seconds in-flight requests get to finish at the end, reported separately (default: 0)'
+        )
+        
+        parser.add_argument(
+            '-n', '--requests',
+            type=int,
+            metavar='NUM',
+            help='Stop after NUM requests have completed'
+        )
+        
+        parser.add_argument(
+            '--threshold',
+            metavar='SLO',
+            help='Fail with exit code 1 unless the run meets SLO, e.g. p95<300ms,errors<1%%,rps>500'
+        )
+        
+        parser.add_argument(
+            '--headless',
+            action='store_true',
+            help='No banner, countdown, colors or live status line (for CI)'
+        )
+        
+        parser.add_argument(
+            '-o', '--output',
+            metavar='FILE',
+            help='Write the final results to FILE as JSON'
+        )
+        
+        parser.add_argument(
+            '--save',
+            metavar='NAME',
+            help='Store the run summary as NAME in the results directory for bsb-havoc compare'
+        )
+        
+        parser.add_argument(
+            '--results-dir',
+            default=baseline.RESULTS_DIR,
+            metavar='DIR',
+            help=f'Directory of saved run summaries (default: {baseline.RESULTS_DIR})'
+        )
+        
+        parser.add_argument(
+            '--live-window',
+            type=int,
+            default=1,
+            choices=LIVE_WINDOWS,
+            metavar='SEC',
+            help='Seconds the live RPS, error rate and percentiles cover: 1, 10 or 60 (default: 1)'
+        )
+        
+        parser.add_argument(
+            '--metrics-port',
+            type=int,
+            metavar='PORT',
+            help='Serve live metrics in OpenMetrics format on http://127.0.0.1:PORT/metrics'
+        )
+        
+        parser.add_argument(
+            '--agents',
+            metavar='HOST:PORT,...',
+            help='Run as controller: split the load across these agents and merge their statistics'
+        )
+        
+        parser.add_argument(
+            '--record',
+            metavar='FILE',
+            help='Stream one record per request to FILE (.ndjson or .bin)'
+        )
+        
+        parser.add_argument(
+            '--record-format',
+            choices=RECORD_FORMATS,
+            help='Per-request record format (default: from the file extension)'
+        )
+        
+        parser.add_argument(
+            '--profile',
+            metavar='FILE',
+            help='Sample the event loop thread and write folded stacks to FILE when the run ends'
+        )
+        
+        self._add_engine_arguments(parser)
+        
         parser.add_argument(
             '-v', '--version',
             action='store_true',
@@ -84,7 +231,498 @@ class BSBHavocCLI:
             help='Show this help message'
         )
         
-        return parser.parse_args()
+        return parser.parse_args(argv)
+    
+    def _add_engine_arguments(self, parser: argparse.ArgumentParser):
+        """Add the engine tuning options shared by every command that runs load"""
+        parser.add_argument(
+            '--scenario',
+            metavar='FILE',
+            help='JSON file of weighted request templates to send instead of GET <target_url>'
+        )
+        
+        parser.add_argument(
+            '-X', '--method',
+            type=str.upper,
+            choices=METHODS,
+            metavar='METHOD',
+            help='HTTP method sent to <target_url> (default: POST with a body, else GET)'
+        )
+        
+        parser.add_argument(
+            '--body',
+            metavar='TEMPLATE',
+            help='Request body; {{index}}, {{uuid}}, {{random}} vary per pooled body, '
+                 '{{seq}}, {{timestamp}} per request'
+        )
+        
+        parser.add_argument(
+            '--body-file',
+            metavar='FILE',
+            help='Sample request bodies, one per line (or a JSON array in a .json file)'
+        )
+        
+        parser.add_argument(
+            '--payloads',
+            type=int,
+            default=DEFAULT_POOL_SIZE,
+            metavar='NUM',
+            help=f'Bodies pre-rendered from a --body template with build variables (default: {DEFAULT_POOL_SIZE})'
+        )
+        
+        parser.add_argument(
+            '--content-type',
+            metavar='TYPE',
+            help='Content-Type of the request bodies (default: guessed)'
+        )
+        
+        parser.add_argument(
+            '-p', '--processes',
+            type=int,
+            default=1,
+            help='Worker processes sharing the load (default: 1)'
+        )
+        
+        parser.add_argument(
+            '--backend',
+            choices=BACKENDS,
+            default='aiohttp',
+            help='HTTP client: aiohttp, or raw for the minimal pipelining HTTP/1.1 client (default: aiohttp)'
+        )
+        
+        parser.add_argument(
+            '--pipeline',
+            type=int,
+            default=1,
+            metavar='DEPTH',
+            help='Requests pipelined per connection by the raw backend (default: 1)'
+        )
+        
+        parser.add_argument(
+            '--uvloop',
+            action='store_true',
+            help='Run on uvloop when it is installed'
+        )
+        
+        parser.add_argument(
+            '--connection',
+            choices=CONNECTION_MODES,
+            default='keepalive',
+            help='Reuse pooled connections or open one per request (default: keepalive)'
+        )
+        
+        parser.add_argument(
+            '--pool-size',
+            type=int,
+            default=0,
+            help='Maximum pooled connections per host (default: no per-host limit)'
+        )
+        
+        parser.add_argument(
+            '--max-conn-requests',
+            type=int,
+            default=0,
+            help='Retire a connection after this many requests (default: never)'
+        )
+        
+        parser.add_argument(
+            '--max-conn-age',
+            type=float,
+            default=0.0,
+            help='Retire a connection after this many seconds (default: never)'
+        )
+        
+        parser.add_argument(
+            '--keepalive-timeout',
+            type=float,
+            default=15.0,
+            help='Seconds an idle pooled connection stays open (default: 15)'
+        )
+        
+        parser.add_argument(
+            '--dns-ttl',
+            type=float,
+            default=10.0,
+            help='Seconds DNS answers are cached, 0 disables, -1 caches forever (default: 10)'
+        )
+        
+        parser.add_argument(
+            '--stream-body',
+            action='store_true',
+            help='Drain response bodies as they arrive instead of buffering them'
+        )
+        
+        parser.add_argument(
+            '--max-body',
+            type=int,
+            default=0,
+            metavar='BYTES',
+            help='Stop reading each response body after BYTES (implies --stream-body)'
+        )
+        
+        parser.add_argument(
+            '--trace-phases',
+            action='store_true',
+            help='Break latency down into DNS, connect, pool wait, TTFB and body'
+        )
+        
+        parser.add_argument(
+            '-t', '--timeout',
+            type=float,
+            default=30.0,
+            metavar='SEC',
+            help='Seconds before a request fails with a timeout (default: 30)'
+        )
+        
+        parser.add_argument(
+            '--precision',
+            type=int,
+            default=3,
+            choices=range(1, 6),
+            metavar='DIGITS',
+            help='Significant digits kept by the latency histogram (default: 3)'
+        )
+    
+    def engine_options(self, args) -> dict:
+        """Translate parsed engine options into HavocEngine keyword arguments"""
+        payload = self.load_payload(args)
+        return {
+            'latency_precision': args.precision,
+            'request_timeout': args.timeout,
+            'connection_mode': args.connection,
+            'pool_size': args.pool_size,
+            'max_conn_requests': args.max_conn_requests,
+            'max_conn_age': args.max_conn_age,
+            'keepalive_timeout': args.keepalive_timeout,
+            'dns_cache_ttl': None if args.dns_ttl < 0 else args.dns_ttl,
+            'trace_phases': args.trace_phases,
+            'stream_body': args.stream_body,
+            'max_body_bytes': args.max_body,
+            'scenario': self.load_scenario(args),
+            'backend': args.backend,
+            'pipeline_depth': args.pipeline,
+            'method': args.method or ('POST' if payload else 'GET'),
+            'payload': payload,
+        }
+    
+    def load_scenario(self, args) -> Optional[Scenario]:
+        """Compile the --scenario file, with the target URL as its base URL"""
+        if not args.scenario:
+            return None
+        return Scenario.load(args.scenario, self.validate_url(args.target) if args.target else None)
+    
+    def load_payload(self, args) -> Optional[PayloadPool]:
+        """Build the request body pool from --body or --body-file"""
+        if args.body is not None and args.body_file:
+            raise ValueError("--body and --body-file are mutually exclusive")
+        if args.body_file:
+            return PayloadPool.from_file(args.body_file, args.content_type)
+        if args.body is not None:
+            return PayloadPool.from_template(args.body, args.payloads, args.content_type)
+        return None
+    
+    def resolve_target(self, args, engine_options: dict) -> str:
+        """Target URL to report: the given one, else the scenario's base or first URL"""
+        if args.target:
+            return self.validate_url(args.target)
+        scenario = engine_options['scenario']
+        return scenario.base_url or str(scenario.templates[0].url)
+    
+    def parse_search_arguments(self, argv):
+        """Parse arguments of the search command"""
+        parser = argparse.ArgumentParser(
+            description='BSB Havoc - Capacity Search',
+            usage='bsb-havoc search [OPTIONS] <target_url>',
+            add_help=False
+        )
+        
+        parser.add_argument(
+            'target',
+            nargs='?',
+            help='Target website URL'
+        )
+        
+        parser.add_argument(
+            '--slo',
+            default='p99<200ms,errors<0.1%',
+            help='Objective every passing level must meet (default: p99<200ms,errors<0.1%%)'
+        )
+        
+        parser.add_argument(
+            '--mode',
+            choices=SEARCH_MODES,
+            default='concurrency',
+            help='Search concurrent workers or arrival rates (default: concurrency)'
+        )
+        
+        parser.add_argument(
+            '--start',
+            type=float,
+            default=10,
+            help='First load level (default: 10)'
+        )
+        
+        parser.add_argument(
+            '--max',
+            type=float,
+            default=10000,
+            help='Highest load level tried (default: 10000)'
+        )
+        
+        parser.add_argument(
+            '--growth',
+            type=float,
+            default=2.0,
+            help='Factor between levels while ramping up (default: 2)'
+        )
+        
+        parser.add_argument(
+            '--step',
+            type=float,
+            default=0,
+            help='Fixed increment between levels instead of --growth'
+        )
+        
+        parser.add_argument(
+            '--window',
+            type=float,
+            default=10.0,
+            help='Seconds each level is measured for (default: 10)'
+        )
+        
+        parser.add_argument(
+            '-c', '--concurrent',
+            type=int,
+            default=1000,
+            help='Maximum requests in flight in rate mode (default: 1000)'
+        )
+        
+        self._add_engine_arguments(parser)
+        
+        parser.add_argument(
+            '-h', '--help',
+            action='store_true',
+            help='Show this help message'
+        )
+        
+        return parser.parse_args(argv)
+    
+    def parse_bench_arguments(self, argv):
+        """Parse arguments of the bench command"""
+        parser = argparse.ArgumentParser(
+            description='BSB Havoc - Engine Self-Benchmark',
+            usage='bsb-havoc bench [OPTIONS]',
+            add_help=False
+        )
+        
+        parser.add_argument(
+            '-d', '--duration',
+            type=float,
+            default=5.0,
+            help='Seconds each case is measured for (default: 5)'
+        )
+        
+        parser.add_argument(
+            '--cases',
+            help='Comma separated cases to run (default: all)'
+        )
+        
+        parser.add_argument(
+            '--inflight',
+            type=int,
+            default=1000,
+            help='Requests held in flight by the memory case (default: 1000)'
+        )
+        
+        parser.add_argument(
+            '-o', '--output',
+            metavar='FILE',
+            help='Write the bench report to FILE as JSON'
+        )
+        
+        parser.add_argument(
+            '--baseline',
+            metavar='FILE',
+            help='Compare against a report saved by an earlier run'
+        )
+        
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=10.0,
+            metavar='PERCENT',
+            help='Change in the worse direction accepted before failing (default: 10)'
+        )
+        
+        parser.add_argument(
+            '-h', '--help',
+            action='store_true',
+            help='Show this help message'
+        )
+        
+        return parser.parse_args(argv)
+    
+    def parse_compare_arguments(self, argv):
+        """Parse arguments of the compare command"""
+        parser = argparse.ArgumentParser(
+            description='BSB Havoc - Run Comparison',
+            usage='bsb-havoc compare [OPTIONS] <baseline> <candidate>',
+            add_help=False
+        )
+        
+        parser.add_argument(
+            'runs',
+            nargs='*',
+            help='Baseline and candidate: names saved with --save, or summary files'
+        )
+        
+        parser.add_argument(
+            '--results-dir',
+            default=baseline.RESULTS_DIR,
+            metavar='DIR',
+            help=f'Directory of saved run summaries (default: {baseline.RESULTS_DIR})'
+        )
+        
+        parser.add_argument(
+            '--confidence',
+            type=float,
+            default=baseline.DEFAULT_CONFIDENCE * 100,
+            metavar='PERCENT',
+            help='Confidence level of the intervals (default: 95)'
+        )
+        
+        parser.add_argument(
+            '--resamples',
+            type=int,
+            default=baseline.DEFAULT_RESAMPLES,
+            help=f'Bootstrap resamples (default: {baseline.DEFAULT_RESAMPLES})'
+        )
+        
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=baseline.DEFAULT_TOLERANCE * 100,
+            metavar='PERCENT',
+            help='Change treated as noise even when significant (default: 5)'
+        )
+        
+        parser.add_argument(
+            '-o', '--output',
+            metavar='FILE',
+            help='Write the comparison to FILE as JSON'
+        )
+        
+        parser.add_argument(
+            '--list',
+            action='store_true',
+            help='List saved runs'
+        )
+        
+        parser.add_argument(
+            '-h', '--help',
+            action='store_true',
+            help='Show this help message'
+        )
+        
+        return parser.parse_args(argv)
+    
+    def parse_agent_arguments(self, argv):
+        """Parse arguments of the agent command"""
+        parser = argparse.ArgumentParser(
+            description='BSB Havoc - Load Agent',
+            usage='bsb-havoc agent [OPTIONS]',
+            add_help=False
+        )
+        
+        parser.add_argument(
+            '--listen',
+            default=f'127.0.0.1:{DEFAULT_AGENT_PORT}',
+            metavar='HOST:PORT',
+            help=f'Address to accept controllers on (default: 127.0.0.1:{DEFAULT_AGENT_PORT})'
+        )
+        
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit after serving one test'
+        )
+        
+        parser.add_argument(
+            '-h', '--help',
+            action='store_true',
+            help='Show this help message'
+        )
+        
+        return parser.parse_args(argv)
+    
+    def parse_report_arguments(self, argv):
+        """Parse arguments of the report command"""
+        parser = argparse.ArgumentParser(
+            description='BSB Havoc - Offline Report',
+            usage='bsb-havoc report [OPTIONS] <file>...',
+            add_help=False
+        )
+        
+        parser.add_argument(
+            'files',
+            nargs='*',
+            help='Files written by --record (all shards of a run)'
+        )
+        
+        parser.add_argument(
+            '--start',
+            type=float,
+            metavar='SEC',
+            help='Skip requests sent in the first SEC seconds'
+        )
+        
+        parser.add_argument(
+            '--end',
+            type=float,
+            metavar='SEC',
+            help='Skip requests sent from SEC seconds after the first one on'
+        )
+        
+        parser.add_argument(
+            '--group-by',
+            choices=report.GROUP_BY,
+            help='Break results down by status or endpoint (default: endpoint with a scenario)'
+        )
+        
+        parser.add_argument(
+            '-o', '--output',
+            metavar='FILE',
+            help='Write the report to FILE (.json: JSON, otherwise HTML)'
+        )
+        
+        parser.add_argument(
+            '--format',
+            choices=report.REPORT_FORMATS,
+            help='Force an html or json report'
+        )
+        
+        parser.add_argument(
+            '--precision',
+            type=int,
+            default=3,
+            choices=range(1, 6),
+            metavar='DIGITS',
+            help='Latency histogram significant digits, 1-5 (default: 3)'
+        )
+        
+        parser.add_argument(
+            '--no-numpy',
+            action='store_true',
+            help='Aggregate in pure Python even when NumPy is installed'
+        )
+        
+        parser.add_argument(
+            '-h', '--help',
+            action='store_true',
+            help='Show this help message'
+        )
+        
+        return parser.parse_args(argv)
     
     def display_help(self):
         """Display help information"""
@@ -93,9 +731,71 @@ class BSBHavocCLI:
 
 {Fore.YELLOW}Usage:{Style.RESET_ALL}
   bsb-havoc [OPTIONS] <target_url>
+  bsb-havoc <command> [OPTIONS]
+
+{Fore.YELLOW}Commands:{Style.RESET_ALL}
+  search                 Find the highest load that still meets an SLO
+  bench                  Measure the engine itself against a local target
+  agent                  Generate load on behalf of a remote controller
+  compare                Compare a saved run against a baseline run
+  report                 Analyze files written by --record, however large
 
 {Fore.YELLOW}Options:{Style.RESET_ALL}
   -c, --concurrent NUM   Maximum concurrent connections (default: 1000)
+  -r, --rate RATE        Open-loop arrival rate, e.g. 5000/s or 300/m
+                         (-c then caps requests in flight)
+  -d, --duration SEC     Stop after SEC seconds of steady state (default: until Ctrl+C)
+  --warmup SEC           Load before the ramp, left out of the results
+  --ramp SEC             Raise the load to -c (or --rate) over SEC seconds,
+                         starting from 10% during warmup
+  --drain SEC            Let in-flight requests finish for up to SEC seconds;
+                         every phase is reported separately
+  -n, --requests NUM     Stop after NUM requests have completed
+  -t, --timeout SEC      Per-request timeout (default: 30)
+  --threshold SLO        Exit with status 1 unless the run meets SLO, e.g.
+                         p95<300ms,p99<1s,errors<1%,rps>500
+  --headless             CI mode: no banner, countdown, colors or live line;
+                         progress every 10 s. Exit status: 0 passed,
+                         1 thresholds failed, 2 error
+  -o, --output FILE      Write the final results to FILE as JSON
+                         (includes the per-second time series)
+  --live-window SEC      Live RPS, errors and p50/p90/p99 over 1, 10 or 60 s
+  --metrics-port PORT    Serve Prometheus/OpenMetrics on 127.0.0.1:PORT/metrics
+  --save NAME            Store the run summary as NAME for bsb-havoc compare
+  --results-dir DIR      Where saved runs live (default: .bsb-havoc/results)
+  --agents LIST          Controller mode: split -c and --rate across the agents
+                         at HOST:PORT,... (-p then applies to every agent)
+  --record FILE          Stream one record per request to FILE
+                         (.bin/.havoc: compact binary, otherwise NDJSON)
+  --record-format FMT    Force ndjson or binary records
+  --profile FILE         Sample where the generator spends its CPU time and write
+                         folded stacks (flamegraph.pl, speedscope) to FILE
+  --scenario FILE        Send weighted request templates from a JSON file;
+                         <target_url> then overrides the file's base_url
+  -X, --method METHOD    HTTP method (default: POST with a body, else GET)
+  --body TEMPLATE        Request body, encoded once; {{{{index}}}}, {{{{uuid}}}} and
+                         {{{{random}}}} vary per pooled body, {{{{seq}}}} and
+                         {{{{timestamp}}}} are rewritten in place per request
+  --body-file FILE       Sample bodies, one per line (.json: array of bodies)
+  --payloads NUM         Bodies pre-rendered from --body (default: 1000)
+  --content-type TYPE    Content-Type of the bodies (default: guessed)
+  -p, --processes NUM    Worker processes sharing the load (default: 1)
+  --backend NAME         aiohttp (default) or raw: minimal HTTP/1.1 client on
+                         asyncio transports, no redirects or phase tracing
+  --pipeline DEPTH       Requests pipelined per connection (raw backend);
+                         -c workers share -c/DEPTH connections
+  --uvloop               Run on uvloop when it is installed
+  --connection MODE      keepalive (pooled) or close (one per request)
+  --pool-size NUM        Maximum pooled connections per host
+  --max-conn-requests N  Retire a connection after N requests
+  --max-conn-age SEC     Retire a connection after SEC seconds
+  --keepalive-timeout S  Seconds an idle pooled connection stays open (default: 15)
+  --dns-ttl SEC          DNS cache TTL, 0 disables, -1 forever (default: 10)
+  --stream-body          Drain response bodies without buffering them
+  --max-body BYTES       Read at most BYTES of each body (implies --stream-body)
+  --trace-phases         Break latency down into DNS, connect, pool wait,
+                         TTFB and body time
+  --precision DIGITS     Latency histogram significant digits, 1-5 (default: 3)
   -v, --version          Show version information
   -h, --help             Show this help message
 
@@ -103,6 +803,17 @@ class BSBHavocCLI:
   bsb-havoc example.com
   bsb-havoc https://example.com
   bsb-havoc -c 5000 http://target-site.com
+  bsb-havoc -c 20000 -p 8 http://target-site.com
+  bsb-havoc --rate 5000/s -c 2000 http://target-site.com
+  bsb-havoc --warmup 10 --ramp 30 -d 120 --drain 5 -c 2000 http://target-site.com
+  bsb-havoc --headless -d 60 -c 200 --threshold "p95<300ms,errors<1%" http://staging
+  bsb-havoc --connection close -c 500 https://target-site.com
+  bsb-havoc --backend raw --pipeline 16 -c 4096 -p 8 --uvloop http://edge-proxy
+  bsb-havoc -o results.json --record requests.bin http://target-site.com
+  bsb-havoc -c 5000 -d 30 --profile havoc.folded http://target-site.com
+  bsb-havoc --scenario traffic.json -c 500 http://staging.target-site.com
+  bsb-havoc -r 2000/s --body '{{"id":"{{{{uuid}}}}","seq":{{{{seq}}}}}}' http://api/orders
+  bsb-havoc --agents 10.0.0.11:9500,10.0.0.12:9500 -c 50000 -p 8 http://target-site.com
   bsb-havoc --help
 
 {Fore.YELLOW}Features:{Style.RESET_ALL}
@@ -118,6 +829,165 @@ class BSBHavocCLI:
 """
         print(help_text)
     
+    def display_search_help(self):
+        """Display help for the search command"""
+        help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}BSB HAVOC - CAPACITY SEARCH{Style.RESET_ALL}
+
+{Fore.YELLOW}Usage:{Style.RESET_ALL}
+  bsb-havoc search [OPTIONS] <target_url>
+
+Raises the load over short measurement windows and reports the highest
+level that still meets the SLO, plus the throughput/latency curve.
+
+{Fore.YELLOW}Options:{Style.RESET_ALL}
+  --slo SLO              Objective to hold (default: p99<200ms,errors<0.1%)
+                         Terms: p50/p90/p95/p99/p99.9<N[ms|s], errors<N%,
+                         rps>N
+  --mode MODE            concurrency (workers) or rate (arrivals per second)
+  --start LEVEL          First load level (default: 10)
+  --max LEVEL            Highest load level tried (default: 10000)
+  --growth FACTOR        Factor between levels while ramping up (default: 2)
+  --step LEVELS          Fixed increment between levels instead of --growth
+  --window SEC           Seconds each level is measured for (default: 10)
+  -c, --concurrent NUM   Maximum requests in flight in rate mode (default: 1000)
+
+  All engine options of the main command are accepted as well
+  (-p, --scenario, --connection, --pool-size, --stream-body, ...).
+
+{Fore.YELLOW}Examples:{Style.RESET_ALL}
+  bsb-havoc search --slo "p99<200ms,errors<0.1%" http://target-site.com
+  bsb-havoc search --mode rate --start 500 --step 500 --window 30 http://target-site.com
+"""
+        print(help_text)
+    
+    def display_bench_help(self):
+        """Display help for the bench command"""
+        cases = '\n'.join(f"  {case.name:<21}{case.description}" for case in bench.BENCH_CASES)
+        help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}BSB HAVOC - ENGINE SELF-BENCHMARK{Style.RESET_ALL}
+
+{Fore.YELLOW}Usage:{Style.RESET_ALL}
+  bsb-havoc bench [OPTIONS]
+
+Starts a minimal HTTP server on loopback in a separate process and runs
+the engine against it in several modes. Reports requests per second,
+requests per CPU-second (RPS per core), CPU time per request, memory per
+request in flight and the engine's latency floor.
+
+{Fore.YELLOW}Cases:{Style.RESET_ALL}
+{cases}
+
+{Fore.YELLOW}Options:{Style.RESET_ALL}
+  -d, --duration SEC     Seconds each case is measured for (default: 5)
+  --cases LIST           Comma separated cases to run (default: all)
+  --inflight NUM         Requests held in flight by the memory case (default: 1000)
+  -o, --output FILE      Write the report to FILE as JSON
+  --baseline FILE        Compare against a report from another build;
+                         exits with status 1 on a regression
+  --tolerance PERCENT    Change accepted before failing (default: 10)
+
+{Fore.YELLOW}Examples:{Style.RESET_ALL}
+  bsb-havoc bench -o bench-main.json
+  bsb-havoc bench --baseline bench-main.json --tolerance 5
+"""
+        print(help_text)
+    
+    def display_compare_help(self):
+        """Display help for the compare command"""
+        help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}BSB HAVOC - RUN COMPARISON{Style.RESET_ALL}
+
+{Fore.YELLOW}Usage:{Style.RESET_ALL}
+  bsb-havoc compare [OPTIONS] <baseline> <candidate>
+  bsb-havoc compare --list
+
+Compares p50/p90/p99 and mean latency, throughput and error rate of two
+runs saved with --save. Confidence intervals of each change come from a
+block bootstrap over the runs' per-second histories. A metric only counts
+as regressed or improved when its interval excludes zero and the change
+exceeds the tolerance. Exit status: 0 unchanged or improved, 1 regressed,
+2 error.
+
+{Fore.YELLOW}Options:{Style.RESET_ALL}
+  --results-dir DIR      Where saved runs live (default: .bsb-havoc/results)
+  --confidence PERCENT   Confidence level of the intervals (default: 95)
+  --resamples NUM        Bootstrap resamples (default: {baseline.DEFAULT_RESAMPLES})
+  --tolerance PERCENT    Change treated as noise (default: 5; error rates
+                         use {baseline.ERROR_RATE_TOLERANCE*100:g} percentage points)
+  -o, --output FILE      Write the comparison to FILE as JSON
+  --list                 List saved runs
+
+{Fore.YELLOW}Examples:{Style.RESET_ALL}
+  bsb-havoc --headless -d 120 -c 200 --save main http://staging
+  bsb-havoc --headless -d 120 -c 200 --save pr-1234 http://staging
+  bsb-havoc compare main pr-1234
+"""
+        print(help_text)
+    
+    def display_agent_help(self):
+        """Display help for the agent command"""
+        help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}BSB HAVOC - LOAD AGENT{Style.RESET_ALL}
+
+{Fore.YELLOW}Usage:{Style.RESET_ALL}
+  bsb-havoc agent [OPTIONS]
+
+Waits for a controller (bsb-havoc --agents ...) to send it a test, runs
+its share of the load and streams counters and latency histograms back
+every {AGENT_REPORT_INTERVAL:g} seconds. The controller starts every agent together and
+shows one merged live view and one set of results.
+
+{Fore.YELLOW}Options:{Style.RESET_ALL}
+  --listen HOST:PORT     Address to accept controllers on
+                         (default: 127.0.0.1:{DEFAULT_AGENT_PORT}; use 0.0.0.0:PORT for remote)
+  --once                 Exit after serving one test
+  -h, --help             Show this help message
+
+{Fore.YELLOW}Examples:{Style.RESET_ALL}
+  bsb-havoc agent --listen 0.0.0.0:{DEFAULT_AGENT_PORT}
+  bsb-havoc agent --listen 127.0.0.1:9501 --once
+
+{Fore.RED}⚠️  WARNING:{Style.RESET_ALL}
+  Agents run whatever test a controller sends them. Only listen on
+  networks where every host that can connect is trusted.
+"""
+        print(help_text)
+    
+    def display_report_help(self):
+        """Display help for the report command"""
+        help_text = f"""
+{Fore.CYAN}{Style.BRIGHT}BSB HAVOC - OFFLINE REPORT{Style.RESET_ALL}
+
+{Fore.YELLOW}Usage:{Style.RESET_ALL}
+  bsb-havoc report [OPTIONS] <file>...
+
+Reads per-request files written by --record (binary or NDJSON, every
+shard of a run together) and prints the same summary as a live run:
+latency percentiles, throughput over time, status codes and failures by
+class. Binary files are memory-mapped and aggregated in chunks of
+{report.CHUNK_RECORDS:,} records, with NumPy when it is installed, so memory stays
+the same for a million or a billion records.
+
+{Fore.YELLOW}Options:{Style.RESET_ALL}
+  --start SEC            Skip requests sent in the first SEC seconds
+  --end SEC              Skip requests sent from SEC seconds on
+  --group-by KEY         Break results down by status or endpoint
+                         (default: endpoint when the run used --scenario)
+  -o, --output FILE      Write the report to FILE: .json for JSON, otherwise
+                         a self-contained HTML page with charts and a heatmap
+  --format FMT           Force an html or json report
+  --precision DIGITS     Latency histogram significant digits (default: 3)
+  --no-numpy             Aggregate in pure Python (slower, same results)
+  -h, --help             Show this help message
+
+{Fore.YELLOW}Examples:{Style.RESET_ALL}
+  bsb-havoc report requests.bin
+  bsb-havoc report --start 600 --end 4200 -o soak.html requests.*.bin
+  bsb-havoc report --group-by status -o statuses.json requests.ndjson
+"""
+        print(help_text)
+    
     def display_version(self):
         """Display version information"""
         version_info = f"""
@@ -131,12 +1001,234 @@ class BSBHavocCLI:
 """
         print(version_info)
     
+    async def run_search(self, argv):
+        """Execute the search command"""
+        args = self.parse_search_arguments(argv)
+        
+        self.display_banner()
+        
+        if args.help:
+            self.display_search_help()
+            return 0
+        
+        if not args.target and not args.scenario:
+            print(f"{Fore.RED}❌ ERROR: Target URL is required!{Style.RESET_ALL}")
+            print(f"\n{Fore.YELLOW}Usage:{Style.RESET_ALL} bsb-havoc search <target_url>")
+            return EXIT_ERROR
+        
+        try:
+            engine_options = self.engine_options(args)
+            target_url = self.resolve_target(args, engine_options)
+            search = CapacitySearch(
+                target_url,
+                parse_slo(args.slo),
+                mode=args.mode,
+                start=args.start,
+                max_level=args.max,
+                growth=args.growth,
+                step=args.step,
+                window=args.window,
+                max_concurrent=args.concurrent,
+                processes=args.processes,
+                engine_options=engine_options
+            )
+            
+            print(f"{Fore.CYAN}🎯 Target:{Style.RESET_ALL} {target_url}")
+            print(f"{Fore.CYAN}📐 SLO:{Style.RESET_ALL} {search.slo.describe()}")
+            print(f"{Fore.CYAN}🔍 Searching:{Style.RESET_ALL} {args.mode} from {args.start:g} up to {args.max:g}")
+            print(f"{Fore.WHITE}{'─' * 80}{Style.RESET_ALL}")
+            
+            # Ctrl+C ends the search after the current window and still prints the curve so far
+            def interrupt(signum, frame):
+                print(f"\n\n{Fore.YELLOW}⚠️  INTERRUPT SIGNAL RECEIVED!{Style.RESET_ALL}")
+                print(f"{Fore.RED}🚫 Stopping the search...{Style.RESET_ALL}")
+                search.stop()
+            
+            previous = signal.signal(signal.SIGINT, interrupt)
+            try:
+                result = await search.run()
+            finally:
+                signal.signal(signal.SIGINT, previous)
+            return EXIT_PASSED if result.knee else EXIT_THRESHOLDS_FAILED
+            
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}👋 Search terminated by user.{Style.RESET_ALL}")
+            return 0
+        except Exception as e:
+            print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
+            return EXIT_ERROR
+    
+    async def run_bench(self, argv):
+        """Execute the bench command"""
+        args = self.parse_bench_arguments(argv)
+        
+        self.display_banner()
+        
+        if args.help:
+            self.display_bench_help()
+            return 0
+        
+        try:
+            cases = [name.strip() for name in args.cases.split(',') if name.strip()] if args.cases else None
+            suite = bench.HavocBench(args.duration, cases, args.inflight)
+            baseline = bench.load(args.baseline) if args.baseline else None
+            
+            print(f"{Fore.CYAN}🏎️  Benchmarking:{Style.RESET_ALL} {len(suite.cases)} cases, {args.duration:g} seconds each")
+            print(f"{Fore.WHITE}{'─' * 80}{Style.RESET_ALL}")
+            
+            report = await suite.run()
+            
+            if args.output:
+                bench.save(report, args.output)
+                print(f"{Fore.GREEN}📁 Report saved to {args.output}{Style.RESET_ALL}")
+            
+            if baseline:
+                tolerance = args.tolerance / 100
+                rows = bench.compare(report, baseline, tolerance)
+                bench.print_comparison(rows, tolerance)
+                return EXIT_THRESHOLDS_FAILED if any(row['regression'] for row in rows) else EXIT_PASSED
+            
+            return 0
+            
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}👋 Bench terminated by user.{Style.RESET_ALL}")
+            return 0
+        except Exception as e:
+            print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
+            return EXIT_ERROR
+    
+    async def run_compare(self, argv):
+        """Execute the compare command"""
+        args = self.parse_compare_arguments(argv)
+        
+        self.display_banner()
+        
+        if args.help:
+            self.display_compare_help()
+            return 0
+        
+        try:
+            if args.list:
+                runs = baseline.list_runs(args.results_dir)
+                print(f"{Fore.YELLOW}🗂️  SAVED RUNS ({args.results_dir}):{Style.RESET_ALL}")
+                for run in runs:
+                    result = run['result']
+                    print(f"  {Fore.WHITE}{run['name']:<24}{Style.RESET_ALL}{run['created']:<22}"
+                          f"{result['requests_per_second']:>10,.0f} req/s  p99 {result['p99_response_time']*1000:.0f}ms  "
+                          f"{run['target_url']}")
+                if not runs:
+                    print("  (none yet, save one with --save NAME)")
+                return 0
+            
+            if len(args.runs) != 2:
+                print(f"{Fore.RED}❌ ERROR: Need a baseline and a candidate run!{Style.RESET_ALL}")
+                print(f"\n{Fore.YELLOW}Usage:{Style.RESET_ALL} bsb-havoc compare <baseline> <candidate>")
+                return EXIT_ERROR
+            
+            reference = baseline.load(args.runs[0], args.results_dir)
+            candidate = baseline.load(args.runs[1], args.results_dir)
+            report = baseline.compare(reference, candidate, confidence=args.confidence / 100,
+                                      resamples=args.resamples, tolerance=args.tolerance / 100)
+            baseline.print_comparison(report)
+            
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, indent=2)
+                print(f"{Fore.GREEN}📁 Comparison saved to {args.output}{Style.RESET_ALL}")
+            
+            return EXIT_THRESHOLDS_FAILED if report['verdict'] == 'regressed' else EXIT_PASSED
+            
+        except Exception as e:
+            print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
+            return EXIT_ERROR
+    
+    async def run_agent(self, argv):
+        """Execute the agent command"""
+        args = self.parse_agent_arguments(argv)
+        
+        self.display_banner()
+        
+        if args.help:
+            self.display_agent_help()
+            return 0
+        
+        try:
+            host, port = parse_address(args.listen)
+            await HavocAgent(host, port, once=args.once).serve()
+            return 0
+            
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}👋 Agent stopped by user.{Style.RESET_ALL}")
+            return 0
+        except Exception as e:
+            print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
+            return EXIT_ERROR
+    
+    async def run_report(self, argv):
+        """Execute the report command"""
+        args = self.parse_report_arguments(argv)
+        
+        self.display_banner()
+        
+        if args.help:
+            self.display_report_help()
+            return 0
+        
+        if not args.files:
+            print(f"{Fore.RED}❌ ERROR: At least one record file is required!{Style.RESET_ALL}")
+            print(f"\n{Fore.YELLOW}Usage:{Style.RESET_ALL} bsb-havoc report <file>...")
+            return EXIT_ERROR
+        
+        try:
+            analyzer = report.RecordAnalyzer(args.files, start=args.start, end=args.end, group_by=args.group_by,
+                                             precision=args.precision, vectorized=False if args.no_numpy else None)
+            engine = 'NumPy' if analyzer.vectorized else 'pure Python (pip install numpy for speed)'
+            print(f"{Fore.CYAN}🧮 Analyzing:{Style.RESET_ALL} {', '.join(args.files)} with {engine}")
+            print(f"{Fore.WHITE}{'─' * 80}{Style.RESET_ALL}")
+            
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            summary = await loop.run_in_executor(None, analyzer.analyze)
+            elapsed = time.perf_counter() - started
+            
+            report.print_report(summary)
+            print(f"\n{Fore.GREEN}⚡ {summary['records_scanned']:,} records analyzed in {elapsed:.2f} seconds "
+                  f"({summary['records_scanned'] / max(elapsed, 1e-9):,.0f} records/s){Style.RESET_ALL}")
+            
+            if args.output:
+                report.save(summary, args.output, args.format)
+                print(f"{Fore.GREEN}📁 Report saved to {args.output}{Style.RESET_ALL}")
+            
+            return 0
+            
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.YELLOW}👋 Report interrupted by user.{Style.RESET_ALL}")
+            return 0
+        except Exception as e:
+            print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
+            return EXIT_ERROR
+    
     async def run(self):
         """Main CLI execution"""
-        args = self.parse_arguments()
+        argv = sys.argv[1:]
+        commands = {
+            'search': self.run_search,
+            'bench': self.run_bench,
+            'agent': self.run_agent,
+            'compare': self.run_compare,
+            'report': self.run_report,
+        }
+        if argv and argv[0] in commands:
+            return await commands[argv[0]](argv[1:])
         
-        # Display banner
-        self.display_banner()
+        args = self.parse_arguments(argv)
+        
+        # Headless runs write plain text for CI logs
+        if args.headless:
+            colorama_deinit()
+            colorama_init(strip=True)
+        else:
+            self.display_banner()
         
         # Handle help
         if args.help:
@@ -149,42 +1241,117 @@ class BSBHavocCLI:
             return 0
         
         # Validate target URL
-        if not args.target:
+        if not args.target and not args.scenario:
             print(f"{Fore.RED}❌ ERROR: Target URL is required!{Style.RESET_ALL}")
             print(f"\n{Fore.YELLOW}Usage:{Style.RESET_ALL} bsb-havoc <target_url>")
             print(f"{Fore.YELLOW}Example:{Style.RESET_ALL} bsb-havoc example.com")
-            return 1
+            return EXIT_ERROR
         
         try:
             # Validate and normalize URL
-            target_url = self.validate_url(args.target)
+            engine_options = self.engine_options(args)
+            target_url = self.resolve_target(args, engine_options)
+            rate = self.parse_rate(args.rate) if args.rate else None
+            threshold = parse_slo(args.threshold) if args.threshold else None
+            agents = [agent.strip() for agent in args.agents.split(',') if agent.strip()] if args.agents else []
             
             print(f"{Fore.CYAN}🎯 Target:{Style.RESET_ALL} {target_url}")
+            if engine_options['scenario']:
+                print(f"{Fore.CYAN}🗺️  Scenario:{Style.RESET_ALL} {args.scenario} ({len(engine_options['scenario'])} requests)")
+            if engine_options['payload']:
+                print(f"{Fore.CYAN}🧱 Payload:{Style.RESET_ALL} {engine_options['method']} {engine_options['payload'].describe()}")
             print(f"{Fore.CYAN}⚡ Concurrent Connections:{Style.RESET_ALL} {args.concurrent:,}")
+            if rate:
+                print(f"{Fore.CYAN}🕒 Arrival Rate:{Style.RESET_ALL} {rate:,.0f} req/s")
+            if args.duration or args.requests:
+                limits = [f"{args.duration:g} seconds" if args.duration else "", f"{args.requests:,} requests" if args.requests else ""]
+                print(f"{Fore.CYAN}⏳ Stops After:{Style.RESET_ALL} {' or '.join(filter(None, limits))}")
+            if args.warmup or args.ramp or args.drain:
+                phases = [f"{args.warmup:g}s warmup" if args.warmup else "", f"{args.ramp:g}s ramp" if args.ramp else "",
+                          "steady state", f"{args.drain:g}s drain" if args.drain else ""]
+                print(f"{Fore.CYAN}🌡️  Phases:{Style.RESET_ALL} {' → '.join(filter(None, phases))}")
+            if threshold:
+                print(f"{Fore.CYAN}📐 Thresholds:{Style.RESET_ALL} {threshold.describe()}")
+            if agents:
+                print(f"{Fore.CYAN}🛰️  Agents:{Style.RESET_ALL} {len(agents)} ({', '.join(agents)})")
+            if args.processes > 1:
+                print(f"{Fore.CYAN}🧩 Worker Processes:{Style.RESET_ALL} {args.processes}"
+                      f"{' per agent' if agents else ''}")
+            if args.backend == 'raw':
+                pipeline = f", {args.pipeline} pipelined per connection" if args.pipeline > 1 else ""
+                print(f"{Fore.CYAN}🧨 Backend:{Style.RESET_ALL} raw HTTP/1.1{pipeline}")
+            if args.profile:
+                print(f"{Fore.CYAN}🔥 Profiling:{Style.RESET_ALL} {args.profile}")
+            if args.uvloop and not running_uvloop():
+                print(f"{Fore.YELLOW}⚠️  uvloop is not installed, running on the asyncio event loop{Style.RESET_ALL}")
             print(f"{Fore.CYAN}🕐 Started at:{Style.RESET_ALL} {platform.node()}")
             print(f"{Fore.WHITE}{'─' * 80}{Style.RESET_ALL}")
             
             # Create and run havoc engine
-            engine = HavocEngine(target_url, args.concurrent)
-            await engine.run()
+            engine_options['rate'] = rate
+            engine_options['live_window'] = args.live_window
+            engine_options['metrics_port'] = args.metrics_port
+            engine_options['record_path'] = args.record
+            engine_options['record_format'] = args.record_format
+            engine_options['profile_path'] = args.profile
+            engine_options['max_requests'] = args.requests
+            engine_options['headless'] = args.headless
+            engine_options['warmup'] = args.warmup
+            engine_options['ramp'] = args.ramp
+            engine_options['drain'] = args.drain
             
-            return 0
+            if agents:
+                engine = DistributedHavocEngine(target_url, args.concurrent, agents, args.processes, **engine_options)
+            elif args.processes > 1:
+                engine = ShardedHavocEngine(target_url, args.concurrent, args.processes, **engine_options)
+            else:
+                engine = HavocEngine(target_url, args.concurrent, **engine_options)
+            result = await engine.run(duration=args.duration)
+            
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump(result.to_dict(), f, indent=2)
+                print(f"{Fore.GREEN}📁 Results saved to {args.output}{Style.RESET_ALL}")
+            
+            if args.save:
+                path = baseline.save(baseline.summarize(engine, args.save), args.results_dir)
+                print(f"{Fore.GREEN}🗂️  Run saved as {args.save} ({path}){Style.RESET_ALL}")
+            
+            if threshold:
+                return self.check_thresholds(threshold, result)
+            return EXIT_PASSED
             
         except KeyboardInterrupt:
             print(f"\n\n{Fore.YELLOW}👋 Session terminated by user.{Style.RESET_ALL}")
-            return 0
+            return EXIT_PASSED
         except Exception as e:
             print(f"\n{Fore.RED}💥 Critical Error:{Style.RESET_ALL} {str(e)}")
-            return 1
+            return EXIT_ERROR
+    
+    def check_thresholds(self, threshold, result) -> int:
+        """Report every threshold the result violates and pick the exit code"""
+        violations = threshold.violations(result)
+        if not violations:
+            print(f"{Fore.GREEN}{Style.BRIGHT}✅ THRESHOLDS PASSED:{Style.RESET_ALL} {threshold.describe()}")
+            return EXIT_PASSED
+        
+        print(f"{Fore.RED}{Style.BRIGHT}❌ THRESHOLDS FAILED:{Style.RESET_ALL}")
+        for violation in violations:
+            print(f"  {Fore.RED}• {violation}{Style.RESET_ALL}")
+        return EXIT_THRESHOLDS_FAILED
 
 
 def main():
     """Entry point for CLI"""
     try:
+        colorama_init()
         cli = BSBHavocCLI()
         if sys.platform == 'win32':
             # Windows event loop policy
             asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        elif '--uvloop' in sys.argv[1:]:
+            # The loop policy must be set before the event loop starts
+            install_uvloop()
         
         return asyncio.run(cli.run())
     except KeyboardInterrupt:
@@ -0,0 +1,90 @@
+"""
+BSB Havoc Connection - Pooled Connection Accounting
+🔌 Counts connection churn and caps connection lifetimes
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Tuple
+
+import aiohttp
+
+from .errors import ERROR_CONNECT_TIMEOUT, ERROR_POOL_EXHAUSTED
+
+
+class HavocConnector(aiohttp.TCPConnector):
+    """🔌 TCP connector that tracks how connections are opened, reused and closed
+
+    The session's timeout surfaces as the same exception wherever a request
+    was stuck, so the connector notes which requests timed out waiting for
+    a pool slot or for a new connection. Requests that get a connection pay
+    nothing for this.
+    """
+
+    def __init__(self, *args, max_conn_requests: int = 0, max_conn_age: float = 0.0, **kwargs):
+        """
+        Initialize the connector
+
+        Args:
+            max_conn_requests: Retire a connection after this many requests (0: never)
+            max_conn_age: Retire a connection after this many seconds (0: never)
+            *args, **kwargs: Passed on to aiohttp.TCPConnector
+        """
+        super().__init__(*args, **kwargs)
+        self.max_conn_requests = max_conn_requests
+        self.max_conn_age_ns = int(max_conn_age * 1e9)
+        self.opened = 0
+        self.reused = 0
+
+        # Requests served and open time of every live connection, per protocol
+        self._usage = weakref.WeakKeyDictionary()
+
+        # Error code of every task whose connection attempt timed out
+        self.stalled = weakref.WeakKeyDictionary()
+
+    async def connect(self, *args, **kwargs):
+        """Acquire a connection, counting it and retiring it if it is past its limits"""
+        try:
+            connection = await super().connect(*args, **kwargs)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # The pool wait below may already have named the cause
+            self.stalled.setdefault(asyncio.current_task(), ERROR_CONNECT_TIMEOUT)
+            raise
+        protocol = connection.protocol
+        if protocol is None:
+            return connection
+
+        now = time.perf_counter_ns()
+        usage = self._usage.get(protocol)
+        if usage is None:
+            usage = self._usage[protocol] = [0, now]
+            self.opened += 1
+        else:
+            self.reused += 1
+        usage[0] += 1
+
+        if ((self.max_conn_requests and usage[0] >= self.max_conn_requests) or
+                (self.max_conn_age_ns and now - usage[1] >= self.max_conn_age_ns)):
+            # Serve this last request, then close instead of returning to the pool
+            protocol.force_close()
+
+        return connection
+
+    async def _wait_for_available_connection(self, *args, **kwargs):
+        """Wait for a free pool slot, noting requests that time out doing so"""
+        try:
+            await super()._wait_for_available_connection(*args, **kwargs)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self.stalled[asyncio.current_task()] = ERROR_POOL_EXHAUSTED
+            raise
+
+    def counts(self) -> Tuple[int, int, int]:
+        """
+        Current connection totals
+
+        Returns:
+            Tuple of (opened, reused, closed)
+        """
+        alive = sum(1 for protocol in list(self._usage) if protocol.is_connected())
+        return self.opened, self.reused, self.opened - alive
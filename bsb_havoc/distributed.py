@@ -0,0 +1,367 @@
+"""
+BSB Havoc Distributed - Controller/Agent Load Generation
+🛰️ Agents on many hosts, one merged live view and one set of results
+"""
+
+import asyncio
+import json
+import struct
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from colorama import Fore, Style
+
+from .engine import HavocEngine
+from .payloads import PayloadPool
+from .recorder import shard_path
+from .scenario import Scenario
+from .sharding import ShardedHavocEngine, _split_budget, _split_concurrency
+
+# Port agents listen on unless told otherwise
+DEFAULT_AGENT_PORT = 9500
+
+# How often each agent ships its statistics to the controller (seconds)
+AGENT_REPORT_INTERVAL = 0.5
+
+# How long the controller waits to reach an agent (seconds)
+AGENT_CONNECT_TIMEOUT = 10.0
+
+# How long to wait for agents to flush their last statistics (seconds)
+AGENT_SHUTDOWN_TIMEOUT = 15.0
+
+# Largest message accepted from the other side
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+# Engine options that only apply to the controller's own process
+CONTROLLER_OPTIONS = ('live_window', 'metrics_port', 'headless')
+
+# Every message is a big-endian length followed by that many bytes of JSON
+_FRAME_HEADER = struct.Struct('>I')
+
+Address = Tuple[str, int]
+
+
+async def send_message(writer: asyncio.StreamWriter, message: Dict[str, Any]):
+    """Write one framed message"""
+    data = json.dumps(message, separators=(',', ':')).encode()
+    writer.write(_FRAME_HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+async def read_message(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """
+    Read one framed message
+
+    Raises:
+        asyncio.IncompleteReadError: The other side closed the connection
+        ValueError: The message is larger than MAX_MESSAGE_SIZE
+    """
+    (length,) = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"message of {length} bytes exceeds the {MAX_MESSAGE_SIZE} byte limit")
+    return json.loads(await reader.readexactly(length))
+
+
+def parse_address(address: str, default_port: int = DEFAULT_AGENT_PORT) -> Address:
+    """Parse HOST, HOST:PORT or [IPv6]:PORT"""
+    address = address.strip()
+    if address.startswith('['):
+        host, _, rest = address[1:].partition(']')
+        port = rest[1:] if rest.startswith(':') else ''
+    elif address.count(':') == 1:
+        host, _, port = address.partition(':')
+    else:
+        host, port = address, ''
+
+    try:
+        return host or '127.0.0.1', int(port) if port else default_port
+    except ValueError:
+        raise ValueError(f"Invalid agent address '{address}' (expected HOST:PORT)")
+
+
+def encode_options(engine_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn engine keyword arguments into JSON an agent can rebuild them from"""
+    options = {name: value for name, value in engine_kwargs.items() if name not in CONTROLLER_OPTIONS}
+    scenario = options.get('scenario')
+    if scenario is not None:
+        options['scenario'] = {'spec': scenario.spec, 'base_url': scenario.base_url}
+    payload = options.get('payload')
+    if payload is not None:
+        options['payload'] = payload.to_dict()
+    return options
+
+
+def decode_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild engine keyword arguments produced by ``encode_options``"""
+    options = dict(options)
+    scenario = options.get('scenario')
+    if scenario is not None:
+        options['scenario'] = Scenario(scenario['spec'], scenario['base_url'])
+    payload = options.get('payload')
+    if payload is not None:
+        options['payload'] = PayloadPool.from_dict(payload)
+    return options
+
+
+class HavocAgent:
+    """🛰️ Generates load on behalf of a remote controller
+
+    Protocol, one framed JSON message at a time::
+
+        controller -> agent   configure  target, concurrency, engine options
+        agent -> controller   ready | error
+        controller -> agent   start
+        agent -> controller   stats      every AGENT_REPORT_INTERVAL
+        controller -> agent   stop
+        agent -> controller   stats, done
+
+    ``stats`` carries the engine's drained counters and serialized
+    histograms, so the controller merges them exactly like shard reports.
+    An agent runs one test at a time and stops its load as soon as the
+    controller disconnects.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = DEFAULT_AGENT_PORT, once: bool = False,
+                 verbose: bool = True):
+        """
+        Configure the agent
+
+        Args:
+            host: Interface to listen on
+            port: TCP port to listen on
+            once: Exit after serving one test
+            verbose: Print a line per test
+        """
+        self.host = host
+        self.port = port
+        self.once = once
+        self.verbose = verbose
+        self.busy = False
+        self._finished: Optional[asyncio.Event] = None
+
+    def _log(self, message: str):
+        """Print a status line unless running quietly"""
+        if self.verbose:
+            print(message)
+
+    async def serve(self):
+        """Accept controllers until cancelled (or after one test with ``once``)"""
+        self._finished = asyncio.Event()
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self._log(f"{Fore.CYAN}🛰️  Agent listening on{Style.RESET_ALL} {self.host}:{self.port}")
+
+        async with server:
+            if self.once:
+                await self._finished.wait()
+            else:
+                await server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve one controller connection"""
+        peer = writer.get_extra_info('peername')
+        try:
+            if self.busy:
+                await send_message(writer, {'type': 'error', 'message': 'agent is already running a test'})
+                return
+
+            self.busy = True
+            try:
+                await self._session(reader, writer, peer)
+            finally:
+                self.busy = False
+                if self.once:
+                    self._finished.set()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self._log(f"{Fore.YELLOW}⚠️  Controller {peer[0]} disconnected{Style.RESET_ALL}")
+        except ValueError as e:
+            self._log(f"{Fore.RED}❌ Bad message from {peer[0]}:{Style.RESET_ALL} {e}")
+        finally:
+            writer.close()
+
+    def _build_engine(self, config: Dict[str, Any]) -> HavocEngine:
+        """Create the engine described by a configure message"""
+        options = decode_options(config['engine'])
+        if config.get('processes', 1) > 1:
+            return ShardedHavocEngine(config['target_url'], config['max_concurrent'], config['processes'],
+                                      handle_signals=False, **options)
+        return HavocEngine(config['target_url'], config['max_concurrent'], handle_signals=False, **options)
+
+    async def _session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, peer):
+        """Configure, run and report one test"""
+        config = await read_message(reader)
+        if config.get('type') != 'configure':
+            raise ValueError(f"expected configure, got {config.get('type')}")
+
+        try:
+            engine = self._build_engine(config)
+        except Exception as e:
+            await send_message(writer, {'type': 'error', 'message': str(e)})
+            return
+        await send_message(writer, {'type': 'ready'})
+
+        if (await read_message(reader)).get('type') != 'start':
+            return
+
+        self._log(f"{Fore.GREEN}🚀 Running for {peer[0]}:{Style.RESET_ALL} {config['target_url']} "
+                  f"with {config['max_concurrent']:,} workers")
+        interval = config.get('interval', AGENT_REPORT_INTERVAL)
+        engine.is_running = True
+        engine.start_time = time.time()
+        workers = await engine._start_load()
+        stop = asyncio.ensure_future(read_message(reader))
+        sent = 0
+
+        try:
+            while not stop.done():
+                await asyncio.wait({stop}, timeout=interval)
+                stats = engine._drain_stats()
+                sent += stats['total_requests']
+                await send_message(writer, {'type': 'stats', 'stats': stats})
+        finally:
+            stop.cancel()
+            engine.is_running = False
+            await engine._stop_load(workers)
+
+        # The controller is gone when the stop read failed
+        stop.result()
+        stats = engine._drain_stats()
+        sent += stats['total_requests']
+        await send_message(writer, {'type': 'stats', 'stats': stats})
+        await send_message(writer, {'type': 'done'})
+        self._log(f"{Fore.GREEN}✅ Finished:{Style.RESET_ALL} {sent:,} requests in {time.time() - engine.start_time:.1f}s")
+
+
+class DistributedHavocEngine(HavocEngine):
+    """🛰️ Controller Havoc Engine - agents generate the load, this process merges it"""
+
+    def __init__(self, target_url: str, max_concurrent: int = 1000, agents: Sequence[str] = (),
+                 processes: int = 1, handle_signals: bool = True, **engine_kwargs):
+        """
+        Initialize the controller
+
+        Args:
+            target_url: Target website URL
+            max_concurrent: Maximum concurrent connections across all agents
+            agents: Agent addresses as HOST:PORT
+            processes: Worker processes each agent runs
+            handle_signals: Install SIGINT/SIGTERM handlers in this process
+            **engine_kwargs: Options passed on to every agent's HavocEngine
+        """
+        super().__init__(target_url, max_concurrent, handle_signals=handle_signals, **engine_kwargs)
+        if not agents:
+            raise ValueError("At least one agent address is required")
+        if max_concurrent < len(agents):
+            raise ValueError("Need at least one concurrent connection per agent")
+
+        self.agents = [parse_address(agent) for agent in agents]
+        self.processes = processes
+        self.engine_kwargs = engine_kwargs
+        self.lost_agents: List[str] = []
+        self._writers: List[asyncio.StreamWriter] = []
+
+    def _files_description(self, path: str) -> str:
+        """Each agent writes its own file on its own host"""
+        per_host = ", split per process" if self.processes > 1 else ""
+        return (f"{shard_path(path, 0)} … {shard_path(path, len(self.agents) - 1)} "
+                f"(one per agent host{per_host})")
+
+    def _merge_remote(self, stats: Dict[str, Any]):
+        """Merge statistics that went through JSON"""
+        stats['status_codes'] = {int(code): count for code, count in stats['status_codes'].items()}
+        self._merge_stats(stats)
+
+    async def _connect(self, address: Address) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a connection to one agent"""
+        try:
+            return await asyncio.wait_for(asyncio.open_connection(*address), AGENT_CONNECT_TIMEOUT)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionError(f"Cannot reach agent {address[0]}:{address[1]}: {e or 'timed out'}")
+
+    async def _start_load(self) -> List[asyncio.Task]:
+        """Configure every agent, then start them together"""
+        options = encode_options(self.engine_kwargs)
+        connections = []
+        try:
+            for address in self.agents:
+                connections.append(await self._connect(address))
+                self._writers.append(connections[-1][1])
+
+            shares = _split_concurrency(self.max_concurrent, len(self.agents))
+            budgets = _split_budget(self.max_requests, shares)
+            for index, ((_, writer), concurrency) in enumerate(zip(connections, shares)):
+                agent_options = dict(options)
+                if self.rate:
+                    agent_options['rate'] = self.rate * concurrency / self.max_concurrent
+                if budgets:
+                    agent_options['max_requests'] = budgets[index]
+                if self.record_path:
+                    agent_options['record_path'] = shard_path(self.record_path, index)
+                if self.profile_path:
+                    agent_options['profile_path'] = shard_path(self.profile_path, index)
+                if self.payload and self.payload.per_request:
+                    agent_options['payload'] = self.payload.interleave(index, len(self.agents)).to_dict()
+                await send_message(writer, {
+                    'type': 'configure',
+                    'target_url': self.target_url,
+                    'max_concurrent': concurrency,
+                    'processes': self.processes,
+                    'interval': AGENT_REPORT_INTERVAL,
+                    'engine': agent_options,
+                })
+
+            # Only start once every agent has accepted its configuration
+            for (reader, _), (host, port) in zip(connections, self.agents):
+                reply = await asyncio.wait_for(read_message(reader), AGENT_CONNECT_TIMEOUT)
+                if reply.get('type') != 'ready':
+                    raise RuntimeError(f"Agent {host}:{port} refused the test: {reply.get('message', reply)}")
+        except BaseException:
+            self._close()
+            raise
+
+        # Write every start message before waiting on any socket
+        start = json.dumps({'type': 'start'}).encode()
+        for _, writer in connections:
+            writer.write(_FRAME_HEADER.pack(len(start)) + start)
+        await asyncio.gather(*(writer.drain() for _, writer in connections))
+
+        return [asyncio.create_task(self._collect(reader, address))
+                for (reader, _), address in zip(connections, self.agents)]
+
+    async def _collect(self, reader: asyncio.StreamReader, address: Address):
+        """Merge statistics shipped by one agent until it is done"""
+        try:
+            while True:
+                message = await read_message(reader)
+                if message['type'] == 'stats':
+                    self._merge_remote(message['stats'])
+                elif message['type'] == 'done':
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            self.lost_agents.append(f"{address[0]}:{address[1]}")
+            print(f"\n{Fore.RED}⚠️  Lost agent {address[0]}:{address[1]}{Style.RESET_ALL}")
+
+    async def _stop_load(self, tasks: List[asyncio.Task]):
+        """Stop every agent and merge their final statistics"""
+        stop = json.dumps({'type': 'stop'}).encode()
+        for writer in self._writers:
+            if not writer.is_closing():
+                writer.write(_FRAME_HEADER.pack(len(stop)) + stop)
+
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=AGENT_SHUTDOWN_TIMEOUT + self.drain)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._close()
+
+    def _close(self):
+        """Drop every agent connection"""
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+
+    def _display_final_results(self):
+        """Display the merged results, then agents that dropped out"""
+        super()._display_final_results()
+        if self.lost_agents:
+            print(f"{Fore.RED}⚠️  Results are missing the final statistics of: {', '.join(self.lost_agents)}{Style.RESET_ALL}")
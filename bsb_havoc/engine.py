@@ -5,17 +5,59 @@ BSB Havoc Engine - High-Power Async Load Testing Core
 
 import asyncio
 import aiohttp
+import math
 import time
 import random
 import signal
 import sys
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-import statistics
-from colorama import Fore, Style, init as colorama_init
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict
+from colorama import Fore, Style
+from multidict import CIMultiDict
+from .connection import HavocConnector
+from .errors import ERROR_HTTP_5XX, ERROR_NAMES, ERROR_NONE, ERROR_PRECISION, TIMEOUT_ERRORS, classify_error
+from .health import CPU_SATURATION, LIVE_LAG_WARNING, LoopProbe
+from .histogram import LatencyHistogram, DEFAULT_PRECISION
+from .metrics import MetricsServer
+from .payloads import PayloadPool
+from .profiler import SamplingProfiler
+from .rawhttp import RawHTTPClient, RawRequest
+from .recorder import ResultRecorder
+from .scenario import METHODS, Scenario, TemplateStats
+from .stats import StatShard
+from .timeseries import LIVE_WINDOWS, RollingMetrics, condense
+from .tracing import PhaseTracer, PHASE_LABELS
 
-colorama_init()
+# Connection management modes
+CONNECTION_MODES = ('keepalive', 'close')
+
+# HTTP client implementations
+BACKENDS = ('aiohttp', 'raw')
+
+# TestResult counters that add up when statistics from several engines merge
+MERGED_COUNTERS = (
+    'total_requests', 'successful_requests', 'failed_requests', 'late_requests',
+    'connections_opened', 'connections_reused', 'connections_closed', 'bytes_received', 'bytes_sent',
+)
+
+# TestResult counters describing the connection pool, reported for the whole run rather than a phase
+CONNECTION_COUNTERS = ('connections_opened', 'connections_reused', 'connections_closed')
+
+# Sends starting later than this behind their scheduled time count as late
+LATE_SEND_THRESHOLD_NS = 1_000_000
+
+# Seconds between progress lines in headless mode
+HEADLESS_PROGRESS_INTERVAL = 10
+
+# Failure classes named on the live status line
+LIVE_ERROR_CLASSES = 2
+
+# Load phases in the order a run goes through them; only steady is measured
+LOAD_PHASES = ('warmup', 'ramp', 'steady', 'drain')
+
+# Share of the full load run during warmup when a ramp follows it
+RAMP_START_FRACTION = 0.1
 
 @dataclass
 class TestResult:
@@ -25,35 +67,218 @@ class TestResult:
     failed_requests: int = 0
     total_time: float = 0.0
     requests_per_second: float = 0.0
+    bytes_received: int = 0
+    bytes_per_second: float = 0.0
+    bytes_sent: int = 0
+    bytes_sent_per_second: float = 0.0
     min_response_time: float = float('inf')
     max_response_time: float = 0.0
     avg_response_time: float = 0.0
     median_response_time: float = 0.0
+    p90_response_time: float = 0.0
+    p95_response_time: float = 0.0
+    p99_response_time: float = 0.0
+    p999_response_time: float = 0.0
+    target_rate: float = 0.0
+    late_requests: int = 0
+    max_schedule_lag: float = 0.0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    connections_closed: int = 0
     status_codes: Dict[int, int] = None
+    error_types: Dict[str, int] = None
+    error_latencies: Dict[str, Dict[str, float]] = None
+    phase_latencies: Dict[str, Dict[str, float]] = None
+    generator: Dict[str, float] = None
+    endpoint_stats: Dict[str, Dict[str, float]] = None
+    timeseries: List[Dict[str, float]] = None
+    measured_phase: str = 'steady'
+    load_phases: Dict[str, Dict[str, float]] = None
     
     def __post_init__(self):
         if self.status_codes is None:
             self.status_codes = {}
+        if self.error_types is None:
+            self.error_types = {}
+        if self.error_latencies is None:
+            self.error_latencies = {}
+        if self.phase_latencies is None:
+            self.phase_latencies = {}
+        if self.generator is None:
+            self.generator = {}
+        if self.endpoint_stats is None:
+            self.endpoint_stats = {}
+        if self.timeseries is None:
+            self.timeseries = []
+        if self.load_phases is None:
+            self.load_phases = {}
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dict"""
+        data = asdict(self)
+        if data['min_response_time'] == float('inf'):
+            data['min_response_time'] = None
+        data['status_codes'] = {str(code): count for code, count in self.status_codes.items()}
+        return data
+
+
+@dataclass
+class Snapshot:
+    """Statistics of one interval of a running test (latencies in seconds)"""
+    elapsed: float
+    phase: str
+    requests: int
+    failed: int
+    requests_per_second: float
+    bytes_per_second: float
+    error_rate: float
+    avg_response_time: float
+    p50_response_time: float
+    p90_response_time: float
+    p99_response_time: float
+    max_response_time: float
+    total_requests: int
+    successful_requests: int
+    failed_requests: int
+    loop_lag: float
+    cpu_utilization: float
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-serializable dict"""
+        return asdict(self)
 
 
 class HavocEngine:
     """⚡ High-Power Load Testing Engine"""
     
-    def __init__(self, target_url: str, max_concurrent: int = 1000):
+    def __init__(self, target_url: str, max_concurrent: int = 1000, handle_signals: bool = True,
+                 latency_precision: int = DEFAULT_PRECISION, rate: Optional[float] = None,
+                 connection_mode: str = 'keepalive', pool_size: int = 0,
+                 max_conn_requests: int = 0, max_conn_age: float = 0.0,
+                 keepalive_timeout: float = 15.0, dns_cache_ttl: Optional[float] = 10.0,
+                 trace_phases: bool = False, stream_body: bool = False, max_body_bytes: int = 0,
+                 record_path: Optional[str] = None, record_format: Optional[str] = None,
+                 scenario: Optional[Scenario] = None, backend: str = 'aiohttp',
+                 pipeline_depth: int = 1, live_window: float = 1,
+                 metrics_port: Optional[int] = None, request_timeout: float = 30.0,
+                 max_requests: Optional[int] = None, headless: bool = False, method: str = 'GET',
+                 payload: Optional[PayloadPool] = None, warmup: float = 0.0, ramp: float = 0.0,
+                 drain: float = 0.0, profile_path: Optional[str] = None):
         """
         Initialize the Havoc Engine
         
         Args:
             target_url: Target website URL
             max_concurrent: Maximum concurrent connections
+            handle_signals: Install SIGINT/SIGTERM handlers for graceful shutdown
+            latency_precision: Significant digits kept by the latency histogram
+            rate: Open-loop arrival rate in requests per second (default: closed loop)
+            connection_mode: 'keepalive' to reuse pooled connections, 'close' for one per request
+            pool_size: Maximum pooled connections per host (0: limited by max_concurrent)
+            max_conn_requests: Retire a kept-alive connection after this many requests (0: never)
+            max_conn_age: Retire a kept-alive connection after this many seconds (0: never)
+            keepalive_timeout: Seconds an idle pooled connection is kept open
+            dns_cache_ttl: Seconds DNS answers are cached (0: no caching, None: forever)
+            trace_phases: Record DNS, connect, pool wait, TTFB and body time separately
+            stream_body: Drain response bodies chunk by chunk instead of buffering them
+            max_body_bytes: Stop reading each body after this many bytes (0: read it all)
+            record_path: Stream one record per request to this file
+            record_format: 'ndjson' or 'binary' (default: inferred from record_path)
+            scenario: Weighted request templates to send instead of GET target_url
+            backend: 'aiohttp', or 'raw' for the minimal HTTP/1.1 client (no redirects or tracing)
+            pipeline_depth: Requests pipelined per connection by the raw backend
+            live_window: Seconds of traffic the live RPS, error rate and percentiles cover
+            metrics_port: Serve OpenMetrics on this local port while the test runs
+            request_timeout: Seconds before a request fails with a timeout
+            max_requests: Stop after this many requests (default: no limit)
+            headless: No countdown and no live status line, only periodic progress lines
+            method: HTTP method sent to target_url
+            payload: Pre-encoded request bodies sent to target_url (default: no body)
+            warmup: Seconds of load before the ramp, left out of the results
+            ramp: Seconds over which the load rises to max_concurrent (or rate)
+            drain: Seconds in-flight requests get to finish once the test stops
+            profile_path: Write a sampling profile of the event loop thread to this file
         """
+        if connection_mode not in CONNECTION_MODES:
+            raise ValueError(f"connection_mode must be one of {', '.join(CONNECTION_MODES)}")
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {', '.join(BACKENDS)}")
+        if backend == 'raw' and trace_phases:
+            raise ValueError("Phase tracing needs the aiohttp backend")
+        if pipeline_depth > 1 and backend != 'raw':
+            raise ValueError("Pipelining needs the raw backend")
+        if request_timeout <= 0:
+            raise ValueError("request_timeout must be positive")
+        if max_requests is not None and max_requests < 0:
+            raise ValueError("max_requests must not be negative")
+        if not 0 < live_window <= max(LIVE_WINDOWS):
+            raise ValueError(f"live_window must be between 1 and {max(LIVE_WINDOWS)} seconds")
+        method = method.upper()
+        if method not in METHODS:
+            raise ValueError(f"method must be one of {', '.join(METHODS)}")
+        if scenario and (payload or method != 'GET'):
+            raise ValueError("Scenario requests bring their own method and body")
+        if min(warmup, ramp, drain) < 0:
+            raise ValueError("warmup, ramp and drain must not be negative")
+        
         self.target_url = target_url
         self.max_concurrent = max_concurrent
-        self.results = TestResult()
-        self.response_times: List[float] = []
+        self.latency_precision = latency_precision
+        self.rate = rate
+        self.connection_mode = connection_mode
+        self.pool_size = pool_size
+        self.max_conn_requests = max_conn_requests
+        self.max_conn_age = max_conn_age
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.stream_body = stream_body or max_body_bytes > 0
+        self.max_body_bytes = max_body_bytes
+        self.record_path = record_path
+        self.record_format = record_format
+        self.recorder: Optional[ResultRecorder] = None
+        self.scenario = scenario
+        self.template_stats: List[TemplateStats] = [TemplateStats() for _ in scenario.templates] if scenario else []
+        self.results = TestResult(target_rate=rate or 0.0)
+        self.stats = StatShard()
+        self.histogram = LatencyHistogram(latency_precision)
+        self.error_histograms = [LatencyHistogram(ERROR_PRECISION) for _ in ERROR_NAMES]
+        self.tracer = PhaseTracer(latency_precision) if trace_phases else None
+        self.probe = LoopProbe()
+        self.profile_path = profile_path
+        self.profiler: Optional[SamplingProfiler] = None
         self.is_running = False
         self.start_time = 0
         self.session: Optional[aiohttp.ClientSession] = None
+        self.backend = backend
+        self.pipeline_depth = pipeline_depth
+        self.raw_client: Optional[RawHTTPClient] = None
+        self.live_window = live_window
+        self.rolling: Optional[RollingMetrics] = None
+        self.metrics_server = MetricsServer(self, metrics_port) if metrics_port else None
+        self.request_timeout = request_timeout
+        self.max_requests = max_requests
+        self.headless = headless
+        self.method = method
+        self.payload = payload
+        self.warmup = warmup
+        self.ramp = ramp
+        self.drain = drain
+        self.phase = 'steady'
+        self.interval_histograms: List[Dict] = []
+        self._completed = 0
+        self._live_ticks = 0
+        self._last_phases: Dict = {}
+        self._remaining = float('inf')
+        self._raw_requests: List[RawRequest] = []
+        self._raw_payloads: Dict[int, Tuple[RawRequest, int, list]] = {}
+        self._raw_headers: Dict[str, str] = {}
+        if backend == 'raw':
+            self._send_request = self._send_raw_request
+        self._schedule_start = 0
+        self._next_slot = 0
+        
+        # Connection totals already folded into the results
+        self._reported_connections = (0, 0, 0)
         
         # User agents for realistic load
         self.user_agents = [
@@ -65,8 +290,9 @@ class HavocEngine:
         ]
         
         # Setup signal handler for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
     
     def _signal_handler(self, signum, frame):
         """Handle interrupt signals gracefully"""
@@ -74,122 +300,461 @@ class HavocEngine:
         print(f"{Fore.RED}🚫 Stopping Havoc Engine...{Style.RESET_ALL}")
         self.is_running = False
     
+    def _default_headers(self) -> Dict[str, str]:
+        """Headers sent with every request"""
+        headers = {
+            'User-Agent': random.choice(self.user_agents),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive' if self.connection_mode == 'keepalive' else 'close',
+            'Upgrade-Insecure-Requests': '1',
+            'Cache-Control': 'no-cache',
+            'Pragma': 'no-cache'
+        }
+        if self.payload:
+            headers['Content-Type'] = self.payload.content_type
+        return headers
+    
     async def _create_session(self):
         """Create aiohttp session with custom headers"""
-        timeout = aiohttp.ClientTimeout(total=30)
-        connector = aiohttp.TCPConnector(
+        if self.backend == 'raw':
+            self._create_raw_client()
+            return
+        
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        keep_alive = self.connection_mode == 'keepalive'
+        
+        connector_options = {}
+        if keep_alive:
+            connector_options['keepalive_timeout'] = self.keepalive_timeout
+        
+        connector = HavocConnector(
+            max_conn_requests=self.max_conn_requests if keep_alive else 0,
+            max_conn_age=self.max_conn_age if keep_alive else 0.0,
             limit=self.max_concurrent,
-            force_close=True,
-            enable_cleanup_closed=True
+            limit_per_host=self.pool_size,
+            force_close=not keep_alive,
+            use_dns_cache=self.dns_cache_ttl != 0,
+            ttl_dns_cache=self.dns_cache_ttl or None,
+            enable_cleanup_closed=True,
+            **connector_options
         )
         
         self.session = aiohttp.ClientSession(
             connector=connector,
             timeout=timeout,
-            headers={
-                'User-Agent': random.choice(self.user_agents),
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Cache-Control': 'no-cache',
-                'Pragma': 'no-cache'
-            }
+            trace_configs=[self.tracer.trace_config] if self.tracer else None,
+            headers=self._default_headers()
         )
     
-    async def _send_request(self, request_id: int) -> Tuple[bool, float, Optional[int]]:
+    def _create_raw_client(self):
+        """Create the raw HTTP/1.1 client and serialize every request up front"""
+        keep_alive = self.connection_mode == 'keepalive'
+        self.raw_client = RawHTTPClient(
+            pipeline_depth=self.pipeline_depth,
+            keep_alive=keep_alive,
+            max_conn_requests=self.max_conn_requests,
+            max_conn_age=self.max_conn_age,
+            max_body_bytes=self.max_body_bytes,
+            timeout=self.request_timeout,
+            dns_cache_ttl=self.dns_cache_ttl,
+        )
+        
+        # Bodies are counted on the wire, so ask for them uncompressed
+        headers = self._default_headers()
+        headers['Accept-Encoding'] = 'identity'
+        
+        if self.scenario:
+            self._raw_requests = []
+            for template in self.scenario.templates:
+                merged = CIMultiDict(headers)
+                merged.update(template.headers)
+                self._raw_requests.append(self.raw_client.compile(template.method, template.url, merged, template.body))
+        elif self.payload:
+            # Per-request bodies are compiled per worker, on its first request
+            self._raw_payloads = {}
+            self._raw_requests = [self.raw_client.compile(self.method, self.target_url, headers, body)
+                                  for body in self.payload.bodies]
+            self._raw_headers = headers
+        else:
+            self._raw_requests = [self.raw_client.compile(self.method, self.target_url, headers)]
+    
+    async def _send_request(self, request_id: int, start_time: Optional[int] = None) -> Tuple[bool, int, Optional[int], int, int, int]:
         """
         Send a single HTTP request
         
+        Args:
+            request_id: Identifier of the sending worker
+            start_time: perf_counter_ns() the latency is measured from (default: now)
+        
         Returns:
-            Tuple of (success, response_time, status_code)
+            Tuple of (success, response_time_ns, status_code, body_bytes, error_code, template_index)
         """
         if not self.session:
-            return False, 0.0, None
+            return False, 0, None, 0, ERROR_NONE, 0
         
-        start_time = time.time()
-        try:
-            async with self.session.get(
+        # Templates are compiled up front, so only the pick happens per request
+        if self.scenario:
+            template_index = self.scenario.pick()
+            template = self.scenario.templates[template_index]
+            if template.body:
+                self.stats.bytes_sent += len(template.body)
+            request = self.session.request(
+                template.method,
+                template.url,
+                headers=template.headers,
+                data=template.body,
+                ssl=False,
+                allow_redirects=True
+            )
+        elif self.payload:
+            template_index = 0
+            body = self.payload.body(request_id)
+            self.stats.bytes_sent += len(body)
+            request = self.session.request(
+                self.method,
+                self.target_url,
+                data=body,
+                ssl=False,
+                allow_redirects=True
+            )
+        else:
+            template_index = 0
+            request = self.session.request(
+                self.method,
                 self.target_url,
                 ssl=False,
-                allow_redirects=True,
-                timeout=30
-            ) as response:
-                response_time = time.time() - start_time
+                allow_redirects=True
+            )
+        
+        if start_time is None:
+            start_time = time.perf_counter_ns()
+        try:
+            async with request as response:
+                headers_time = time.perf_counter_ns()
+                response_time = headers_time - start_time
                 status = response.status
                 
                 # Read response body to ensure complete request
-                await response.read()
-                
-                return True, response_time, status
-                
-        except aiohttp.ClientError as e:
-            response_time = time.time() - start_time
-            return False, response_time, None
-        except asyncio.TimeoutError:
-            response_time = time.time() - start_time
-            return False, response_time, None
-        except Exception:
-            response_time = time.time() - start_time
-            return False, response_time, None
-    
-    async def _worker(self, worker_id: int, semaphore: asyncio.Semaphore):
-        """Worker coroutine for sending requests"""
-        while self.is_running:
-            async with semaphore:
-                if not self.is_running:
-                    break
+                if self.stream_body:
+                    body_size = await self._drain_body(response)
+                else:
+                    body_size = len(await response.read())
                 
-                success, resp_time, status_code = await self._send_request(worker_id)
+                if self.tracer:
+                    self.tracer.record_body(time.perf_counter_ns() - headers_time)
                 
-                # Update statistics
-                self.results.total_requests += 1
+                return True, response_time, status, body_size, ERROR_NONE, template_index
                 
-                if success and resp_time > 0:
-                    self.results.successful_requests += 1
-                    self.response_times.append(resp_time)
-                    
-                    # Update response time stats
-                    self.results.min_response_time = min(self.results.min_response_time, resp_time)
-                    self.results.max_response_time = max(self.results.max_response_time, resp_time)
-                    
-                    # Update status codes
-                    if status_code:
-                        self.results.status_codes[status_code] = self.results.status_codes.get(status_code, 0) + 1
-                else:
-                    self.results.failed_requests += 1
+        except Exception as e:
+            response_time = time.perf_counter_ns() - start_time
+            error = classify_error(e)
+            # The connector knows whether a timed out request ever got a connection
+            connector = self.session.connector
+            if error in TIMEOUT_ERRORS and connector is not None:
+                error = connector.stalled.pop(asyncio.current_task(), error)
+            return False, response_time, None, 0, error, template_index
+    
+    async def _send_raw_request(self, request_id: int, start_time: Optional[int] = None) -> Tuple[bool, int, Optional[int], int, int, int]:
+        """
+        Send a single pre-serialized request with the raw backend
+        
+        Args:
+            request_id: Identifier of the sending worker, which picks its connection
+            start_time: perf_counter_ns() the latency is measured from (default: now)
+        
+        Returns:
+            Same tuple as _send_request
+        """
+        template_index = self.scenario.pick() if self.scenario else 0
+        request = self._raw_payload(request_id) if self.payload else self._raw_requests[template_index]
+        if start_time is None:
+            start_time = time.perf_counter_ns()
+        try:
+            status, headers_time, body_size = await self.raw_client.request(request_id, request)
+            return True, headers_time - start_time, status, body_size, ERROR_NONE, template_index
+        except Exception as e:
+            response_time = time.perf_counter_ns() - start_time
+            return False, response_time, None, 0, classify_error(e), template_index
     
-    async def _monitor(self):
-        """Monitor and display real-time statistics"""
-        last_count = 0
-        last_time = time.time()
+    def _raw_payload(self, worker_id: int) -> RawRequest:
+        """Next pre-serialized request carrying a pool body"""
+        payload = self.payload
+        if not payload.per_request:
+            index = payload.next_index()
+            self.stats.bytes_sent += len(payload.bodies[index])
+            return self._raw_requests[index]
         
-        while self.is_running:
-            await asyncio.sleep(1)
+        # Each worker owns one serialized request whose fields are rewritten in place
+        entry = self._raw_payloads.get(worker_id)
+        if entry is None:
+            body, fields = payload.render(worker_id)
+            compiled = self.raw_client.compile(self.method, self.target_url, self._raw_headers, body)
+            request = RawRequest(compiled.origin, bytearray(compiled.data), compiled.is_head)
+            entry = self._raw_payloads[worker_id] = (request, len(compiled.data) - len(body), fields)
+        request, base, fields = entry
+        payload.fill(request.data, fields, base)
+        self.stats.bytes_sent += len(request.data) - base
+        return request
+    
+    async def _drain_body(self, response: aiohttp.ClientResponse) -> int:
+        """
+        Discard a response body as it arrives, without buffering it
+        
+        aiohttp hands out the chunks its parser already allocated, so
+        nothing is copied or joined. When max_body_bytes is reached the
+        rest of the body is abandoned and the connection is closed.
+        
+        Returns:
+            Number of body bytes read
+        """
+        content = response.content
+        limit = self.max_body_bytes
+        received = 0
+        
+        while True:
+            chunk = await content.readany()
+            if not chunk:
+                return received
+            received += len(chunk)
+            if limit and received >= limit:
+                if not content.at_eof():
+                    response.close()
+                return received
+    
+    def _collect_connection_stats(self):
+        """Fold connection totals from the session's connector into the results"""
+        if self.raw_client:
+            counts = self.raw_client.counts()
+        else:
+            # A closed session has already released its connector
+            connector = self.session.connector if self.session else None
+            if connector is None:
+                return
+            counts = connector.counts()
+        opened, reused, closed = (now - before for now, before in zip(counts, self._reported_connections))
+        self.results.connections_opened += opened
+        self.results.connections_reused += reused
+        self.results.connections_closed += closed
+        self._reported_connections = counts
+    
+    def _start_delay(self, worker_id: int) -> float:
+        """
+        Seconds a closed-loop worker waits before sending its first request
+        
+        Warmup runs RAMP_START_FRACTION of the workers when a ramp follows,
+        and the ramp then starts the rest at evenly spaced times.
+        """
+        if not self.ramp:
+            return 0.0
+        initial = max(1, int(self.max_concurrent * RAMP_START_FRACTION))
+        if worker_id < initial:
+            return 0.0
+        return self.warmup + self.ramp * (worker_id - initial + 1) / (self.max_concurrent - initial)
+    
+    def _ramp_offset(self, slot: int) -> int:
+        """
+        Nanoseconds from the schedule start to ``slot`` when the rate ramps up
+        
+        Warmup runs at RAMP_START_FRACTION of the rate, then the rate rises
+        linearly to its target over the ramp, so slot times follow the
+        inverse of the cumulative arrival curve.
+        """
+        rate = self.rate
+        low = rate * RAMP_START_FRACTION
+        warmup_slots = low * self.warmup
+        if slot < warmup_slots:
+            return int(slot / low * 1e9)
+        
+        slot -= warmup_slots
+        slope = (rate - low) / self.ramp
+        ramp_slots = (low + rate) / 2 * self.ramp
+        if slot < ramp_slots:
+            # Solve low*t + slope*t^2/2 = slot for the time t into the ramp
+            elapsed = (math.sqrt(low * low + 2 * slope * slot) - low) / slope
+            return int((self.warmup + elapsed) * 1e9)
+        return int((self.warmup + self.ramp + (slot - ramp_slots) / rate) * 1e9)
+    
+    async def _worker(self, worker_id: int):
+        """Worker coroutine for sending requests"""
+        delay = self._start_delay(worker_id)
+        if delay:
+            await asyncio.sleep(delay)
+        
+        # One worker per concurrency slot, so no semaphore is needed
+        while self.is_running and self._remaining:
+            self._remaining -= 1
+            self._record(*await self._send_request(worker_id))
+    
+    async def _rate_worker(self, worker_id: int):
+        """
+        Worker coroutine for open-loop arrival-rate mode
+        
+        Requests are sent on a fixed timeline no matter how long earlier
+        responses take. Latency is measured from each request's intended
+        send time, so time spent queued behind a slow server is included.
+        """
+        interval_ns = 1e9 / self.rate
+        ramped = self.ramp > 0
+        
+        while self.is_running and self._remaining:
+            self._remaining -= 1
             
-            current_time = time.time()
-            elapsed = current_time - last_time
-            current_count = self.results.total_requests
+            # Claim the next slot on the shared timeline
+            slot = self._next_slot
+            self._next_slot += 1
+            offset = self._ramp_offset(slot) if ramped else int(slot * interval_ns)
+            intended = self._schedule_start + offset
             
-            if elapsed > 0:
-                rps = (current_count - last_count) / elapsed
-                
-                # Calculate real-time statistics
-                if self.response_times:
-                    avg_time = statistics.mean(self.response_times[-100:]) if len(self.response_times) >= 100 else statistics.mean(self.response_times)
-                else:
-                    avg_time = 0
-                
-                # Display stats
-                print(f"\r{Fore.CYAN}⚡ REQUESTS: {Fore.WHITE}{current_count:,} | "
-                      f"{Fore.GREEN}RPS: {rps:.0f} | "
-                      f"{Fore.YELLOW}AVG: {avg_time*1000:.0f}ms | "
-                      f"{Fore.GREEN}SUCCESS: {self.results.successful_requests:,} | "
-                      f"{Fore.RED}FAILED: {self.results.failed_requests:,}{Style.RESET_ALL}", end="")
-                
-                last_count = current_count
-                last_time = current_time
+            delay = intended - time.perf_counter_ns()
+            if delay > 0:
+                await asyncio.sleep(delay / 1e9)
+                if not self.is_running:
+                    break
+            elif -delay > LATE_SEND_THRESHOLD_NS:
+                self.stats.late_requests += 1
+                if -delay / 1e9 > self.stats.max_schedule_lag:
+                    self.stats.max_schedule_lag = -delay / 1e9
+            
+            self._record(*await self._send_request(worker_id, intended))
+    
+    def _record(self, success: bool, resp_time: int, status_code: Optional[int], body_size: int, error: int,
+                template: int = 0):
+        """Update statistics with the outcome of one request"""
+        stats = self.stats
+        stats.bytes_received += body_size
+        
+        # Server errors got a response, but they are failures of their own class
+        if success and status_code >= 500:
+            error = ERROR_HTTP_5XX
+        
+        if self.recorder:
+            self.recorder.record(time.time_ns() - resp_time, resp_time, status_code, body_size, error, template)
+        
+        template_stats = self.template_stats[template] if self.template_stats else None
+        if template_stats:
+            template_stats.total += 1
+        
+        if success and resp_time > 0 and not error:
+            # Slot per status code; slot 0 counts requests without a response
+            stats.status_counts[status_code] += 1
+            self.histogram.record(resp_time)
+            if template_stats:
+                template_stats.histogram.record(resp_time)
+        else:
+            stats.status_counts[status_code if error == ERROR_HTTP_5XX else 0] += 1
+            stats.error_counts[error] += 1
+            self.error_histograms[error].record(resp_time)
+            if template_stats:
+                template_stats.failed += 1
+    
+    def _fold_stats(self):
+        """Fold the hot-path counters into the results"""
+        self.stats.fold_into(self.results)
+    
+    def _display_live(self, snapshot: Snapshot):
+        """Display real-time statistics for the interval that just ended"""
+        # Headless runs log a plain line now and then instead of redrawing one
+        self._live_ticks += 1
+        if self.headless and self._live_ticks % HEADLESS_PROGRESS_INTERVAL:
+            return
+        
+        window = f"{self.live_window:g}s"
+        live = self.rolling.window(self.live_window)
+        prefix, end = (f"[{snapshot.elapsed:6.0f}s] ", "\n") if self.headless else ("\r", "")
+        
+        # Counters restart with every load phase
+        if self.warmup or self.ramp:
+            prefix += f"{Fore.MAGENTA}{snapshot.phase.upper()} | "
+        
+        # A busy generator delays every response it has yet to read
+        busy = ""
+        if snapshot.loop_lag >= LIVE_LAG_WARNING or snapshot.cpu_utilization >= CPU_SATURATION:
+            busy = (f" | {Fore.RED}{Style.BRIGHT}GENERATOR BUSY: lag {snapshot.loop_lag*1000:.0f}ms, "
+                    f"CPU {snapshot.cpu_utilization*100:.0f}%{Style.NORMAL}")
+        
+        # Late sends only exist on an arrival-rate schedule
+        late = f" | {Fore.MAGENTA}LATE: {self.results.late_requests:,}" if self.rate else ""
+        
+        # Mean time per request phase since the last line
+        phases = ""
+        if self.tracer:
+            totals = self.tracer.totals()
+            for phase, label in (('acquire', 'ACQ'), ('ttfb', 'TTFB'), ('body', 'BODY')):
+                count = totals[phase][0] - self._last_phases[phase][0]
+                mean = (totals[phase][1] - self._last_phases[phase][1]) / count / 1e6 if count > 0 else 0
+                phases += f" | {Fore.BLUE}{label}: {mean:.1f}ms"
+            self._last_phases = totals
+        
+        # Most frequent failure classes so far
+        causes = ""
+        if self.results.error_types:
+            top = sorted(self.results.error_types.items(), key=lambda item: -item[1])[:LIVE_ERROR_CLASSES]
+            causes = " (" + ", ".join(f"{name}: {count:,}" for name, count in top) + ")"
+        
+        # Display stats, rates and latencies over the live window
+        print(f"{prefix}{Fore.CYAN}⚡ REQUESTS: {Fore.WHITE}{snapshot.total_requests:,} | "
+              f"{Fore.GREEN}RPS: {live['requests_per_second']:.0f} | "
+              f"{Fore.GREEN}MB/s: {live['bytes_per_second']/1e6:.1f} | "
+              f"{Fore.RED}ERR: {live['error_rate']*100:.1f}% | "
+              f"{Fore.YELLOW}P50/P90/P99 ({window}): {live['p50_response_time']*1000:.0f}/"
+              f"{live['p90_response_time']*1000:.0f}/{live['p99_response_time']*1000:.0f}ms | "
+              f"{Fore.GREEN}SUCCESS: {snapshot.successful_requests:,} | "
+              f"{Fore.RED}FAILED: {snapshot.failed_requests:,}{causes}{late}{phases}{busy}{Style.RESET_ALL}", end=end)
+    
+    def _files_description(self, path: str) -> str:
+        """Describe where per-process output requested as ``path`` was written"""
+        return path
+    
+    def _finalize_results(self):
+        """Fill the derived rate and latency fields of the results"""
+        self._fold_stats()
+        if self.results.total_time > 0:
+            self.results.requests_per_second = self.results.total_requests / self.results.total_time
+            self.results.bytes_per_second = self.results.bytes_received / self.results.total_time
+            self.results.bytes_sent_per_second = self.results.bytes_sent / self.results.total_time
+        
+        self._compute_latency_stats()
+    
+    def _compute_latency_stats(self):
+        """Fill the latency fields of the results from the histograms"""
+        if self.tracer:
+            self.results.phase_latencies = self.tracer.summary()
+        self.results.generator = self.probe.summary()
+        
+        if self.scenario:
+            self.results.endpoint_stats = {
+                name: stats.summary()
+                for name, stats in zip(self.scenario.names, self.template_stats)
+                if stats.total
+            }
+        
+        self.results.error_latencies = {}
+        for name, errors in zip(ERROR_NAMES, self.error_histograms):
+            if errors.total_count:
+                p50, p99 = errors.percentiles([50, 99])
+                self.results.error_latencies[name] = {
+                    'count': errors.total_count,
+                    'avg': errors.mean / 1e9,
+                    'p50': p50 / 1e9,
+                    'p99': p99 / 1e9,
+                    'max': errors.max_value / 1e9,
+                }
+        
+        histogram = self.histogram
+        if not histogram.total_count:
+            return
+        
+        p50, p90, p95, p99, p999 = histogram.percentiles([50, 90, 95, 99, 99.9])
+        self.results.min_response_time = histogram.min_value / 1e9
+        self.results.max_response_time = histogram.max_value / 1e9
+        self.results.avg_response_time = histogram.mean / 1e9
+        self.results.median_response_time = p50 / 1e9
+        self.results.p90_response_time = p90 / 1e9
+        self.results.p95_response_time = p95 / 1e9
+        self.results.p99_response_time = p99 / 1e9
+        self.results.p999_response_time = p999 / 1e9
     
     def _display_final_results(self):
         """Display comprehensive test results"""
@@ -197,30 +762,119 @@ class HavocEngine:
         print(f"{Fore.CYAN}{Style.BRIGHT}🔥 BSB HAVOC - LOAD TEST RESULTS{' ' * 40}{Style.RESET_ALL}")
         print(f"{'='*80}")
         
-        if self.results.total_time > 0:
-            self.results.requests_per_second = self.results.total_requests / self.results.total_time
-        
-        if self.response_times:
-            self.results.avg_response_time = statistics.mean(self.response_times)
-            self.results.median_response_time = statistics.median(self.response_times)
+        self._finalize_results()
         
         # Summary Statistics
         print(f"{Fore.YELLOW}📊 SUMMARY STATISTICS:{Style.RESET_ALL}")
         print(f"  {Fore.WHITE}• Target URL:{Style.RESET_ALL} {self.target_url}")
-        print(f"  {Fore.WHITE}• Total Duration:{Style.RESET_ALL} {self.results.total_time:.2f} seconds")
-        print(f"  {Fore.WHITE}• Total Requests:{Style.RESET_ALL} {self.results.total_requests:,}")
-        print(f"  {Fore.WHITE}• Successful Requests:{Style.RESET_ALL} {self.results.successful_requests:,} ({self.results.successful_requests/self.results.total_requests*100:.1f}%)")
-        print(f"  {Fore.WHITE}• Failed Requests:{Style.RESET_ALL} {self.results.failed_requests:,} ({self.results.failed_requests/self.results.total_requests*100:.1f}%)")
+        phased = len(self.results.load_phases) > 1 or self.results.measured_phase != 'steady'
+        print(f"  {Fore.WHITE}• {'Measured' if phased else 'Total'} Duration:{Style.RESET_ALL} {self.results.total_time:.2f} seconds")
+        total = self.results.total_requests
+        success_pct = self.results.successful_requests / total * 100 if total else 0.0
+        failed_pct = self.results.failed_requests / total * 100 if total else 0.0
+        print(f"  {Fore.WHITE}• Total Requests:{Style.RESET_ALL} {total:,}")
+        print(f"  {Fore.WHITE}• Successful Requests:{Style.RESET_ALL} {self.results.successful_requests:,} ({success_pct:.1f}%)")
+        print(f"  {Fore.WHITE}• Failed Requests:{Style.RESET_ALL} {self.results.failed_requests:,} ({failed_pct:.1f}%)")
         print(f"  {Fore.WHITE}• Requests Per Second:{Style.RESET_ALL} {self.results.requests_per_second:.0f}")
+        print(f"  {Fore.WHITE}• Data Received:{Style.RESET_ALL} {self.results.bytes_received/1e6:,.1f} MB ({self.results.bytes_per_second/1e6:.2f} MB/s)")
+        if self.results.bytes_sent:
+            print(f"  {Fore.WHITE}• Data Sent:{Style.RESET_ALL} {self.results.bytes_sent/1e6:,.1f} MB ({self.results.bytes_sent_per_second/1e6:.2f} MB/s)")
+        
+        # Load Phases
+        if phased:
+            print(f"\n{Fore.YELLOW}🌡️  LOAD PHASES:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}{'Phase':<20}{'Duration':>10}{'Requests':>12}{'RPS':>10}{'Errors':>9}{'P50':>10}{'P99':>10}{Style.RESET_ALL}")
+            for name in LOAD_PHASES:
+                phase = self.results.load_phases.get(name)
+                if not phase:
+                    continue
+                label = f"{name} (measured)" if name == self.results.measured_phase else name
+                print(f"  {label:<20}{phase['duration']:>9.1f}s{phase['requests']:>12,}{phase['requests_per_second']:>10,.0f}"
+                      f"{phase['error_rate']*100:>8.2f}%{phase['p50_response_time']*1000:>8.0f}ms"
+                      f"{phase['p99_response_time']*1000:>8.0f}ms")
+            if self.results.measured_phase != 'steady':
+                print(f"  {Fore.RED}⚠️  Stopped during {self.results.measured_phase} - no steady-state window was measured{Style.RESET_ALL}")
+        
+        # Connection Usage
+        opened, reused = self.results.connections_opened, self.results.connections_reused
+        if opened:
+            print(f"\n{Fore.YELLOW}🔌 CONNECTIONS ({self.connection_mode.upper()}):{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• Opened:{Style.RESET_ALL} {opened:,}")
+            print(f"  {Fore.WHITE}• Reused:{Style.RESET_ALL} {reused:,} ({reused/(opened+reused)*100:.1f}% of requests)")
+            print(f"  {Fore.WHITE}• Closed:{Style.RESET_ALL} {self.results.connections_closed:,}")
+        
+        # Load Generator Health
+        generator = self.results.generator
+        if generator:
+            print(f"\n{Fore.YELLOW}🩺 LOAD GENERATOR:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• Event Loop Lag:{Style.RESET_ALL} p50 {generator['loop_lag_p50']*1000:.1f} ms | "
+                  f"p90 {generator['loop_lag_p90']*1000:.1f} ms | p99 {generator['loop_lag_p99']*1000:.1f} ms | max {generator['loop_lag_max']*1000:.1f} ms")
+            print(f"  {Fore.WHITE}• CPU:{Style.RESET_ALL} {generator['cpu_utilization']*100:.0f}% of a core "
+                  f"(peak {generator['cpu_peak']*100:.0f}%)")
+            if generator['ready_queue_peak'] is not None:
+                print(f"  {Fore.WHITE}• Ready Queue:{Style.RESET_ALL} avg {generator['ready_queue_avg']:,.1f} | "
+                      f"peak {generator['ready_queue_peak']:,}")
+            if generator['saturated']:
+                print(f"  {Fore.RED}⚠️  The load generator is the bottleneck - latencies include time spent waiting "
+                      f"in its own event loop; add processes (-p) or agents{Style.RESET_ALL}")
+        
+        # Schedule Adherence
+        if self.rate:
+            late_pct = self.results.late_requests / self.results.total_requests * 100 if self.results.total_requests else 0
+            print(f"\n{Fore.YELLOW}🕒 ARRIVAL SCHEDULE:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• Target Rate:{Style.RESET_ALL} {self.results.target_rate:.0f} req/s")
+            print(f"  {Fore.WHITE}• Late Sends:{Style.RESET_ALL} {self.results.late_requests:,} ({late_pct:.1f}%)")
+            print(f"  {Fore.WHITE}• Max Schedule Lag:{Style.RESET_ALL} {self.results.max_schedule_lag*1000:.0f} ms")
+            if self.results.late_requests:
+                print(f"  {Fore.RED}⚠️  Generator fell behind schedule - latencies include the queueing delay{Style.RESET_ALL}")
         
         # Response Time Analysis
-        if self.response_times:
+        if self.histogram.total_count:
             print(f"\n{Fore.YELLOW}⏱️  RESPONSE TIME ANALYSIS:{Style.RESET_ALL}")
             print(f"  {Fore.WHITE}• Minimum:{Style.RESET_ALL} {self.results.min_response_time*1000:.0f} ms")
             print(f"  {Fore.WHITE}• Maximum:{Style.RESET_ALL} {self.results.max_response_time*1000:.0f} ms")
             print(f"  {Fore.WHITE}• Average:{Style.RESET_ALL} {self.results.avg_response_time*1000:.0f} ms")
             print(f"  {Fore.WHITE}• Median:{Style.RESET_ALL} {self.results.median_response_time*1000:.0f} ms")
-            print(f"  {Fore.WHITE}• 95th Percentile:{Style.RESET_ALL} {statistics.quantiles(self.response_times, n=100)[94]*1000:.0f} ms")
+            print(f"  {Fore.WHITE}• 90th Percentile:{Style.RESET_ALL} {self.results.p90_response_time*1000:.0f} ms")
+            print(f"  {Fore.WHITE}• 95th Percentile:{Style.RESET_ALL} {self.results.p95_response_time*1000:.0f} ms")
+            print(f"  {Fore.WHITE}• 99th Percentile:{Style.RESET_ALL} {self.results.p99_response_time*1000:.0f} ms")
+            print(f"  {Fore.WHITE}• 99.9th Percentile:{Style.RESET_ALL} {self.results.p999_response_time*1000:.1f} ms")
+        
+        # Request Phase Breakdown
+        if self.results.phase_latencies:
+            print(f"\n{Fore.YELLOW}🔬 REQUEST PHASE BREAKDOWN:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}{'Phase':<24}{'Count':>10}{'Avg':>10}{'P50':>10}{'P90':>10}{'P99':>10}{'Max':>10}{Style.RESET_ALL}")
+            for phase, stats in self.results.phase_latencies.items():
+                print(f"  {PHASE_LABELS[phase]:<24}{stats['count']:>10,}"
+                      f"{stats['avg']*1000:>8.2f}ms{stats['p50']*1000:>8.2f}ms{stats['p90']*1000:>8.2f}ms"
+                      f"{stats['p99']*1000:>8.2f}ms{stats['max']*1000:>8.2f}ms")
+        
+        # Latency Over Time
+        if len(self.results.timeseries) > 1:
+            series = self.results.timeseries
+            worst = max(series, key=lambda point: point['p99_response_time'])
+            print(f"\n{Fore.YELLOW}📉 LATENCY OVER TIME:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}{'Interval':<18}{'RPS':>10}{'Errors':>9}{'P50':>10}{'P99 (max)':>12}{'Max':>10}{Style.RESET_ALL}")
+            for segment in condense(series):
+                span = f"{segment['start']:.0f}s - {segment['end']:.0f}s"
+                print(f"  {span:<18}{segment['requests_per_second']:>10,.0f}{segment['error_rate']*100:>8.2f}%"
+                      f"{segment['p50_response_time']*1000:>8.0f}ms{segment['p99_response_time']*1000:>10.0f}ms"
+                      f"{segment['max_response_time']*1000:>8.0f}ms")
+            print(f"  {Fore.WHITE}• Slowest Second:{Style.RESET_ALL} {worst['elapsed']:.0f}s "
+                  f"(p99 {worst['p99_response_time']*1000:.0f} ms, {worst['requests_per_second']:,.0f} req/s)")
+        
+        # Per-Endpoint Breakdown
+        if self.results.endpoint_stats:
+            width = max(24, max(len(name) for name in self.results.endpoint_stats) + 2)
+            print(f"\n{Fore.YELLOW}🗺️  ENDPOINT BREAKDOWN:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}{'Endpoint':<{width}}{'Requests':>10}{'Share':>8}{'Failed':>8}{'Avg':>10}{'P50':>10}{'P99':>10}{Style.RESET_ALL}")
+            for name, stats in self.results.endpoint_stats.items():
+                total = stats['total_requests']
+                share = total / self.results.total_requests * 100
+                failed = stats['failed_requests'] / total * 100
+                print(f"  {name:<{width}}{total:>10,}{share:>7.1f}%{failed:>7.1f}%"
+                      f"{stats['avg_response_time']*1000:>8.0f}ms{stats['p50_response_time']*1000:>8.0f}ms"
+                      f"{stats['p99_response_time']*1000:>8.0f}ms")
         
         # Status Code Distribution
         if self.results.status_codes:
@@ -230,74 +884,402 @@ class HavocEngine:
                 color = Fore.GREEN if code < 300 else Fore.YELLOW if code < 400 else Fore.RED
                 print(f"  {color}{code}:{Style.RESET_ALL} {count:,} ({percentage:.1f}%)")
         
+        # Failure Classes
+        if self.results.error_types:
+            print(f"\n{Fore.YELLOW}🧯 FAILURES BY CLASS:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}{'Class':<20}{'Count':>10}{'Share':>8}{'Avg':>10}{'P50':>10}{'P99':>10}{'Max':>10}{Style.RESET_ALL}")
+            for name, count in sorted(self.results.error_types.items(), key=lambda item: -item[1]):
+                percentage = (count / self.results.total_requests) * 100
+                latency = self.results.error_latencies.get(name)
+                timing = (f"{latency['avg']*1000:>8.0f}ms{latency['p50']*1000:>8.0f}ms"
+                          f"{latency['p99']*1000:>8.0f}ms{latency['max']*1000:>8.0f}ms" if latency else "")
+                print(f"  {Fore.RED}{name:<20}{Style.RESET_ALL}{count:>10,}{percentage:>7.1f}%{timing}")
+        
+        # Per-Request Log
+        if self.recorder:
+            print(f"\n{Fore.YELLOW}💾 REQUEST LOG:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• File:{Style.RESET_ALL} {self.recorder.path} ({self.recorder.format})")
+            print(f"  {Fore.WHITE}• Records Written:{Style.RESET_ALL} {self.recorder.recorded:,}")
+            if self.recorder.dropped:
+                print(f"  {Fore.RED}• Records Dropped:{Style.RESET_ALL} {self.recorder.dropped:,} (disk too slow)")
+        elif self.record_path:
+            print(f"\n{Fore.YELLOW}💾 REQUEST LOG:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• Files:{Style.RESET_ALL} {self._files_description(self.record_path)}")
+        
+        # Sampling Profile
+        if self.profiler:
+            profile = self.profiler.summary()
+            print(f"\n{Fore.YELLOW}🔥 PROFILE:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• File:{Style.RESET_ALL} {self.profiler.path} (folded stacks for flamegraph.pl or speedscope)")
+            idle = f", {profile['idle']*100:.1f}% idle" if profile['clock'] == 'wall' else ""
+            print(f"  {Fore.WHITE}• Samples:{Style.RESET_ALL} {profile['samples']:,} of {profile['clock']} time "
+                  f"({profile['hot_path']*100:.1f}% in _worker/_send_request{idle})")
+            for function, share in profile['top']:
+                print(f"  {Fore.WHITE}• {share*100:5.1f}%{Style.RESET_ALL} {function}")
+        elif self.profile_path:
+            print(f"\n{Fore.YELLOW}🔥 PROFILE:{Style.RESET_ALL}")
+            print(f"  {Fore.WHITE}• Files:{Style.RESET_ALL} {self._files_description(self.profile_path)}")
+        
         print(f"{'='*80}")
         print(f"{Fore.MAGENTA}{Style.BRIGHT}🚀 Test completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}")
         print(f"{'='*80}\n")
     
-    async def run(self):
+    async def _start_load(self) -> List[asyncio.Task]:
         """
-        Run the load test
+        Create the session and launch the worker tasks
         
         Returns:
-            TestResult object with comprehensive statistics
+            List of tasks generating load
+        """
+        # Create session
+        await self._create_session()
+        
+        if self.record_path and not self.recorder:
+            self.recorder = ResultRecorder(self.record_path, self.record_format,
+                                           endpoints=self.scenario.names if self.scenario else None)
+        
+        # Watch the event loop this process generates load from
+        self.probe.start()
+        if self.profile_path and not self.profiler:
+            self.profiler = SamplingProfiler(self.profile_path)
+            self.profiler.start()
+        
+        # Requests are claimed before they are sent, so a budget is never overshot
+        self._remaining = self.max_requests if self.max_requests is not None else float('inf')
+        
+        if self.rate:
+            self._schedule_start = time.perf_counter_ns()
+            self._next_slot = 0
+            return [
+                asyncio.create_task(self._rate_worker(i))
+                for i in range(self.max_concurrent)
+            ]
+        
+        # Create worker tasks
+        return [
+            asyncio.create_task(self._worker(i))
+            for i in range(self.max_concurrent)
+        ]
+    
+    async def _stop_load(self, tasks: List[asyncio.Task]):
+        """Let in-flight requests finish for up to drain seconds, then cancel the load tasks and release the session"""
+        # Workers send nothing new once is_running is cleared
+        if self.drain and tasks:
+            await asyncio.wait(tasks, timeout=self.drain)
+        
+        for task in tasks:
+            task.cancel()
+        await self.probe.stop()
+        
+        if self.session:
+            self._collect_connection_stats()
+            await self.session.close()
+        if self.raw_client:
+            self._collect_connection_stats()
+            await self.raw_client.close()
+        
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Flush buffered records without blocking the event loop
+        if self.recorder:
+            await asyncio.get_running_loop().run_in_executor(None, self.recorder.close)
+        if self.profiler:
+            self.profiler.stop()
+            await asyncio.get_running_loop().run_in_executor(None, self.profiler.write)
+    
+    def _drain_stats(self) -> Dict:
+        """
+        Take the statistics gathered since the last drain and reset them
+        
+        Returns:
+            Plain dict of counters and the serialized latency histogram
+        """
+        self._collect_connection_stats()
+        self._fold_stats()
+        results = self.results
+        self.results = TestResult(target_rate=results.target_rate)
+        histogram = self.histogram.to_dict()
+        self.histogram.reset()
+        error_histograms = {}
+        for name, errors in zip(ERROR_NAMES, self.error_histograms):
+            if errors.total_count:
+                error_histograms[name] = errors.to_dict()
+                errors.reset()
+        
+        stats = {name: getattr(results, name) for name in MERGED_COUNTERS}
+        stats.update({
+            'max_schedule_lag': results.max_schedule_lag,
+            'status_codes': results.status_codes,
+            'error_types': results.error_types,
+            'histogram': histogram,
+            'error_histograms': error_histograms,
+            'loop': self.probe.drain(),
+        })
+        if self.tracer:
+            stats['phases'] = self.tracer.drain()
+        if self.template_stats:
+            stats['templates'] = [template.drain() for template in self.template_stats]
+        
+        # Exported counters carry on across phases
+        if self.metrics_server:
+            self.metrics_server.totals.add(stats)
+        return stats
+    
+    def _merge_stats(self, stats: Dict):
+        """Fold statistics drained from another engine into this one"""
+        for name in MERGED_COUNTERS:
+            setattr(self.results, name, getattr(self.results, name) + stats[name])
+        self.results.max_schedule_lag = max(self.results.max_schedule_lag, stats['max_schedule_lag'])
+        
+        for code, count in stats['status_codes'].items():
+            self.results.status_codes[code] = self.results.status_codes.get(code, 0) + count
+        for name, count in stats['error_types'].items():
+            self.results.error_types[name] = self.results.error_types.get(name, 0) + count
+        
+        self.histogram.merge_dict(stats['histogram'])
+        for name, errors in stats['error_histograms'].items():
+            self.error_histograms[ERROR_NAMES.index(name)].merge_dict(errors)
+        self.probe.merge(stats['loop'])
+        if self.tracer and 'phases' in stats:
+            self.tracer.merge(stats['phases'])
+        for template, drained in zip(self.template_stats, stats.get('templates', ())):
+            template.merge(drained)
+    
+    async def run_window(self, duration: float) -> TestResult:
         """
+        Run the load for a fixed time, without countdown or terminal output
+        
+        Args:
+            duration: Seconds to generate load for
+        
+        Returns:
+            TestResult object for the window
+        """
+        self.is_running = True
+        workers = await self._start_load()
+        self.start_time = time.time()
+        
+        try:
+            deadline = self.start_time + duration
+            while self.is_running and time.time() < deadline:
+                await asyncio.sleep(min(0.1, max(0.0, deadline - time.time())))
+        finally:
+            self.is_running = False
+            self.results.total_time = time.time() - self.start_time
+            await self._stop_load(workers)
+            self._finalize_results()
+        
+        return self.results
+    
+    async def _countdown(self):
+        """Warn about the load and count down, unless interrupted"""
         print(f"\n{Fore.RED}{Style.BRIGHT}⚠️  WARNING: This tool generates extreme load!{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}   Press {Fore.WHITE}Ctrl+C{Fore.YELLOW} or {Fore.WHITE}Ctrl+Z{Fore.YELLOW} to stop the test immediately!{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}   Continuing will potentially take down the target!{Style.RESET_ALL}\n")
         
-        # Countdown
         for i in range(5, 0, -1):
+            if not self.is_running:
+                return
             print(f"{Fore.RED}{'🚨' * i} Starting in {i} seconds...{'🚨' * i}{Style.RESET_ALL}", end="\r")
             await asyncio.sleep(1)
         
         print("\n" + " " * 100, end="\r")
+    
+    def _close_phase(self) -> Dict:
+        """
+        End the current load phase
+        
+        Returns:
+            Statistics of the phase, as returned by _drain_stats
+        """
+        self._fold_stats()
+        self.rolling.close(self.results)
+        stats = self._drain_stats()
+        self.rolling.rebase()
+        self._completed += stats['total_requests']
+        return stats
+    
+    @staticmethod
+    def _phase_summary(requests: int, failed: int, histogram: LatencyHistogram, duration: float) -> Dict[str, float]:
+        """Summarize one load phase (latencies in seconds)"""
+        p50, p90, p99 = histogram.percentiles([50, 90, 99])
+        return {
+            'duration': duration,
+            'requests': requests,
+            'failed': failed,
+            'requests_per_second': requests / duration if duration > 0 else 0.0,
+            'error_rate': failed / requests if requests else 0.0,
+            'p50_response_time': p50 / 1e9,
+            'p90_response_time': p90 / 1e9,
+            'p99_response_time': p99 / 1e9,
+            'max_response_time': histogram.max_value / 1e9,
+        }
+    
+    def stop(self):
+        """Ask a running test to stop; the current run or snapshot iteration winds down"""
+        self.is_running = False
+    
+    def _snapshot(self) -> Snapshot:
+        """Close the current interval and describe it"""
+        self._fold_stats()
+        self.rolling.tick(self.results)
+        lag, cpu = self.probe.interval()
+        return Snapshot(
+            phase=self.phase,
+            total_requests=self.results.total_requests,
+            successful_requests=self.results.successful_requests,
+            failed_requests=self.results.failed_requests,
+            loop_lag=lag,
+            cpu_utilization=cpu,
+            **self.rolling.series[-1]
+        )
+    
+    async def snapshots(self, duration: Optional[float] = None, interval: float = 1.0) -> AsyncIterator[Snapshot]:
+        """
+        Run the load test without terminal output, yielding a Snapshot every interval
+        
+        The run goes through warmup and ramp when they are configured, then
+        the steady state, then the drain. Statistics restart at every phase
+        boundary: once the iteration is over (or closed early) the results
+        describe the steady state alone, and every phase is summarized in
+        load_phases. Several engines can run on one event loop this way.
+        
+        Args:
+            duration: Seconds of steady state (default: run until stop() is
+                called or until max_requests have completed)
+            interval: Seconds between snapshots
         
-        # Start the test
+        Yields:
+            Statistics of every interval
+        """
         self.is_running = True
-        self.start_time = time.time()
+        self._completed = 0
+        upcoming = [(name, seconds) for name, seconds in (('warmup', self.warmup), ('ramp', self.ramp)) if seconds]
+        summaries = {}
+        connections = dict.fromkeys(CONNECTION_COUNTERS, 0)
         
-        # Create session
-        await self._create_session()
+        # The clock starts once the load does: spawning worker processes or agents takes a while
+        workers = await self._start_load()
+        self.start_time = time.time()
         
-        # Create semaphore for concurrency control
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Expose live metrics for scrapers
+        if self.metrics_server:
+            await self.metrics_server.start()
         
-        # Create worker tasks
-        workers = [
-            asyncio.create_task(self._worker(i, semaphore))
-            for i in range(self.max_concurrent)
-        ]
+        self.rolling = RollingMetrics(self.histogram, interval=interval)
+        next_tick = self.start_time + interval
         
-        # Start monitoring
-        monitor_task = asyncio.create_task(self._monitor())
+        # The steady-state clock starts once warmup and ramp are over
+        self.phase = upcoming[0][0] if upcoming else 'steady'
+        phase_start, phase_mark = self.start_time, 0
+        phase_end = self.start_time + upcoming[0][1] if upcoming else None
+        deadline = self.start_time + duration if duration and not upcoming else None
         
         try:
-            # Run until interrupted
+            # Run until stopped, out of time or out of requests
             while self.is_running:
-                await asyncio.sleep(0.1)
-        except KeyboardInterrupt:
-            print(f"\n\n{Fore.RED}🛑 Keyboard Interrupt Detected! Stopping...{Style.RESET_ALL}")
-            self.is_running = False
+                await asyncio.sleep(min(0.1, interval))
+                now = time.time()
+                if now >= next_tick:
+                    next_tick = max(next_tick + interval, now)
+                    yield self._snapshot()
+                    now = time.time()
+                if phase_end and now >= phase_end:
+                    stats = self._close_phase()
+                    for name in CONNECTION_COUNTERS:
+                        connections[name] += stats[name]
+                    summaries[self.phase] = self._phase_summary(
+                        stats['total_requests'], stats['failed_requests'],
+                        LatencyHistogram.from_dict(stats['histogram']), now - phase_start)
+                    upcoming.pop(0)
+                    phase_start, phase_mark = now, len(self.rolling.series)
+                    if upcoming:
+                        self.phase, phase_end = upcoming[0][0], now + upcoming[0][1]
+                    else:
+                        self.phase, phase_end = 'steady', None
+                        deadline = now + duration if duration else None
+                if deadline and now >= deadline:
+                    break
+                if self.max_requests is not None and \
+                        self._completed + self.results.total_requests + self.stats.total >= self.max_requests:
+                    break
         finally:
-            # Calculate total time
-            self.results.total_time = time.time() - self.start_time
+            self.is_running = False
+            
+            # Scrapes end here: the statistics are reshuffled into the final results below
+            if self.metrics_server:
+                await self.metrics_server.stop()
             
-            # Cancel all workers
-            for worker in workers:
-                worker.cancel()
+            # The measured phase is the steady state, or whichever phase the run stopped in
+            measured_phase = self.phase
+            measured_time = time.time() - phase_start
+            measured = self._close_phase()
+            history = self.rolling.history(phase_mark)
             
-            # Cancel monitor
-            monitor_task.cancel()
+            # Stop workers and close session, letting in-flight requests finish
+            self.phase = 'drain'
+            drain_start = time.time()
+            await self._stop_load(workers)
+            tail = self._drain_stats()
             
-            # Close session
-            if self.session:
-                await self.session.close()
+            # Without a drain phase, the last reports still belong to the measured phase
+            self._merge_stats(measured)
+            if self.drain:
+                drained = self._phase_summary(tail['total_requests'], tail['failed_requests'],
+                                              LatencyHistogram.from_dict(tail['histogram']), time.time() - drain_start)
+                for name in CONNECTION_COUNTERS:
+                    connections[name] += tail[name]
+            else:
+                self._merge_stats(tail)
             
-            # Wait for tasks to complete
-            await asyncio.gather(*workers, return_exceptions=True)
-            await asyncio.gather(monitor_task, return_exceptions=True)
+            # Connections opened while warming up serve the steady state too
+            for name, count in connections.items():
+                setattr(self.results, name, getattr(self.results, name) + count)
             
-            # Display final results
-            self._display_final_results()
+            self.results.total_time = measured_time
+            self.results.measured_phase = measured_phase
+            summaries[measured_phase] = self._phase_summary(
+                self.results.total_requests, self.results.failed_requests, self.histogram, measured_time)
+            if self.drain:
+                summaries['drain'] = drained
+            self.results.load_phases = summaries
+            self.results.timeseries, self.interval_histograms = history
+            self._finalize_results()
+    
+    async def run(self, duration: Optional[float] = None):
+        """
+        Run the load test with a countdown, live status and final report
+        
+        Args:
+            duration: Seconds of steady state (default: run until interrupted
+                or until max_requests have completed)
+        
+        Returns:
+            TestResult object with comprehensive statistics
+        """
+        # Set before the countdown so an interrupt during it is not lost
+        self.is_running = True
+        if not self.headless:
+            await self._countdown()
+        if not self.is_running:
+            return self.results
+        
+        if self.metrics_server:
+            print(f"{Fore.CYAN}📡 Metrics:{Style.RESET_ALL} http://{self.metrics_server.host}:{self.metrics_server.port}/metrics")
+        
+        # Start the test and monitor it
+        self._live_ticks = 0
+        self._last_phases = self.tracer.totals() if self.tracer else {}
+        stream = self.snapshots(duration)
+        try:
+            async for snapshot in stream:
+                self._display_live(snapshot)
+        except KeyboardInterrupt:
+            print(f"\n\n{Fore.RED}🛑 Keyboard Interrupt Detected! Stopping...{Style.RESET_ALL}")
+        finally:
+            await stream.aclose()
+        
+        # Display final results
+        self._display_final_results()
         
         return self.results
@@ -0,0 +1,88 @@
+"""
+BSB Havoc Errors - Request Failure Classes
+🧯 Compact integer codes for why a request failed
+"""
+
+import asyncio
+import errno
+import socket
+import ssl
+
+import aiohttp
+
+# Codes are stored in binary record files, so existing values never change
+ERROR_NONE = 0
+ERROR_READ_TIMEOUT = 1
+ERROR_CONNECTION = 2
+ERROR_CLIENT = 3
+ERROR_OTHER = 4
+ERROR_CONNECT_REFUSED = 5
+ERROR_CONNECTION_RESET = 6
+ERROR_DNS = 7
+ERROR_TLS = 8
+ERROR_CONNECT_TIMEOUT = 9
+ERROR_POOL_EXHAUSTED = 10
+ERROR_HTTP_5XX = 11
+
+# Names indexed by error code
+ERROR_NAMES = (
+    'none', 'read_timeout', 'connection', 'client', 'other', 'connect_refused',
+    'connection_reset', 'dns', 'tls', 'connect_timeout', 'pool_exhausted', 'http_5xx',
+)
+
+# Significant digits of the per-class latency histograms
+ERROR_PRECISION = 2
+
+# Timeouts a connector can narrow down to the phase the request was stuck in
+TIMEOUT_ERRORS = (ERROR_READ_TIMEOUT, ERROR_CONNECT_TIMEOUT)
+
+_RESET_ERRNOS = (errno.ECONNRESET, errno.EPIPE, errno.ECONNABORTED)
+_CONNECTION_TIMEOUT_ERRORS = tuple(
+    getattr(aiohttp, name) for name in ('ConnectionTimeoutError',) if hasattr(aiohttp, name)
+)
+_DNS_ERRORS = (socket.gaierror,) + tuple(
+    getattr(aiohttp, name) for name in ('ClientConnectorDNSError',) if hasattr(aiohttp, name)
+)
+
+
+class ConnectTimeoutError(asyncio.TimeoutError):
+    """Timed out before a connection to the target was established"""
+
+
+class PoolTimeoutError(asyncio.TimeoutError):
+    """Timed out waiting for a free connection in the pool"""
+
+
+def classify_error(error: BaseException) -> int:
+    """Map an exception raised while sending a request to an error code"""
+    if isinstance(error, PoolTimeoutError):
+        return ERROR_POOL_EXHAUSTED
+    if isinstance(error, (ConnectTimeoutError,) + _CONNECTION_TIMEOUT_ERRORS):
+        return ERROR_CONNECT_TIMEOUT
+    if isinstance(error, asyncio.TimeoutError):
+        return ERROR_READ_TIMEOUT
+    if isinstance(error, (aiohttp.ClientSSLError, ssl.SSLError, ssl.CertificateError)):
+        return ERROR_TLS
+    if isinstance(error, _DNS_ERRORS):
+        return ERROR_DNS
+
+    # aiohttp wraps the OS error raised while connecting
+    cause = getattr(error, 'os_error', None) or error
+    if isinstance(cause, _DNS_ERRORS):
+        return ERROR_DNS
+    if isinstance(cause, (ssl.SSLError, ssl.CertificateError)):
+        return ERROR_TLS
+    if isinstance(cause, ConnectionRefusedError) or getattr(cause, 'errno', None) == errno.ECONNREFUSED:
+        return ERROR_CONNECT_REFUSED
+    if (isinstance(error, (ConnectionResetError, BrokenPipeError, aiohttp.ServerDisconnectedError)) or
+            isinstance(cause, (ConnectionResetError, BrokenPipeError)) or
+            getattr(cause, 'errno', None) in _RESET_ERRNOS):
+        return ERROR_CONNECTION_RESET
+
+    if isinstance(error, aiohttp.ClientConnectionError):
+        return ERROR_CONNECTION
+    if isinstance(error, aiohttp.ClientError):
+        return ERROR_CLIENT
+    if isinstance(error, OSError):
+        return ERROR_CONNECTION
+    return ERROR_OTHER
@@ -0,0 +1,177 @@
+"""
+BSB Havoc Health - Load Generator Self-Monitoring
+🩺 Tells a saturated target apart from a saturated load generator
+"""
+
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from .histogram import LatencyHistogram
+
+# Seconds between event-loop lag probes
+PROBE_INTERVAL = 0.01
+
+# Seconds between CPU utilization samples
+CPU_SAMPLE_INTERVAL = 1.0
+
+# Shortest window a CPU utilization peak is taken over, so scheduler noise is not one (seconds)
+CPU_PEAK_WINDOW = 0.2
+
+# Significant digits of the loop lag histogram
+LAG_PRECISION = 2
+
+# The generator is the bottleneck when one probe in ten is this late (seconds)...
+LAG_SATURATION = 0.01
+
+# ...or past this share of a core, on average per process
+CPU_SATURATION = 0.9
+
+# A single stall this long (seconds) is flagged on the live status line
+LIVE_LAG_WARNING = 0.05
+
+
+class LoopProbe:
+    """🩺 Measures how late the event loop runs what it scheduled
+
+    A probe task asks to be woken every PROBE_INTERVAL and records how
+    much later it actually ran. Everything else waiting in the loop's
+    ready queue is delayed just as much: a response that arrived is not
+    read, and its latency keeps growing, until the loop gets to it. The
+    ready queue length is read on every probe (the asyncio loop only,
+    uvloop does not expose it), and process CPU time is compared with
+    wall-clock time every CPU_SAMPLE_INTERVAL and whenever the probe is
+    drained.
+    """
+
+    def __init__(self):
+        """Initialize the probe, idle until ``start``"""
+        self.lag = LatencyHistogram(LAG_PRECISION)
+        self.cpu_time = 0.0
+        self.wall_time = 0.0
+        self.cpu_peak = 0.0
+        self.ready_total = 0
+        self.ready_samples = 0
+        self.ready_peak = 0
+        self._recent_lag = 0
+        self._recent_cpu = 0.0
+        self._marks = (time.process_time(), time.perf_counter())
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start probing the running event loop"""
+        self._marks = (time.process_time(), time.perf_counter())
+        self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        """Stop probing, accounting the CPU time used so far"""
+        if self._task is None:
+            return
+        self.sample()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _probe(self):
+        """Sleep for PROBE_INTERVAL over and over, recording how late each wakeup is"""
+        ready = getattr(asyncio.get_running_loop(), '_ready', None)
+        interval_ns = int(PROBE_INTERVAL * 1e9)
+        clock = time.perf_counter_ns
+        next_sample = time.perf_counter() + CPU_SAMPLE_INTERVAL
+
+        while True:
+            expected = clock() + interval_ns
+            await asyncio.sleep(PROBE_INTERVAL)
+            lag = clock() - expected
+            self.lag.record(lag)
+            if lag > self._recent_lag:
+                self._recent_lag = lag
+
+            if ready is not None:
+                depth = len(ready)
+                self.ready_total += depth
+                self.ready_samples += 1
+                if depth > self.ready_peak:
+                    self.ready_peak = depth
+
+            if time.perf_counter() >= next_sample:
+                self.sample()
+                next_sample = self._marks[1] + CPU_SAMPLE_INTERVAL
+
+    def sample(self):
+        """Account the process CPU time used since the last sample"""
+        cpu, wall = time.process_time(), time.perf_counter()
+        used, elapsed = cpu - self._marks[0], wall - self._marks[1]
+        self._marks = (cpu, wall)
+        if elapsed <= 0:
+            return
+
+        self.cpu_time += used
+        self.wall_time += elapsed
+        if elapsed >= CPU_PEAK_WINDOW:
+            utilization = used / elapsed
+            self.cpu_peak = max(self.cpu_peak, utilization)
+            self._recent_cpu = max(self._recent_cpu, utilization)
+
+    def interval(self) -> Tuple[float, float]:
+        """
+        Worst loop lag and CPU utilization since the last call
+
+        Returns:
+            Tuple of (lag in seconds, share of a core), the worst of this
+            probe and every probe merged into it
+        """
+        lag, cpu = self._recent_lag / 1e9, self._recent_cpu
+        self._recent_lag, self._recent_cpu = 0, 0.0
+        return lag, cpu
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize the probed loop(s), latencies in seconds (empty: never probed)"""
+        if not self.lag.total_count:
+            return {}
+
+        p50, p90, p99 = self.lag.percentiles([50, 90, 99])
+        cpu = self.cpu_time / self.wall_time if self.wall_time > 0 else 0.0
+        return {
+            'loop_lag_p50': p50 / 1e9,
+            'loop_lag_p90': p90 / 1e9,
+            'loop_lag_p99': p99 / 1e9,
+            'loop_lag_max': self.lag.max_value / 1e9,
+            'cpu_utilization': cpu,
+            'cpu_peak': self.cpu_peak,
+            'ready_queue_avg': self.ready_total / self.ready_samples if self.ready_samples else None,
+            'ready_queue_peak': self.ready_peak if self.ready_samples else None,
+            'saturated': p90 / 1e9 >= LAG_SATURATION or cpu >= CPU_SATURATION,
+        }
+
+    def drain(self) -> Dict:
+        """Serialize and reset the probe statistics"""
+        if self._task is not None:
+            self.sample()
+        drained = {
+            'lag': self.lag.to_dict(),
+            'cpu_time': self.cpu_time,
+            'wall_time': self.wall_time,
+            'cpu_peak': self.cpu_peak,
+            'ready_total': self.ready_total,
+            'ready_samples': self.ready_samples,
+            'ready_peak': self.ready_peak,
+        }
+        self.lag.reset()
+        self.cpu_time = self.wall_time = self.cpu_peak = 0.0
+        self.ready_total = self.ready_samples = self.ready_peak = 0
+        return drained
+
+    def merge(self, drained: Dict):
+        """Merge statistics produced by ``drain`` on another probe"""
+        self.lag.merge_dict(drained['lag'])
+        self.cpu_time += drained['cpu_time']
+        self.wall_time += drained['wall_time']
+        self.cpu_peak = max(self.cpu_peak, drained['cpu_peak'])
+        self.ready_total += drained['ready_total']
+        self.ready_samples += drained['ready_samples']
+        self.ready_peak = max(self.ready_peak, drained['ready_peak'])
+
+        # Another process's worst moment shows on the live line too
+        self._recent_lag = max(self._recent_lag, drained['lag']['max'])
+        self._recent_cpu = max(self._recent_cpu, drained['cpu_peak'])
@@ -0,0 +1,250 @@
+"""
+BSB Havoc Histogram - Fixed-Memory Latency Recording
+📊 HDR-style log-linear buckets with configurable precision
+"""
+
+import math
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+# Default range: 1 ns up to 1 hour, kept to 3 significant digits
+DEFAULT_LOWEST_NS = 1
+DEFAULT_HIGHEST_NS = 3600 * 1_000_000_000
+DEFAULT_PRECISION = 3
+
+
+class LatencyHistogram:
+    """📊 Mergeable latency histogram recording integer nanoseconds
+
+    Memory is fixed at construction time no matter how many values are
+    recorded. Every value is kept within ``precision`` significant decimal
+    digits, and histograms built with the same settings merge exactly.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION,
+                 lowest: int = DEFAULT_LOWEST_NS, highest: int = DEFAULT_HIGHEST_NS):
+        """
+        Initialize an empty histogram
+
+        Args:
+            precision: Significant decimal digits kept per value (1-5)
+            lowest: Smallest discernible value in nanoseconds
+            highest: Largest trackable value in nanoseconds
+        """
+        if not 1 <= precision <= 5:
+            raise ValueError("precision must be between 1 and 5")
+        if lowest < 1 or highest < 2 * lowest:
+            raise ValueError("highest must be at least twice lowest, and lowest at least 1")
+
+        self.precision = precision
+        self.lowest = lowest
+        self.highest = highest
+
+        largest_single_unit = 2 * 10 ** precision
+        self._unit_magnitude = int(math.floor(math.log2(lowest)))
+        self._sub_bucket_half_magnitude = int(math.ceil(math.log2(largest_single_unit))) - 1
+        self._sub_bucket_count = 1 << (self._sub_bucket_half_magnitude + 1)
+        self._sub_bucket_half = self._sub_bucket_count >> 1
+        self._sub_bucket_mask = (self._sub_bucket_count - 1) << self._unit_magnitude
+
+        bucket_count = 1
+        smallest_untrackable = self._sub_bucket_count << self._unit_magnitude
+        while smallest_untrackable <= highest:
+            smallest_untrackable <<= 1
+            bucket_count += 1
+
+        self.counts = array('q', bytes(8 * (bucket_count + 1) * self._sub_bucket_half))
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value = 0
+        self.max_value = 0
+
+    def _index_of(self, value: int) -> int:
+        """Map a value to its slot in ``counts``"""
+        bucket = (value | self._sub_bucket_mask).bit_length() - self._unit_magnitude - self._sub_bucket_half_magnitude - 1
+        sub_bucket = value >> (bucket + self._unit_magnitude)
+        return ((bucket + 1) << self._sub_bucket_half_magnitude) + sub_bucket - self._sub_bucket_half
+
+    def _range_of(self, index: int) -> Tuple[int, int]:
+        """Return the lowest value and width of the slot at ``index``"""
+        bucket = (index >> self._sub_bucket_half_magnitude) - 1
+        sub_bucket = (index & (self._sub_bucket_half - 1)) + self._sub_bucket_half
+        if bucket < 0:
+            sub_bucket -= self._sub_bucket_half
+            bucket = 0
+        shift = bucket + self._unit_magnitude
+        return sub_bucket << shift, 1 << shift
+
+    def record(self, value: int, count: int = 1):
+        """Record ``count`` occurrences of ``value`` nanoseconds"""
+        if value < 0:
+            value = 0
+        if self.total_count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_value:
+            self.max_value = value
+
+        self.counts[self._index_of(min(value, self.highest))] += count
+        self.total_count += count
+        self.total_sum += value * count
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add every value recorded in ``other`` to this histogram"""
+        if (other.precision, other.lowest, other.highest) != (self.precision, self.lowest, self.highest):
+            raise ValueError("cannot merge histograms with different precision or range")
+        if not other.total_count:
+            return
+
+        counts = self.counts
+        for index, count in enumerate(other.counts):
+            if count:
+                counts[index] += count
+        self._merge_totals(other.total_count, other.total_sum, other.min_value, other.max_value)
+
+    def _merge_totals(self, count: int, total: int, min_value: int, max_value: int):
+        """Fold another histogram's summary values into this one"""
+        if self.total_count == 0 or min_value < self.min_value:
+            self.min_value = min_value
+        self.max_value = max(self.max_value, max_value)
+        self.total_count += count
+        self.total_sum += total
+
+    def reset(self):
+        """Forget every recorded value"""
+        self.counts = array('q', bytes(8 * len(self.counts)))
+        self.total_count = 0
+        self.total_sum = 0
+        self.min_value = 0
+        self.max_value = 0
+
+    def copy(self) -> 'LatencyHistogram':
+        """Return an independent copy of this histogram"""
+        clone = LatencyHistogram(self.precision, self.lowest, self.highest)
+        clone.counts = array('q', self.counts)
+        clone.total_count = self.total_count
+        clone.total_sum = self.total_sum
+        clone.min_value = self.min_value
+        clone.max_value = self.max_value
+        return clone
+
+    @property
+    def mean(self) -> float:
+        """Exact mean of the recorded values in nanoseconds"""
+        return self.total_sum / self.total_count if self.total_count else 0.0
+
+    def percentiles(self, percentiles: Iterable[float]) -> List[int]:
+        """
+        Compute several percentiles in a single pass over the buckets
+
+        Args:
+            percentiles: Percentiles between 0 and 100
+
+        Returns:
+            Values in nanoseconds, in the same order as requested
+        """
+        wanted = list(percentiles)
+        if not self.total_count:
+            return [0] * len(wanted)
+
+        order = sorted(range(len(wanted)), key=lambda i: wanted[i])
+        results = [0] * len(wanted)
+        position = 0
+        cumulative = 0
+
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            cumulative += count
+            while position < len(order):
+                target = max(1, math.ceil(wanted[order[position]] / 100.0 * self.total_count))
+                if cumulative < target:
+                    break
+                low, width = self._range_of(index)
+                results[order[position]] = min(max(low + width - 1, self.min_value), self.max_value)
+                position += 1
+            if position == len(order):
+                break
+
+        for i in order[position:]:
+            results[i] = self.max_value
+        return results
+
+    def percentile(self, percentile: float) -> int:
+        """Value in nanoseconds below which ``percentile`` percent of values fall"""
+        return self.percentiles([percentile])[0]
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """Return ``(upper_bound_ns, count)`` for every non-empty bucket"""
+        result = []
+        for index, count in enumerate(self.counts):
+            if count:
+                low, width = self._range_of(index)
+                result.append((low + width - 1, count))
+        return result
+
+    def to_dict(self) -> Dict:
+        """Serialize to a compact, JSON-friendly dict holding only non-empty buckets"""
+        return {
+            'precision': self.precision,
+            'lowest': self.lowest,
+            'highest': self.highest,
+            'count': self.total_count,
+            'sum': self.total_sum,
+            'min': self.min_value,
+            'max': self.max_value,
+            'buckets': [[index, count] for index, count in enumerate(self.counts) if count],
+        }
+
+    def delta(self, previous: 'LatencyHistogram') -> Dict:
+        """
+        Serialize only the values recorded since ``previous`` was copied
+
+        Args:
+            previous: Earlier ``copy()`` of this histogram (treated as
+                empty when this histogram was reset in between)
+
+        Returns:
+            Dict in the ``to_dict`` format; min and max are bucket bounds
+        """
+        if (previous.precision, previous.lowest, previous.highest) != (self.precision, self.lowest, self.highest):
+            raise ValueError("cannot diff histograms with different precision or range")
+        if previous.total_count > self.total_count:
+            return self.to_dict()
+
+        buckets = [[index, now - before] for index, (now, before) in enumerate(zip(self.counts, previous.counts))
+                   if now != before]
+        low = high = 0
+        if buckets:
+            low = max(self._range_of(buckets[0][0])[0], self.min_value)
+            start, width = self._range_of(buckets[-1][0])
+            high = min(start + width - 1, self.max_value)
+
+        return {
+            'precision': self.precision,
+            'lowest': self.lowest,
+            'highest': self.highest,
+            'count': self.total_count - previous.total_count,
+            'sum': self.total_sum - previous.total_sum,
+            'min': low,
+            'max': high,
+            'buckets': buckets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        """Rebuild a histogram serialized with ``to_dict``"""
+        histogram = cls(data['precision'], data['lowest'], data['highest'])
+        histogram.merge_dict(data)
+        return histogram
+
+    def merge_dict(self, data: Dict):
+        """Merge a histogram serialized with ``to_dict`` without rebuilding it"""
+        if (data['precision'], data['lowest'], data['highest']) != (self.precision, self.lowest, self.highest):
+            raise ValueError("cannot merge histograms with different precision or range")
+        if not data['count']:
+            return
+
+        counts = self.counts
+        for index, count in data['buckets']:
+            counts[index] += count
+        self._merge_totals(data['count'], data['sum'], data['min'], data['max'])
@@ -0,0 +1,265 @@
+"""
+BSB Havoc Metrics - OpenMetrics Exposition Endpoint
+📡 Live engine counters and latency buckets for Prometheus scrapes
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from .errors import ERROR_NAMES
+from .histogram import LatencyHistogram
+
+# Upper bounds of the exported latency buckets (seconds)
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Metric name prefix
+NAMESPACE = 'bsb_havoc'
+
+# TestResult counters exported as OpenMetrics counters
+EXPORTED_COUNTERS = (
+    'total_requests', 'failed_requests', 'bytes_received', 'bytes_sent',
+    'connections_opened', 'connections_reused', 'late_requests',
+)
+
+
+def _label(value) -> str:
+    """Escape a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _cumulative_buckets(histogram) -> List[int]:
+    """Count recorded latencies at or below each LATENCY_BUCKETS bound"""
+    bounds = [int(bound * 1e9) for bound in LATENCY_BUCKETS]
+    counts = [0] * len(bounds)
+    position = 0
+    for upper, count in histogram.buckets():
+        while position < len(bounds) and upper > bounds[position]:
+            position += 1
+        if position == len(bounds):
+            break
+        counts[position] += count
+
+    total = 0
+    for index, count in enumerate(counts):
+        total += count
+        counts[index] = total
+    return counts
+
+
+def _accumulate(histogram: Optional[LatencyHistogram], data: Dict) -> LatencyHistogram:
+    """Merge a serialized histogram into ``histogram``, creating it on first use"""
+    if histogram is None:
+        return LatencyHistogram.from_dict(data)
+    histogram.merge_dict(data)
+    return histogram
+
+
+def _combined(closed: Optional[LatencyHistogram], live: LatencyHistogram) -> LatencyHistogram:
+    """Closed phases plus the live histogram, leaving both untouched"""
+    if closed is None:
+        return live
+    combined = closed.copy()
+    combined.merge(live)
+    return combined
+
+
+class RunTotals:
+    """📡 Statistics of the load phases that are already over
+
+    The engine starts its results, latency histograms and loop probe
+    afresh at every load phase boundary. Each phase's statistics are
+    added here as it closes, and scrapes expose these totals plus the
+    live statistics, so exported counters and histograms only ever grow
+    over the whole run, as Prometheus ``rate()`` expects.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, int] = {name: 0 for name in EXPORTED_COUNTERS}
+        self.status_codes: Dict[int, int] = {}
+        self.error_types: Dict[str, int] = {}
+        self.histogram: Optional[LatencyHistogram] = None
+        self.error_histograms: Dict[str, LatencyHistogram] = {}
+        self.lag: Optional[LatencyHistogram] = None
+        self.cpu_time = 0.0
+        self.templates: List[List] = []
+
+    def add(self, stats: Dict):
+        """Add the statistics of a closed phase, as drained by the engine"""
+        for name in EXPORTED_COUNTERS:
+            self.counters[name] += stats[name]
+        for code, count in stats['status_codes'].items():
+            self.status_codes[code] = self.status_codes.get(code, 0) + count
+        for name, count in stats['error_types'].items():
+            self.error_types[name] = self.error_types.get(name, 0) + count
+
+        self.histogram = _accumulate(self.histogram, stats['histogram'])
+        for name, data in stats['error_histograms'].items():
+            self.error_histograms[name] = _accumulate(self.error_histograms.get(name), data)
+        self.lag = _accumulate(self.lag, stats['loop']['lag'])
+        self.cpu_time += stats['loop']['cpu_time']
+
+        for index, (total, failed, histogram) in enumerate(stats.get('templates', ())):
+            if index == len(self.templates):
+                self.templates.append([0, 0, None])
+            template = self.templates[index]
+            template[0] += total
+            template[1] += failed
+            template[2] = _accumulate(template[2], histogram)
+
+
+def render(engine, totals: Optional[RunTotals] = None) -> str:
+    """
+    Render an engine's statistics in the OpenMetrics text format
+
+    Args:
+        engine: HavocEngine whose results and histograms are exposed
+        totals: Statistics of load phases already closed, added to the
+            engine's live statistics
+
+    Returns:
+        Exposition text, terminated by ``# EOF``
+    """
+    totals = totals or RunTotals()
+    results = engine.results
+    lines = []
+
+    def counter(name: str):
+        return totals.counters[name] + getattr(results, name)
+
+    status_codes = dict(totals.status_codes)
+    for code, count in results.status_codes.items():
+        status_codes[code] = status_codes.get(code, 0) + count
+
+    def family(name: str, kind: str, help_text: str, samples):
+        lines.append(f"# TYPE {NAMESPACE}_{name} {kind}")
+        lines.append(f"# HELP {NAMESPACE}_{name} {help_text}")
+        for suffix, labels, value in samples:
+            label_text = ','.join(f'{key}="{_label(val)}"' for key, val in labels)
+            lines.append(f"{NAMESPACE}_{name}{suffix}{{{label_text}}} {value}" if label_text
+                         else f"{NAMESPACE}_{name}{suffix} {value}")
+
+    def histogram_samples(histogram, labels=()):
+        samples = [('_bucket', tuple(labels) + (('le', repr(bound)),), count)
+                   for bound, count in zip(LATENCY_BUCKETS, _cumulative_buckets(histogram))]
+        samples.append(('_bucket', tuple(labels) + (('le', '+Inf'),), histogram.total_count))
+        samples.append(('_count', tuple(labels), histogram.total_count))
+        samples.append(('_sum', tuple(labels), histogram.total_sum / 1e9))
+        return samples
+
+    family('requests', 'counter', 'Requests completed, successful or not.',
+           [('_total', (), counter('total_requests'))])
+    family('requests_failed', 'counter', 'Requests that got no response or a 5xx response.',
+           [('_total', (), counter('failed_requests'))])
+    family('responses', 'counter', 'HTTP responses by status code.',
+           [('_total', (('code', code),), count) for code, count in sorted(status_codes.items())])
+    family('errors', 'counter', 'Failed requests by error class.',
+           [('_total', (('class', name),), totals.error_types.get(name, 0) + results.error_types.get(name, 0))
+            for name in ERROR_NAMES[1:]])
+    family('received_bytes', 'counter', 'Response body bytes received.',
+           [('_total', (), counter('bytes_received'))])
+    family('sent_bytes', 'counter', 'Request body bytes sent.',
+           [('_total', (), counter('bytes_sent'))])
+    family('connections_opened', 'counter', 'Connections opened to the target.',
+           [('_total', (), counter('connections_opened'))])
+    family('connections_reused', 'counter', 'Requests sent on a reused connection.',
+           [('_total', (), counter('connections_reused'))])
+    if engine.rate:
+        family('late_requests', 'counter', 'Requests sent behind their scheduled time.',
+               [('_total', (), counter('late_requests'))])
+        family('target_rate', 'gauge', 'Target arrival rate in requests per second.',
+               [('', (), engine.rate)])
+    family('concurrency', 'gauge', 'Configured concurrent workers.', [('', (), engine.max_concurrent)])
+    family('event_loop_lag_seconds', 'histogram', 'How late the generator event loop woke a probe task.',
+           histogram_samples(_combined(totals.lag, engine.probe.lag)))
+    family('generator_cpu_seconds', 'counter', 'CPU time used by the load generator processes.',
+           [('_total', (), totals.cpu_time + engine.probe.cpu_time)])
+    family('request_duration_seconds', 'histogram', 'Latency of successful requests.',
+           histogram_samples(_combined(totals.histogram, engine.histogram)))
+    samples = []
+    for name, histogram in zip(ERROR_NAMES[1:], engine.error_histograms[1:]):
+        samples.extend(histogram_samples(_combined(totals.error_histograms.get(name), histogram), (('class', name),)))
+    family('request_failure_duration_seconds', 'histogram', 'Time until a request failed, by error class.',
+           samples)
+
+    if engine.template_stats:
+        closed = totals.templates + [[0, 0, None]] * (len(engine.template_stats) - len(totals.templates))
+        endpoints = list(zip(engine.scenario.names, engine.template_stats, closed))
+        family('endpoint_requests', 'counter', 'Requests per scenario endpoint.',
+               [('_total', (('endpoint', name),), before[0] + template.total) for name, template, before in endpoints])
+        family('endpoint_requests_failed', 'counter', 'Failed requests per scenario endpoint.',
+               [('_total', (('endpoint', name),), before[1] + template.failed) for name, template, before in endpoints])
+        samples = []
+        for name, template, before in endpoints:
+            samples.extend(histogram_samples(_combined(before[2], template.histogram), (('endpoint', name),)))
+        family('endpoint_request_duration_seconds', 'histogram', 'Latency of successful requests per endpoint.',
+               samples)
+
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """📡 Tiny HTTP server answering ``GET /metrics`` from the engine's event loop
+
+    Scrapes read the statistics the engine already keeps: the hot-path
+    counters are folded into the results on demand and the latency
+    histogram is walked once per scrape, so requests pay nothing extra.
+    Phases the engine has closed are kept in ``totals``.
+    """
+
+    def __init__(self, engine, port: int, host: str = '127.0.0.1'):
+        """
+        Configure the endpoint
+
+        Args:
+            engine: HavocEngine to expose
+            port: TCP port to listen on
+            host: Interface to bind (default: loopback only)
+        """
+        self.engine = engine
+        self.port = port
+        self.host = host
+        self.scrapes = 0
+        self.totals = RunTotals()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        """Start listening"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+
+    async def stop(self):
+        """Stop listening"""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer one request and close the connection"""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout=5)
+            parts = head.split(b'\r\n', 1)[0].split()
+            path = parts[1].split(b'?', 1)[0] if len(parts) > 1 else b''
+
+            if parts[:1] in ([b'GET'], [b'HEAD']) and path in (b'/', b'/metrics'):
+                self.engine._collect_connection_stats()
+                self.engine._fold_stats()
+                body = render(self.engine, self.totals).encode()
+                status, content_type = '200 OK', CONTENT_TYPE
+                self.scrapes += 1
+            else:
+                body, status, content_type = b'Not Found\n', '404 Not Found', 'text/plain; charset=utf-8'
+
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode())
+            if parts[:1] != [b'HEAD']:
+                writer.write(body)
+            await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,262 @@
+"""
+BSB Havoc Payloads - Pre-Encoded Request Bodies
+🧱 Bodies built once at startup and handed out per request without encoding
+"""
+
+import base64
+import json
+import os
+import random
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Bodies rendered from a template that varies per pool entry
+DEFAULT_POOL_SIZE = 1000
+
+# Placeholders rendered once per pool entry while the pool is built
+BUILD_VARIABLES = ('index', 'uuid', 'random')
+
+# Placeholders rewritten in place before every request, with their width in digits
+REQUEST_VARIABLES = {'seq': 12, 'timestamp': 13}
+
+# Sample files whose bodies are JSON
+JSON_EXTENSIONS = ('.json', '.ndjson', '.jsonl')
+
+_PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Characters after which a field is a bare JSON value, padded with spaces instead of zeros
+_JSON_VALUE_PREFIXES = (':', ',', '[')
+
+# Position of a per-request field in a body: start, end, modulus, name, format
+Field = Tuple[int, int, int, str, bytes]
+
+Body = Union[bytes, bytearray]
+
+
+def guess_content_type(body: bytes) -> str:
+    """Content-Type for a body that did not come with one"""
+    return 'application/json' if body.lstrip()[:1] in (b'{', b'[') else 'application/octet-stream'
+
+
+def _build_value(name: str, index: int) -> str:
+    """Value of a build-time placeholder for pool entry ``index``"""
+    if name == 'index':
+        return str(index)
+    if name == 'uuid':
+        return str(uuid.uuid4())
+    return str(random.randrange(1 << 31))
+
+
+class PayloadPool:
+    """🧱 Request bodies encoded once and cycled through per request
+
+    Bodies come from a template or from a file of sample bodies. Build
+    variables (``{{index}}``, ``{{uuid}}``, ``{{random}}``) are rendered
+    while the pool is built, so sending a body is an index bump and the
+    same bytes object goes out every time it comes round.
+
+    Per-request variables (``{{seq}}``, ``{{timestamp}}`` in epoch
+    milliseconds) are rendered as fields of fixed width, zero-padded (or
+    space-padded where they stand as a bare JSON number, which keeps the
+    document valid). A body that holds them cannot be shared by requests in flight, so every
+    worker renders the template once into its own buffer and only the
+    digits of those fields are overwritten before each send. The body
+    length never changes, so a pre-serialized request stays valid.
+
+    Engines that split the load across processes or agents give each one
+    an ``interleave``d copy, so their ``{{seq}}`` values never collide.
+    """
+
+    def __init__(self, bodies: List[bytes], content_type: Optional[str] = None,
+                 template: Optional[str] = None):
+        """
+        Create a pool
+
+        Args:
+            bodies: Encoded bodies, sent in turn
+            content_type: Content-Type header sent with the bodies (default: guessed)
+            template: Template with per-request variables; bodies are then
+                rendered per worker instead of taken from ``bodies``
+        """
+        if not bodies and template is None:
+            raise ValueError("payload pool needs at least one body")
+
+        self.bodies = bodies
+        self.template = template
+        sample = bodies[0] if bodies else template.encode()
+        self.content_type = content_type or guess_content_type(sample)
+        self.sequence = 0
+        self.stride = 1
+        self._next = 0
+        self._buffers: Dict[int, Tuple[bytearray, List[Field]]] = {}
+
+    @classmethod
+    def from_template(cls, template: str, size: int = DEFAULT_POOL_SIZE,
+                      content_type: Optional[str] = None) -> 'PayloadPool':
+        """
+        Build a pool from a body template
+
+        Args:
+            template: Body text with optional ``{{variable}}`` placeholders
+            size: Bodies to render when build variables make them differ
+            content_type: Content-Type header (default: guessed from the template)
+        """
+        names = set(_PLACEHOLDER.findall(template))
+        unknown = names - set(BUILD_VARIABLES) - set(REQUEST_VARIABLES)
+        if unknown:
+            raise ValueError(f"Unknown payload variable(s): {', '.join(sorted(unknown))} "
+                             f"(known: {', '.join(BUILD_VARIABLES + tuple(REQUEST_VARIABLES))})")
+        if size < 1:
+            raise ValueError("payload pool size must be at least 1")
+
+        if names & set(REQUEST_VARIABLES):
+            return cls([], content_type, template)
+
+        # Without build variables every rendering is the same body
+        count = size if names else 1
+        return cls([_render(template, index)[0] for index in range(count)], content_type)
+
+    @classmethod
+    def from_file(cls, path: str, content_type: Optional[str] = None) -> 'PayloadPool':
+        """
+        Load sample bodies from a file, sent verbatim
+
+        A ``.json`` file holds one document, or an array of documents that
+        each become a body. Any other file holds one body per line, so
+        NDJSON works as is.
+        """
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.json':
+            document = json.loads(data)
+            samples = document if isinstance(document, list) else [document]
+            bodies = [json.dumps(sample, separators=(',', ':')).encode() for sample in samples]
+        else:
+            bodies = [line.rstrip(b'\r') for line in data.split(b'\n') if line.strip()]
+        if not bodies:
+            raise ValueError(f"{path} holds no payloads")
+
+        if content_type is None and extension in JSON_EXTENSIONS:
+            content_type = 'application/json'
+        return cls(bodies, content_type)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to JSON-compatible data"""
+        return {
+            'bodies': [base64.b64encode(body).decode('ascii') for body in self.bodies],
+            'content_type': self.content_type,
+            'template': self.template,
+            'sequence': self.sequence,
+            'stride': self.stride,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PayloadPool':
+        """Rebuild a pool serialized with ``to_dict``"""
+        pool = cls([base64.b64decode(body) for body in data['bodies']], data['content_type'], data['template'])
+        pool.sequence = data.get('sequence', 0)
+        pool.stride = data.get('stride', 1)
+        return pool
+
+    def interleave(self, index: int, count: int) -> 'PayloadPool':
+        """
+        Copy of the pool for one of ``count`` load generators sharing the sequence
+
+        Generator ``index`` sends every ``count``-th of this pool's
+        ``{{seq}}`` values, starting with the ``index``-th.
+
+        Args:
+            index: Position of the generator, from 0
+            count: Number of generators
+        """
+        pool = PayloadPool(self.bodies, self.content_type, self.template)
+        pool.stride = self.stride * count
+        pool.sequence = self.sequence + (index + 1) * self.stride - pool.stride
+        return pool
+
+    @property
+    def per_request(self) -> bool:
+        """Whether bodies change before every request"""
+        return self.template is not None
+
+    def next_index(self) -> int:
+        """Index of the next shared body to send"""
+        index = self._next
+        self._next = index + 1 if index + 1 < len(self.bodies) else 0
+        return index
+
+    def render(self, worker_id: int) -> Tuple[bytes, List[Field]]:
+        """
+        Render the template for one worker
+
+        Returns:
+            Tuple of (body, per-request fields to pass to ``fill``)
+        """
+        return _render(self.template, worker_id)
+
+    def fill(self, buffer: bytearray, fields: List[Field], base: int = 0):
+        """
+        Write the per-request fields of a rendered body in place
+
+        Args:
+            buffer: Buffer holding the body
+            fields: Fields returned by ``render``
+            base: Offset of the body in ``buffer``
+        """
+        self.sequence += self.stride
+        for start, end, modulus, name, layout in fields:
+            value = self.sequence if name == 'seq' else time.time_ns() // 1_000_000
+            buffer[base + start:base + end] = layout % (end - start, value % modulus)
+
+    def body(self, worker_id: int) -> Body:
+        """Body for a worker's next request"""
+        if self.template is None:
+            return self.bodies[self.next_index()]
+
+        entry = self._buffers.get(worker_id)
+        if entry is None:
+            body, fields = self.render(worker_id)
+            entry = self._buffers[worker_id] = (bytearray(body), fields)
+        buffer, fields = entry
+        self.fill(buffer, fields)
+        return buffer
+
+    def describe(self) -> str:
+        """One-line summary for the run header"""
+        if self.template is not None:
+            return f"per-request template ({self.content_type})"
+        smallest = min(len(body) for body in self.bodies)
+        largest = max(len(body) for body in self.bodies)
+        sizes = f"{smallest:,}-{largest:,}" if smallest != largest else f"{largest:,}"
+        count = f"{len(self.bodies):,} bodies, " if len(self.bodies) > 1 else ""
+        return f"{count}{sizes} bytes ({self.content_type})"
+
+
+def _render(template: str, index: int) -> Tuple[bytes, List[Field]]:
+    """Render build variables and reserve zeroed per-request fields"""
+    parts: List[bytes] = []
+    fields: List[Field] = []
+    offset = position = 0
+    for match in _PLACEHOLDER.finditer(template):
+        literal = template[position:match.start()].encode()
+        parts.append(literal)
+        offset += len(literal)
+        position = match.end()
+
+        name = match.group(1)
+        width = REQUEST_VARIABLES.get(name)
+        if width:
+            bare = template[:match.start()].rstrip()[-1:] in _JSON_VALUE_PREFIXES
+            fields.append((offset, offset + width, 10 ** width, name, b'%*d' if bare else b'%0*d'))
+            value = b'0' * width
+        else:
+            value = _build_value(name, index).encode()
+        parts.append(value)
+        offset += len(value)
+
+    parts.append(template[position:].encode())
+    return b''.join(parts), fields
@@ -0,0 +1,158 @@
+"""
+BSB Havoc Profiler - Sampling Profile of the Load Generator
+🔥 Folded stacks of where the event loop thread spends its time
+"""
+
+import os
+import signal
+import sys
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# Seconds between stack samples
+PROFILE_INTERVAL = 0.005
+
+# Functions whose samples count as the request hot path
+HOT_PATH = ('_worker', '_rate_worker', '_send_request', '_send_raw_request')
+
+# Leaf frame of a loop waiting for I/O with nothing to run
+IDLE_FRAME = 'select (selectors.py'
+
+# Functions listed by self time in the report
+TOP_FUNCTIONS = 5
+
+
+class SamplingProfiler:
+    """🔥 Samples the event loop thread's stack
+
+    On the main thread of a Unix process a CPU-time interval timer
+    (``ITIMER_PROF``) interrupts the loop every PROFILE_INTERVAL of CPU
+    time, so samples land where the CPU goes. Elsewhere a background
+    thread reads the loop thread's frame every PROFILE_INTERVAL of wall
+    time instead; it can only run when the loop thread releases the
+    GIL, which favours frames blocked in system calls. Either way the
+    stack is folded into one ``outer;...;inner`` line and equal stacks
+    are counted.
+
+    Coroutines only have frames while they run, so a sample inside
+    ``_worker`` or ``_send_request`` is time spent on the request hot
+    path. Nothing is traced, so the cost is one stack walk per sample.
+    The file is in the folded format read by flamegraph.pl, speedscope
+    and inferno.
+    """
+
+    def __init__(self, path: str, interval: float = PROFILE_INTERVAL):
+        """
+        Configure the profiler
+
+        Args:
+            path: File the folded stacks are written to
+            interval: Seconds between samples
+        """
+        self.path = path
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.clock = 'cpu'
+        self._labels: Dict = {}
+        self._previous_handler = None
+        self._thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start sampling the calling thread"""
+        if hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread():
+            self.clock = 'cpu'
+            self._previous_handler = signal.signal(signal.SIGPROF, self._on_timer)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+            return
+
+        self.clock = 'wall'
+        self._thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample, name='bsb-havoc-profiler', daemon=True)
+        self._thread.start()
+
+    def _on_timer(self, signum, frame):
+        """SIGPROF handler: fold the interrupted stack"""
+        if frame is not None:
+            self.stacks[self._fold(frame)] += 1
+            self.samples += 1
+
+    def _sample(self):
+        """Sampler thread: fold the loop thread's stack every interval"""
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self.stacks[self._fold(frame)] += 1
+                self.samples += 1
+            frame = None
+
+    def _fold(self, frame) -> str:
+        """Fold a stack into one line, outermost frame first"""
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ';'.join(labels)
+
+    def stop(self):
+        """Stop sampling; call from the thread that started the profiler"""
+        if self._previous_handler is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler)
+            self._previous_handler = None
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def write(self) -> str:
+        """
+        Write the folded stacks, most frequent first
+
+        Returns:
+            Path of the written file
+        """
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return self.path
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Share of samples on the hot path and idle, and the busiest functions
+
+        Returns:
+            Dict with 'clock' ('cpu' or 'wall'), 'samples', 'hot_path' and
+            'idle' (fractions of all samples; CPU samples are never idle)
+            and 'top' as (function, fraction) pairs by self time
+        """
+        hot = idle = 0
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            leaf = frames[-1]
+            if leaf.startswith(IDLE_FRAME):
+                idle += count
+                continue
+            leaves[leaf] += count
+            if any(frame.split(' ', 1)[0] in HOT_PATH for frame in frames):
+                hot += count
+
+        total = self.samples or 1
+        top: List[Tuple[str, float]] = [(leaf, count / total) for leaf, count in leaves.most_common(TOP_FUNCTIONS)]
+        return {
+            'clock': self.clock,
+            'samples': self.samples,
+            'hot_path': hot / total,
+            'idle': idle / total,
+            'top': top,
+        }
@@ -0,0 +1,517 @@
+"""
+BSB Havoc Raw HTTP - Minimal HTTP/1.1 Client on asyncio Protocols
+🧨 Pre-serialized requests, pipelining and a bare-bones response parser
+"""
+
+import asyncio
+import socket
+import ssl
+import time
+from collections import deque
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from yarl import URL
+
+from .errors import ConnectTimeoutError
+
+# Largest response head accepted before the connection is dropped
+MAX_HEAD_SIZE = 64 * 1024
+
+# How often stuck requests are checked for timeouts (seconds)
+TIMEOUT_SWEEP_INTERVAL = 0.5
+
+# Parser states
+_HEAD, _BODY, _CHUNK_SIZE, _CHUNK_DATA, _CHUNK_END, _TRAILER, _UNTIL_CLOSE = range(7)
+
+_clock = time.perf_counter_ns
+
+# Headers the client writes itself
+_MANAGED_HEADERS = ('host', 'content-length', 'connection', 'transfer-encoding')
+
+Origin = Tuple[str, str, int]
+
+
+class RawHTTPError(Exception):
+    """The server sent something the minimal parser does not understand"""
+
+
+class RawRequest:
+    """📦 A request serialized to wire bytes once, ready to be written as is"""
+
+    __slots__ = ('origin', 'data', 'is_head')
+
+    def __init__(self, origin: Origin, data: bytes, is_head: bool):
+        self.origin = origin
+        self.data = data
+        self.is_head = is_head
+
+
+def _header_values(headers: bytes, name: bytes) -> List[bytes]:
+    """
+    Comma-separated values of every ``name`` header in a lower-cased response head
+
+    Returns:
+        Stripped values in order of appearance (empty: no such header)
+    """
+    marker = b'\r\n' + name + b':'
+    values = []
+    start = headers.find(marker)
+    while start >= 0:
+        start += len(marker)
+        end = headers.find(b'\r\n', start)
+        values.extend(value.strip() for value in headers[start:end if end >= 0 else None].split(b','))
+        start = headers.find(marker, end) if end >= 0 else -1
+    return values
+
+
+def install_uvloop() -> bool:
+    """
+    Make new event loops uvloop loops, when uvloop is installed
+
+    Returns:
+        True when uvloop is now the event loop policy
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
+def running_uvloop() -> bool:
+    """Whether the running event loop is a uvloop loop"""
+    return type(asyncio.get_running_loop()).__module__.startswith('uvloop')
+
+
+class RawConnection(asyncio.Protocol):
+    """🔌 One HTTP/1.1 connection: writes requests, parses responses in order
+
+    Requests written before the connection is established are buffered
+    and flushed once it is. Every request gets a future resolved with
+    ``(status, headers_ns, body_bytes)`` when its response is complete;
+    pipelined responses resolve in the order the requests were sent.
+    Bodies are counted and discarded, never buffered.
+
+    A body cut short at ``max_body_bytes`` resolves its request early.
+    The connection is then dropped, unless pipelined requests wait
+    behind it: their responses follow the body, so the rest of it is
+    read and discarded instead.
+    """
+
+    def __init__(self, client: 'RawHTTPClient'):
+        self.client = client
+        self.transport: Optional[asyncio.Transport] = None
+        self.pending = deque()
+        self.sent = 0
+        self.opened_ns = _clock()
+        self.retiring = False
+        self.closed = False
+        self._unsent: List[bytes] = []
+        self._leftover = b''
+        self._reset_response()
+
+    def _reset_response(self):
+        self._state = _HEAD
+        self._status = 0
+        self._headers_ns = 0
+        self._remaining = 0
+        self._body_size = 0
+        self._truncated = False
+
+    @property
+    def usable(self) -> bool:
+        """Whether new requests may still be sent on this connection"""
+        return not (self.closed or self.retiring)
+
+    def send(self, request: RawRequest) -> asyncio.Future:
+        """Queue a request and return the future of its response"""
+        client = self.client
+        future = client.loop.create_future()
+        self.pending.append((future, request.is_head, _clock()))
+
+        if self.sent:
+            client.reused += 1
+        self.sent += 1
+        if (client.max_conn_requests and self.sent >= client.max_conn_requests) or \
+                (client.max_conn_age_ns and _clock() - self.opened_ns >= client.max_conn_age_ns):
+            self.retiring = True
+
+        if self.transport:
+            self.transport.write(request.data)
+        else:
+            self._unsent.append(request.data)
+        return future
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self.client.opened += 1
+        if self._unsent:
+            transport.writelines(self._unsent)
+            self._unsent = []
+
+    def connection_lost(self, exc: Optional[Exception]):
+        if self.closed:
+            return
+        self.closed = True
+        if self.transport:
+            self.client.closed += 1
+
+        # A body delimited by the end of the connection is complete now
+        if self._state == _UNTIL_CLOSE and self.pending:
+            self._complete()
+        self._fail(exc or ConnectionResetError("Server closed the connection"))
+
+    def connect_failed(self, exc: Exception):
+        """Called by the client when the connection could not be established"""
+        self.closed = True
+        self._fail(exc)
+
+    def abort(self, exc: Exception):
+        """Fail every pending request and drop the connection"""
+        self._fail(exc)
+        self.closed = True
+        if self.transport:
+            self.client.closed += 1
+            self.transport.abort()
+
+    def _fail(self, exc: Exception):
+        while self.pending:
+            future = self.pending.popleft()[0]
+            if not future.done():
+                future.set_exception(exc)
+
+    def _complete(self):
+        """Resolve the oldest pending request with the parsed response"""
+        future = self.pending.popleft()[0]
+        if not future.done():
+            future.set_result((self._status, self._headers_ns, self._body_size))
+        self._reset_response()
+
+        if self.retiring and not self.pending and self.transport:
+            self.transport.close()
+
+    def data_received(self, data: bytes):
+        if self._leftover:
+            data = self._leftover + data
+            self._leftover = b''
+
+        try:
+            self._parse(data)
+        except (RawHTTPError, ValueError) as e:
+            self.abort(RawHTTPError(str(e)))
+
+    def _parse(self, data: bytes):
+        """Advance the response parser over ``data``"""
+        position, end = 0, len(data)
+        limit = self.client.max_body_bytes
+
+        while self.pending and position < end:
+            state = self._state
+
+            if state == _HEAD:
+                head_end = data.find(b'\r\n\r\n', position)
+                if head_end < 0:
+                    if end - position > MAX_HEAD_SIZE:
+                        raise RawHTTPError("Response head too large")
+                    self._leftover = data[position:]
+                    return
+                self._start_response(data[position:head_end])
+                position = head_end + 4
+                # Bodiless response; interim 1xx responses leave the status unset
+                if self._state == _HEAD and self._status:
+                    self._complete()
+
+            elif state == _BODY:
+                take = min(self._remaining, end - position)
+                position += take
+                self._remaining -= take
+                self._body_size += take
+                if not self._remaining:
+                    self._complete()
+                elif limit and self._body_size >= limit and not self._truncated:
+                    if self._complete_truncated():
+                        return
+
+            elif state == _UNTIL_CLOSE:
+                self._body_size += end - position
+                position = end
+                if limit and self._body_size >= limit and not self._truncated:
+                    if self._complete_truncated():
+                        return
+
+            elif state == _CHUNK_SIZE or state == _TRAILER:
+                line_end = data.find(b'\r\n', position)
+                if line_end < 0:
+                    self._leftover = data[position:]
+                    return
+                line = data[position:line_end]
+                position = line_end + 2
+                if state == _TRAILER:
+                    if not line:
+                        self._complete()
+                    continue
+                size = int(line.split(b';', 1)[0].strip(), 16)
+                if size:
+                    self._remaining = size
+                    self._state = _CHUNK_DATA
+                else:
+                    self._state = _TRAILER
+
+            elif state == _CHUNK_DATA:
+                take = min(self._remaining, end - position)
+                position += take
+                self._remaining -= take
+                self._body_size += take
+                if not self._remaining:
+                    self._remaining = 2
+                    self._state = _CHUNK_END
+                elif limit and self._body_size >= limit and not self._truncated:
+                    if self._complete_truncated():
+                        return
+
+            else:  # _CHUNK_END: the CRLF after a chunk, possibly split across reads
+                take = min(self._remaining, end - position)
+                position += take
+                self._remaining -= take
+                if not self._remaining:
+                    self._state = _CHUNK_SIZE
+
+        if position < end and not self.pending:
+            self.abort(RawHTTPError("Unsolicited data from server"))
+
+    def _start_response(self, head: bytes):
+        """Parse a status line and headers, then pick how the body is delimited"""
+        if not head.startswith(b'HTTP/1.'):
+            raise RawHTTPError("Malformed status line")
+        status = int(head[9:12])
+
+        # Interim responses (100 Continue, 103 Early Hints) precede the real one
+        if 100 <= status < 200:
+            return
+
+        self._status = status
+        self._headers_ns = _clock()
+        headers = head.lower()
+
+        if b'close' in _header_values(headers, b'connection'):
+            self.retiring = True
+
+        is_head = self.pending[0][1]
+        if is_head or status in (204, 304):
+            self._state = _HEAD
+            return
+
+        # Chunked must be the final coding; any other coding runs until the connection closes
+        codings = _header_values(headers, b'transfer-encoding')
+        if codings:
+            if codings[-1] == b'chunked':
+                self._state = _CHUNK_SIZE
+            else:
+                self._state = _UNTIL_CLOSE
+                self.retiring = True
+            return
+
+        lengths = _header_values(headers, b'content-length')
+        if lengths:
+            self._remaining = int(lengths[0])
+            self._state = _BODY if self._remaining else _HEAD
+        else:
+            self._state = _UNTIL_CLOSE
+            self.retiring = True
+
+    def _complete_truncated(self) -> bool:
+        """
+        Stop at max_body_bytes: resolve the response early
+
+        Returns:
+            True when the connection was dropped; False when the rest of
+            the body is discarded for the pipelined responses behind it
+        """
+        future = self.pending[0][0]
+        if not future.done():
+            future.set_result((self._status, self._headers_ns, self._body_size))
+
+        if len(self.pending) > 1 and self._state != _UNTIL_CLOSE:
+            self._truncated = True
+            return False
+
+        self.pending.popleft()
+        self.abort(ConnectionAbortedError("Connection dropped after max_body_bytes"))
+        return True
+
+
+class RawHTTPClient:
+    """🧨 HTTP/1.1 client built directly on asyncio transports
+
+    Workers are grouped into lanes of ``pipeline_depth`` workers; each
+    lane keeps one connection per origin, so up to ``pipeline_depth``
+    requests are pipelined on it. With ``keep_alive`` off every request
+    gets its own connection.
+    """
+
+    def __init__(self, pipeline_depth: int = 1, keep_alive: bool = True,
+                 max_conn_requests: int = 0, max_conn_age: float = 0.0,
+                 max_body_bytes: int = 0, timeout: float = 30.0,
+                 dns_cache_ttl: Optional[float] = 10.0):
+        """
+        Initialize the client
+
+        Args:
+            pipeline_depth: Requests in flight per connection
+            keep_alive: Reuse connections (False: one connection per request)
+            max_conn_requests: Retire a connection after this many requests (0: never)
+            max_conn_age: Retire a connection after this many seconds (0: never)
+            max_body_bytes: Resolve a request after this many body bytes and drop
+                its connection, or discard the rest with requests pipelined
+                behind it (0: read it all)
+            timeout: Seconds before an unanswered request fails
+            dns_cache_ttl: Seconds resolved addresses are reused (0: never, None: forever)
+        """
+        if pipeline_depth < 1:
+            raise ValueError("pipeline_depth must be at least 1")
+
+        self.pipeline_depth = pipeline_depth if keep_alive else 1
+        self.keep_alive = keep_alive
+        self.max_conn_requests = max_conn_requests if keep_alive else 1
+        self.max_conn_age_ns = int(max_conn_age * 1e9) if keep_alive else 0
+        self.max_body_bytes = max_body_bytes
+        self.timeout_ns = int(timeout * 1e9)
+        self.dns_cache_ttl = dns_cache_ttl
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+        self.loop = asyncio.get_running_loop()
+        self._lanes: Dict[int, Dict[Origin, RawConnection]] = {}
+        self._connections = set()
+        self._connecting = set()
+        self._addresses: Dict[Origin, Tuple[list, float]] = {}
+        self._ssl_context = ssl.create_default_context()
+        self._ssl_context.check_hostname = False
+        self._ssl_context.verify_mode = ssl.CERT_NONE
+        self._sweeper = self.loop.create_task(self._sweep_timeouts())
+
+    def compile(self, method: str, url: URL, headers: Mapping[str, str],
+                body: Optional[bytes] = None) -> RawRequest:
+        """
+        Serialize a request to wire bytes
+
+        Args:
+            method: HTTP method
+            url: Absolute http(s) URL
+            headers: Request headers (Host, Content-Length and Connection are set here)
+            body: Request body
+        """
+        url = URL(url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url.scheme}")
+
+        host = url.raw_host
+        default_port = 443 if url.scheme == 'https' else 80
+        lines = [
+            f"{method} {url.raw_path_qs} HTTP/1.1",
+            f"Host: {host}" if url.port == default_port else f"Host: {host}:{url.port}",
+        ]
+        for name, value in headers.items():
+            if name.lower() not in _MANAGED_HEADERS:
+                lines.append(f"{name}: {value}")
+        lines.append('Connection: keep-alive' if self.keep_alive else 'Connection: close')
+        if body is not None or method in ('POST', 'PUT', 'PATCH'):
+            lines.append(f"Content-Length: {len(body or b'')}")
+
+        data = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + (body or b'')
+        return RawRequest((url.scheme, host, url.port), data, method == 'HEAD')
+
+    async def request(self, worker_id: int, request: RawRequest) -> Tuple[int, int, int]:
+        """
+        Send a request on the worker's lane
+
+        Returns:
+            Tuple of (status, perf_counter_ns() when the headers arrived, body bytes)
+        """
+        lane = self._lanes.get(worker_id // self.pipeline_depth)
+        if lane is None:
+            lane = self._lanes[worker_id // self.pipeline_depth] = {}
+
+        connection = lane.get(request.origin)
+        if connection is None or not connection.usable:
+            connection = lane[request.origin] = self._open(request.origin)
+        return await connection.send(request)
+
+    def _open(self, origin: Origin) -> RawConnection:
+        """Create a connection object and start connecting it in the background"""
+        connection = RawConnection(self)
+        self._connections.add(connection)
+        task = self.loop.create_task(self._connect(connection, origin))
+        self._connecting.add(task)
+        task.add_done_callback(self._connecting.discard)
+        return connection
+
+    async def _connect(self, connection: RawConnection, origin: Origin):
+        scheme, host, port = origin
+        try:
+            family, address = await self._resolve(origin)
+            sock = socket.socket(family, socket.SOCK_STREAM)
+            try:
+                sock.setblocking(False)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                await self.loop.sock_connect(sock, address)
+            except BaseException:
+                sock.close()
+                raise
+            await self.loop.create_connection(
+                lambda: connection, sock=sock,
+                ssl=self._ssl_context if scheme == 'https' else None,
+                server_hostname=host if scheme == 'https' else None,
+            )
+        except Exception as e:
+            connection.connect_failed(e)
+        finally:
+            if connection.closed:
+                self._connections.discard(connection)
+
+    async def _resolve(self, origin: Origin) -> Tuple[int, tuple]:
+        """Resolve an origin, reusing answers for dns_cache_ttl seconds"""
+        cached = self._addresses.get(origin)
+        now = time.monotonic()
+        if cached and (self.dns_cache_ttl is None or now < cached[1]):
+            return cached[0][0]
+
+        _, host, port = origin
+        infos = await self.loop.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        if not infos:
+            raise socket.gaierror(f"Cannot resolve {host}")
+        addresses = [(family, address) for family, _, _, _, address in infos]
+        if self.dns_cache_ttl != 0:
+            expiry = now + self.dns_cache_ttl if self.dns_cache_ttl is not None else 0.0
+            self._addresses[origin] = (addresses, expiry)
+        return addresses[0]
+
+    async def _sweep_timeouts(self):
+        """Fail requests that waited longer than the timeout"""
+        while True:
+            await asyncio.sleep(TIMEOUT_SWEEP_INTERVAL)
+            deadline = _clock() - self.timeout_ns
+            for connection in list(self._connections):
+                if connection.closed:
+                    self._connections.discard(connection)
+                elif connection.pending and connection.pending[0][2] < deadline:
+                    # Still waiting for the handshake, or for the response
+                    connection.abort(ConnectTimeoutError() if connection.transport is None else asyncio.TimeoutError())
+                    self._connections.discard(connection)
+
+    def counts(self) -> Tuple[int, int, int]:
+        """Return ``(opened, reused, closed)`` totals, like HavocConnector.counts()"""
+        return self.opened, self.reused, self.closed
+
+    async def close(self):
+        """Close every connection and stop the timeout sweeper"""
+        tasks = [self._sweeper, *self._connecting]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for connection in list(self._connections):
+            if not connection.closed:
+                connection.abort(ConnectionAbortedError("Client closed"))
+        self._connections.clear()
+        self._lanes.clear()
@@ -0,0 +1,197 @@
+"""
+BSB Havoc Recorder - Per-Request Result Streaming
+💾 Batches one record per request and writes them off the event loop
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .errors import ERROR_NAMES
+
+RECORD_FORMATS = ('ndjson', 'binary')
+
+# Binary files start with a header: magic, format version, record size,
+# then (since version 2) the length of a JSON metadata block that follows
+BINARY_MAGIC = b'BSBH'
+BINARY_VERSION = 2
+HEADER = struct.Struct('<4sHH')
+METADATA_LENGTH = struct.Struct('<I')
+
+# timestamp_ns, latency_ns, body bytes, status (0: none), endpoint index, error code, padding
+RECORD = struct.Struct('<qqIHHBx')
+
+# Version 1 records carry no endpoint index
+RECORD_V1 = struct.Struct('<qqIHBx')
+
+_MAX_BODY_SIZE = 0xFFFFFFFF
+
+# timestamp_ns, latency_ns, status, body bytes, error code, endpoint index
+Record = Tuple[int, int, Optional[int], int, int, int]
+
+
+def infer_format(path: str) -> str:
+    """Pick a record format from a file extension (.bin/.havoc: binary, else NDJSON)"""
+    return 'binary' if os.path.splitext(path)[1].lower() in ('.bin', '.havoc') else 'ndjson'
+
+
+def shard_path(path: str, index: int) -> str:
+    """Per-process file name for sharded runs, e.g. results.bin -> results.2.bin"""
+    stem, extension = os.path.splitext(path)
+    return f"{stem}.{index}{extension}"
+
+
+class ResultRecorder:
+    """💾 Streams one record per request to disk
+
+    Records are appended to an in-memory batch on the event loop. Full
+    batches go to a writer thread through a bounded queue, so memory
+    stays fixed however long the run is. If the disk cannot keep up,
+    whole batches are dropped and counted rather than blocking the loop.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None,
+                 batch_size: int = 4096, max_pending: int = 16,
+                 endpoints: Optional[List[str]] = None):
+        """
+        Open the output file and start the writer thread
+
+        Args:
+            path: Output file path
+            fmt: 'ndjson' or 'binary' (default: inferred from the extension)
+            batch_size: Records per batch handed to the writer
+            max_pending: Batches allowed to wait for the writer
+            endpoints: Scenario request names, indexed by endpoint
+        """
+        self.path = path
+        self.format = fmt or infer_format(path)
+        if self.format not in RECORD_FORMATS:
+            raise ValueError(f"record format must be one of {', '.join(RECORD_FORMATS)}")
+
+        self.batch_size = batch_size
+        self.endpoints = endpoints
+        self.recorded = 0
+        self.dropped = 0
+        self._batch: List[Record] = []
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._file = open(path, 'wb')
+
+        if self.format == 'binary':
+            metadata = json.dumps({'endpoints': endpoints or []}).encode()
+            self._file.write(HEADER.pack(BINARY_MAGIC, BINARY_VERSION, RECORD.size))
+            self._file.write(METADATA_LENGTH.pack(len(metadata)) + metadata)
+
+        self._thread = threading.Thread(target=self._write_loop, name='havoc-recorder', daemon=True)
+        self._thread.start()
+
+    def record(self, timestamp: int, latency: int, status: Optional[int], size: int, error: int,
+               endpoint: int = 0):
+        """
+        Add one request to the current batch
+
+        Args:
+            timestamp: Wall-clock send time in nanoseconds since the epoch
+            latency: Response time in nanoseconds
+            status: HTTP status code, or None when no response arrived
+            size: Body bytes received
+            error: Error code from bsb_havoc.errors
+            endpoint: Index of the scenario request sent
+        """
+        batch = self._batch
+        batch.append((timestamp, latency, status, size, error, endpoint))
+        if len(batch) >= self.batch_size:
+            self._submit()
+
+    def _submit(self, block: bool = False):
+        """Hand the current batch to the writer thread"""
+        batch, self._batch = self._batch, []
+        try:
+            self._queue.put(batch, block=block)
+            self.recorded += len(batch)
+        except queue.Full:
+            self.dropped += len(batch)
+
+    def _write_loop(self):
+        """Writer thread: encode and write batches until told to stop"""
+        encode = self._encode_binary if self.format == 'binary' else self._encode_ndjson
+        while True:
+            batch = self._queue.get()
+            if batch is None:
+                return
+            self._file.write(encode(batch))
+
+    @staticmethod
+    def _encode_binary(batch: List[Record]) -> bytes:
+        buffer = bytearray(RECORD.size * len(batch))
+        pack_into, size = RECORD.pack_into, RECORD.size
+        for offset, (timestamp, latency, status, body, error, endpoint) in zip(range(0, len(buffer), size), batch):
+            pack_into(buffer, offset, timestamp, latency, min(body, _MAX_BODY_SIZE), status or 0, endpoint, error)
+        return bytes(buffer)
+
+    def _encode_ndjson(self, batch: List[Record]) -> bytes:
+        endpoints = self.endpoints
+        lines = []
+        for timestamp, latency, status, body, error, endpoint in batch:
+            record = {
+                'ts': timestamp / 1e9,
+                'latency_ms': latency / 1e6,
+                'status': status,
+                'bytes': body,
+                'error': ERROR_NAMES[error] if error else None,
+            }
+            if endpoints:
+                record['endpoint'] = endpoints[endpoint]
+            lines.append(json.dumps(record, separators=(',', ':')))
+        lines.append('')
+        return '\n'.join(lines).encode()
+
+    def close(self):
+        """Flush remaining records and close the file (blocks until written)"""
+        if self._file.closed:
+            return
+        if self._batch:
+            self._submit(block=True)
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+
+def read_binary_header(f: BinaryIO) -> Tuple[int, Dict]:
+    """
+    Read the header of an open binary result file
+
+    Returns:
+        Tuple of (format version, metadata dict)
+    """
+    magic, version, size = HEADER.unpack(f.read(HEADER.size))
+    expected = {1: RECORD_V1.size, 2: RECORD.size}
+    if magic != BINARY_MAGIC or expected.get(version) != size:
+        raise ValueError(f"{getattr(f, 'name', 'file')} is not a BSB Havoc binary result file "
+                         f"(version {BINARY_VERSION} or older)")
+
+    metadata = {}
+    if version >= 2:
+        length, = METADATA_LENGTH.unpack(f.read(METADATA_LENGTH.size))
+        metadata = json.loads(f.read(length))
+    return version, metadata
+
+
+def read_binary(path: str) -> Iterator[Record]:
+    """Iterate over the records of a binary result file"""
+    with open(path, 'rb') as f:
+        version, _ = read_binary_header(f)
+        layout = RECORD if version >= 2 else RECORD_V1
+
+        while True:
+            chunk = f.read(layout.size * 4096)
+            if not chunk:
+                return
+            if version >= 2:
+                for timestamp, latency, body, status, endpoint, error in layout.iter_unpack(chunk):
+                    yield timestamp, latency, status or None, body, error, endpoint
+            else:
+                for timestamp, latency, body, status, error in layout.iter_unpack(chunk):
+                    yield timestamp, latency, status or None, body, error, 0
@@ -0,0 +1,924 @@
+"""
+BSB Havoc Report - Offline Analysis of Per-Request Records
+🧮 Summaries, time series and latency heatmaps of huge record files in fixed memory
+"""
+
+import html
+import json
+import math
+import mmap
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from colorama import Fore, Style
+
+from .engine import TestResult
+from .errors import ERROR_HTTP_5XX, ERROR_NAMES, ERROR_PRECISION
+from .histogram import DEFAULT_PRECISION, LatencyHistogram
+from .recorder import BINARY_MAGIC, RECORD, RECORD_V1, read_binary_header
+from .scenario import TemplateStats
+from .timeseries import condense
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Records aggregated at a time; memory use depends on this, never on the file size
+CHUNK_RECORDS = 1 << 19
+
+# The time series has at most this many intervals, widened past one second as needed
+MAX_INTERVALS = 3600
+
+# Heatmap latency bins: 2**HEAT_SUB_BITS linear bins per power of two of nanoseconds,
+# from 2**HEAT_LOW_BITS (~1 µs) up to 2**(HEAT_HIGH_BITS + 1) (~275 s)
+HEAT_SUB_BITS = 3
+HEAT_LOW_BITS = 10
+HEAT_HIGH_BITS = 37
+HEAT_BINS = (HEAT_HIGH_BITS - HEAT_LOW_BITS + 1) << HEAT_SUB_BITS
+
+# Columns of the heatmap in the report; neighbouring intervals are merged to fit
+HEATMAP_COLUMNS = 240
+
+GROUP_BY = ('status', 'endpoint')
+REPORT_FORMATS = ('html', 'json')
+
+# Binary record layouts as NumPy dtypes, matching RECORD and RECORD_V1
+_DTYPES = {
+    2: [('timestamp', '<i8'), ('latency', '<i8'), ('bytes', '<u4'), ('status', '<u2'),
+        ('endpoint', '<u2'), ('error', 'u1'), ('padding', 'V1')],
+    1: [('timestamp', '<i8'), ('latency', '<i8'), ('bytes', '<u4'), ('status', '<u2'),
+        ('error', 'u1'), ('padding', 'V1')],
+}
+
+# Column order of a chunk, the same as a recorder.Record
+_FIELDS = ('timestamp', 'latency', 'status', 'bytes', 'error', 'endpoint')
+
+_ERROR_CODES = {name: code for code, name in enumerate(ERROR_NAMES)}
+
+
+def infer_report_format(path: str) -> str:
+    """Pick a report format from a file extension (.json: JSON, else HTML)"""
+    return 'json' if os.path.splitext(path)[1].lower() == '.json' else 'html'
+
+
+def _heat_bin(latency: int) -> int:
+    """Heatmap bin of one latency in nanoseconds"""
+    value = min(max(latency, 1 << HEAT_LOW_BITS), (1 << (HEAT_HIGH_BITS + 1)) - 1)
+    exponent = value.bit_length() - 1
+    return (((exponent - HEAT_LOW_BITS) << HEAT_SUB_BITS)
+            + (value >> (exponent - HEAT_SUB_BITS)) - (1 << HEAT_SUB_BITS))
+
+
+def _heat_bins(latency):
+    """Vectorized _heat_bin over a NumPy array"""
+    value = numpy.clip(latency, 1 << HEAT_LOW_BITS, (1 << (HEAT_HIGH_BITS + 1)) - 1)
+    # frexp returns bit_length() as the exponent; exact as values fit in 53 bits
+    exponent = numpy.frexp(value.astype(numpy.float64))[1].astype(numpy.int64) - 1
+    return (((exponent - HEAT_LOW_BITS) << HEAT_SUB_BITS)
+            + (value >> (exponent - HEAT_SUB_BITS)) - (1 << HEAT_SUB_BITS))
+
+
+def _heat_upper(index: int) -> int:
+    """Exclusive upper bound of a heatmap bin in nanoseconds"""
+    exponent = (index >> HEAT_SUB_BITS) + HEAT_LOW_BITS
+    sub_bucket = (index & ((1 << HEAT_SUB_BITS) - 1)) + (1 << HEAT_SUB_BITS) + 1
+    return sub_bucket << (exponent - HEAT_SUB_BITS)
+
+
+def _record_array(histogram: LatencyHistogram, values):
+    """Vectorized LatencyHistogram.record of every value in a NumPy array"""
+    if not len(values):
+        return
+
+    values = numpy.maximum(values, 0)
+    clamped = numpy.minimum(values, histogram.highest)
+    # Same arithmetic as LatencyHistogram._index_of, bit_length() taken from frexp
+    magnitude = numpy.frexp((clamped | histogram._sub_bucket_mask).astype(numpy.float64))[1].astype(numpy.int64)
+    bucket = magnitude - histogram._unit_magnitude - histogram._sub_bucket_half_magnitude - 1
+    sub_bucket = clamped >> (bucket + histogram._unit_magnitude)
+    index = ((bucket + 1) << histogram._sub_bucket_half_magnitude) + sub_bucket - histogram._sub_bucket_half
+
+    counts = numpy.frombuffer(histogram.counts, dtype=numpy.int64)
+    counts += numpy.bincount(index, minlength=len(counts))
+    histogram._merge_totals(len(values), int(values.sum()), int(values.min()), int(values.max()))
+
+
+class RecordFile:
+    """📂 One per-request result file, read a chunk at a time
+
+    Binary files are memory-mapped: the operating system pages records
+    in as they are read and drops them again under memory pressure, so
+    a file larger than RAM costs no more than one chunk. With NumPy a
+    chunk is a set of column arrays viewed straight out of the mapping;
+    without it, records are unpacked from the mapping with ``struct``.
+    NDJSON files are streamed line by line.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a result file and read its header
+
+        Args:
+            path: Binary or NDJSON file written by --record
+        """
+        self.path = path
+        self.version = 0
+        self.endpoints: List[str] = []
+        self._offset = 0
+
+        with open(path, 'rb') as f:
+            self.binary = f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+            if self.binary:
+                f.seek(0)
+                self.version, metadata = read_binary_header(f)
+                self.endpoints = metadata.get('endpoints', [])
+                self._offset = f.tell()
+
+        self._layout = RECORD if self.version >= 2 else RECORD_V1
+        self.size = os.path.getsize(path)
+
+    @property
+    def records(self) -> Optional[int]:
+        """Number of records in a binary file (None for NDJSON)"""
+        return (self.size - self._offset) // self._layout.size if self.binary else None
+
+    def chunks(self, endpoints: Dict[str, int], vectorized: bool, chunk_records: int = CHUNK_RECORDS) -> Iterator:
+        """
+        Iterate over the records in chunks
+
+        Args:
+            endpoints: Endpoint names of every file read so far, by global
+                index; names first seen in this file are added
+            vectorized: Yield tuples of NumPy columns instead of record lists
+            chunk_records: Records per chunk
+
+        Returns:
+            Iterator of chunks: tuples of int64 columns in _FIELDS order, or
+            lists of (timestamp, latency, status, bytes, error, endpoint)
+        """
+        if not self.binary:
+            return self._ndjson_chunks(endpoints, vectorized, chunk_records)
+
+        mapping = [endpoints.setdefault(name, len(endpoints)) for name in self.endpoints]
+        if mapping == list(range(len(mapping))):
+            mapping = None
+        if vectorized:
+            return self._array_chunks(mapping, chunk_records)
+        return self._binary_chunks(mapping, chunk_records)
+
+    def _map(self) -> mmap.mmap:
+        """Memory-map the whole file read-only"""
+        with open(self.path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _release(self, mapped: mmap.mmap, start: int, stop: int):
+        """Drop the pages of records [start, stop) from the process; they stay in the page cache"""
+        if not hasattr(mmap, 'MADV_DONTNEED'):
+            return
+        begin = self._offset + start * self._layout.size
+        begin -= begin % mmap.PAGESIZE
+        mapped.madvise(mmap.MADV_DONTNEED, begin, self._offset + stop * self._layout.size - begin)
+
+    def _array_view(self) -> Tuple[mmap.mmap, Any]:
+        """The mapped file and a structured array viewing its records"""
+        # The view keeps the mapping alive; it is unmapped once the last reference is gone
+        mapped = self._map()
+        return mapped, numpy.frombuffer(mapped, dtype=_DTYPES[self.version], count=self.records, offset=self._offset)
+
+    def time_range(self, endpoints: Dict[str, int], vectorized: bool,
+                   chunk_records: int = CHUNK_RECORDS) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Earliest and latest send time in the file
+
+        Returns:
+            Tuple of (first, last) in nanoseconds since the epoch, or
+            (None, None) without records
+        """
+        if self.binary and vectorized:
+            # Only the timestamp column is read, straight from the mapping
+            mapped, records = self._array_view()
+            spans = []
+            for start in range(0, len(records), chunk_records):
+                timestamps = records['timestamp'][start:start + chunk_records]
+                spans.append((int(timestamps.min()), int(timestamps.max())))
+                self._release(mapped, start, start + len(timestamps))
+        elif vectorized:
+            spans = [(int(chunk[0].min()), int(chunk[0].max()))
+                     for chunk in self.chunks(endpoints, True, chunk_records)]
+        else:
+            spans = [(min(record[0] for record in chunk), max(record[0] for record in chunk))
+                     for chunk in self.chunks(endpoints, False, chunk_records)]
+
+        if not spans:
+            return None, None
+        return min(low for low, _ in spans), max(high for _, high in spans)
+
+    def _array_chunks(self, mapping: Optional[List[int]], chunk_records: int) -> Iterator[Tuple]:
+        """Column arrays copied out of the mapped file, a chunk at a time"""
+        mapped, records = self._array_view()
+        lookup = numpy.asarray(mapping, dtype=numpy.int64) if mapping else None
+
+        for start in range(0, len(records), chunk_records):
+            chunk = records[start:start + chunk_records]
+            columns = []
+            for field in _FIELDS:
+                if field in chunk.dtype.names:
+                    columns.append(chunk[field].astype(numpy.int64))
+                else:
+                    columns.append(numpy.zeros(len(chunk), dtype=numpy.int64))
+            if lookup is not None and len(lookup):
+                columns[5] = lookup[columns[5]]
+            self._release(mapped, start, start + len(chunk))
+            yield tuple(columns)
+
+    def _binary_chunks(self, mapping: Optional[List[int]], chunk_records: int) -> Iterator[List[Tuple]]:
+        """Record tuples unpacked from the mapped file"""
+        layout = self._layout
+        with self._map() as mapped:
+            end = self._offset + self.records * layout.size
+            for start in range(self._offset, end, layout.size * chunk_records):
+                block = mapped[start:min(end, start + layout.size * chunk_records)]
+                if self.version >= 2:
+                    records = [(timestamp, latency, status, body, error, mapping[endpoint] if mapping else endpoint)
+                               for timestamp, latency, body, status, endpoint, error in layout.iter_unpack(block)]
+                else:
+                    records = [(timestamp, latency, status, body, error, 0)
+                               for timestamp, latency, body, status, error in layout.iter_unpack(block)]
+                yield records
+
+    def _ndjson_chunks(self, endpoints: Dict[str, int], vectorized: bool, chunk_records: int) -> Iterator:
+        """Record tuples parsed from JSON lines"""
+        records = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    endpoint = record.get('endpoint')
+                    records.append((
+                        int(record['ts'] * 1e9),
+                        int(record['latency_ms'] * 1e6),
+                        record['status'] or 0,
+                        record['bytes'],
+                        _ERROR_CODES[record['error']] if record['error'] else 0,
+                        endpoints.setdefault(endpoint, len(endpoints)) if endpoint is not None else 0,
+                    ))
+                except (ValueError, KeyError, TypeError) as e:
+                    raise ValueError(f"{self.path}:{number} is not a BSB Havoc result record ({e})") from None
+
+                if len(records) >= chunk_records:
+                    yield self._columns(records) if vectorized else records
+                    records = []
+
+        if records:
+            yield self._columns(records) if vectorized else records
+
+    @staticmethod
+    def _columns(records: List[Tuple]) -> Tuple:
+        """Turn record tuples into int64 columns"""
+        return tuple(numpy.array(records, dtype=numpy.int64).T.copy())
+
+
+class RecordAnalyzer:
+    """🧮 Aggregates per-request result files in fixed memory
+
+    Two passes are made over the files: one for the time range, one
+    to aggregate. Every statistic goes into a structure whose size is
+    fixed up front: latency histograms, counters per status code and
+    error class, and per-interval counters and heatmap rows for at most
+    MAX_INTERVALS intervals. With NumPy a chunk is aggregated with a few
+    whole-array operations (masks, ``bincount`` into histogram buckets);
+    without it, with a plain loop over the records.
+
+    Records follow the engine's rules: a request failed when it carries
+    an error (5xx responses included), latency percentiles cover the
+    successful requests, failures get per-class latencies, and a request
+    belongs to the interval it was sent in.
+    """
+
+    def __init__(self, paths: Sequence[str], start: Optional[float] = None, end: Optional[float] = None,
+                 group_by: Optional[str] = None, precision: int = DEFAULT_PRECISION,
+                 vectorized: Optional[bool] = None, chunk_records: int = CHUNK_RECORDS):
+        """
+        Configure an analysis
+
+        Args:
+            paths: Result files of one run (e.g. one per shard)
+            start: Skip requests sent earlier, in seconds after the first one
+            end: Skip requests sent from then on, in seconds after the first one
+            group_by: Break results down by 'status' or 'endpoint' (default:
+                by endpoint when the run used a scenario)
+            precision: Significant digits of the latency histogram
+            vectorized: Aggregate with NumPy (default: when it is installed)
+            chunk_records: Records aggregated at a time
+        """
+        if not paths:
+            raise ValueError("at least one result file is needed")
+        if group_by is not None and group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        if start is not None and end is not None and end <= start:
+            raise ValueError("end must be later than start")
+        if vectorized and numpy is None:
+            raise ValueError("vectorized analysis needs NumPy (pip install numpy)")
+
+        self.files = [RecordFile(path) for path in paths]
+        self.start = start
+        self.end = end
+        self.group_by = group_by
+        self.precision = precision
+        self.vectorized = numpy is not None if vectorized is None else vectorized
+        self.chunk_records = chunk_records
+        self.endpoints: Dict[str, int] = {}
+        for record_file in self.files:
+            for name in record_file.endpoints:
+                self.endpoints.setdefault(name, len(self.endpoints))
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Read every file and aggregate it
+
+        Returns:
+            Report dict: 'result' (TestResult fields), 'groups', 'heatmap',
+            the analyzed window and record counts
+        """
+        first, last = self._time_range()
+        if first is None:
+            raise ValueError("the result files hold no records")
+
+        if self.group_by is None and self.endpoints:
+            self.group_by = 'endpoint'
+        if self.group_by == 'endpoint' and not self.endpoints:
+            raise ValueError("the records carry no endpoint names; only runs with --scenario can be grouped by endpoint")
+
+        self._low = first + int((self.start or 0) * 1e9)
+        self._high = last + 1 if self.end is None else min(last + 1, first + int(self.end * 1e9))
+        self._first = first
+        span = max(self._high - self._low, 1)
+        self._width = max(1, math.ceil(span / MAX_INTERVALS / 1e9)) * 1_000_000_000
+        # A partial last interval of under half the width is folded into the one before
+        self._slots = max(1, round(span / self._width))
+        self._reset()
+
+        for record_file in self.files:
+            for chunk in record_file.chunks(self.endpoints, self.vectorized, self.chunk_records):
+                self.scanned += len(chunk[0]) if self.vectorized else len(chunk)
+                if self.vectorized:
+                    self._add_columns(*chunk)
+                else:
+                    self._add_records(chunk)
+
+        return self._report()
+
+    def _time_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """First pass: earliest and latest send time of all files in nanoseconds"""
+        spans = [record_file.time_range(self.endpoints, self.vectorized, self.chunk_records)
+                 for record_file in self.files]
+        spans = [span for span in spans if span[0] is not None]
+        if not spans:
+            return None, None
+        return min(first for first, _ in spans), max(last for _, last in spans)
+
+    def _reset(self):
+        """Empty accumulators sized for the analyzed window"""
+        self.scanned = 0
+        self.total = 0
+        self.failed = 0
+        self.bytes = 0
+        self.first_sent: Optional[int] = None
+        self.last_done: Optional[int] = None
+        self.status_codes: Dict[int, int] = {}
+        self.error_counts = [0] * len(ERROR_NAMES)
+        self.histogram = LatencyHistogram(self.precision)
+        self.error_histograms = [LatencyHistogram(ERROR_PRECISION) for _ in ERROR_NAMES]
+        self.groups: Dict[int, TemplateStats] = {}
+
+        slots = self._slots
+        if self.vectorized:
+            self.slot_requests = numpy.zeros(slots, dtype=numpy.int64)
+            self.slot_failed = numpy.zeros(slots, dtype=numpy.int64)
+            self.slot_bytes = numpy.zeros(slots, dtype=numpy.float64)
+            self.slot_latency_sum = numpy.zeros(slots, dtype=numpy.float64)
+            self.slot_latency_max = numpy.zeros(slots, dtype=numpy.int64)
+            self.heat = numpy.zeros(slots * HEAT_BINS, dtype=numpy.int64)
+        else:
+            self.slot_requests = [0] * slots
+            self.slot_failed = [0] * slots
+            self.slot_bytes = [0] * slots
+            self.slot_latency_sum = [0] * slots
+            self.slot_latency_max = [0] * slots
+            self.heat = [0] * (slots * HEAT_BINS)
+
+    def _group(self, key: int) -> TemplateStats:
+        """Counters and histogram of one group, created on first use"""
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = TemplateStats()
+        return stats
+
+    def _add_columns(self, timestamp, latency, status, size, error, endpoint):
+        """Aggregate one chunk of NumPy columns"""
+        keep = (timestamp >= self._low) & (timestamp < self._high)
+        if not keep.all():
+            timestamp, latency, status, size, error, endpoint = (
+                column[keep] for column in (timestamp, latency, status, size, error, endpoint))
+        if not len(timestamp):
+            return
+
+        self.total += len(timestamp)
+        self.bytes += int(size.sum())
+        first, done = int(timestamp.min()), int((timestamp + latency).max())
+        self.first_sent = first if self.first_sent is None else min(self.first_sent, first)
+        self.last_done = done if self.last_done is None else max(self.last_done, done)
+
+        failed = error != 0
+        ok = ~failed
+        self.failed += int(failed.sum())
+
+        # Status codes count successes and server errors, like StatShard
+        answered = status[(status != 0) & (ok | (error == ERROR_HTTP_5XX))]
+        codes, counts = numpy.unique(answered, return_counts=True)
+        for code, count in zip(codes.tolist(), counts.tolist()):
+            self.status_codes[code] = self.status_codes.get(code, 0) + count
+
+        if failed.any():
+            for code in numpy.unique(error[failed]).tolist():
+                hits = latency[error == code]
+                self.error_counts[code] += len(hits)
+                _record_array(self.error_histograms[code], hits)
+
+        ok_latency = latency[ok]
+        _record_array(self.histogram, ok_latency)
+
+        # Per-interval counters and heatmap rows
+        slots = self._slots
+        slot = numpy.minimum((timestamp - self._low) // self._width, slots - 1)
+        ok_slot = slot[ok]
+        self.slot_requests += numpy.bincount(slot, minlength=slots)
+        self.slot_failed += numpy.bincount(slot[failed], minlength=slots)
+        self.slot_bytes += numpy.bincount(slot, weights=size, minlength=slots)
+        self.slot_latency_sum += numpy.bincount(ok_slot, weights=ok_latency, minlength=slots)
+        numpy.maximum.at(self.slot_latency_max, ok_slot, ok_latency)
+        self.heat += numpy.bincount(ok_slot * HEAT_BINS + _heat_bins(ok_latency), minlength=slots * HEAT_BINS)
+
+        if self.group_by:
+            by_status = self.group_by == 'status'
+            keys = status if by_status else endpoint
+            for key in numpy.unique(keys).tolist():
+                members = keys == key
+                stats = self._group(key)
+                stats.total += int(members.sum())
+                stats.failed += int((members & failed).sum())
+                # A status group times every response; an endpoint group its successes, like endpoint_stats
+                _record_array(stats.histogram, latency[members if by_status else members & ok])
+
+    def _add_records(self, records: List[Tuple]):
+        """Aggregate one chunk of record tuples"""
+        low, high, origin, width, last_slot = self._low, self._high, self._low, self._width, self._slots - 1
+        histogram, error_histograms, error_counts = self.histogram, self.error_histograms, self.error_counts
+        status_codes = self.status_codes
+        slot_requests, slot_failed, slot_bytes = self.slot_requests, self.slot_failed, self.slot_bytes
+        slot_latency_sum, slot_latency_max, heat = self.slot_latency_sum, self.slot_latency_max, self.heat
+        group_by, by_status = self.group_by, self.group_by == 'status'
+        first = self.first_sent
+        done = self.last_done
+        total = failed = received = 0
+
+        for timestamp, latency, status, size, error, endpoint in records:
+            if timestamp < low or timestamp >= high:
+                continue
+
+            total += 1
+            received += size
+            if first is None or timestamp < first:
+                first = timestamp
+            if done is None or timestamp + latency > done:
+                done = timestamp + latency
+
+            slot = min((timestamp - origin) // width, last_slot)
+            slot_requests[slot] += 1
+            slot_bytes[slot] += size
+
+            if error:
+                failed += 1
+                slot_failed[slot] += 1
+                error_counts[error] += 1
+                error_histograms[error].record(latency)
+                if status and error == ERROR_HTTP_5XX:
+                    status_codes[status] = status_codes.get(status, 0) + 1
+            else:
+                if status:
+                    status_codes[status] = status_codes.get(status, 0) + 1
+                histogram.record(latency)
+                slot_latency_sum[slot] += latency
+                if latency > slot_latency_max[slot]:
+                    slot_latency_max[slot] = latency
+                heat[slot * HEAT_BINS + _heat_bin(latency)] += 1
+
+            if group_by:
+                stats = self._group(status if by_status else endpoint)
+                stats.total += 1
+                if error:
+                    stats.failed += 1
+                if by_status or not error:
+                    stats.histogram.record(latency)
+
+        self.total += total
+        self.failed += failed
+        self.bytes += received
+        self.first_sent = first
+        self.last_done = done
+
+    def _series(self) -> List[Dict[str, float]]:
+        """Per-interval summaries, shaped like RollingMetrics.series (elapsed from the window start)"""
+        requests, failed = list(self.slot_requests), list(self.slot_failed)
+        received, latency_sum = list(self.slot_bytes), list(self.slot_latency_sum)
+        latency_max = list(self.slot_latency_max)
+        span = self._high - self._low
+
+        series = []
+        for slot in range(self._slots):
+            duration = ((span if slot == self._slots - 1 else (slot + 1) * self._width) - slot * self._width) / 1e9
+            row = self.heat[slot * HEAT_BINS:(slot + 1) * HEAT_BINS]
+            row = row.tolist() if self.vectorized else row
+            p50, p90, p99 = self._row_percentiles(row, [50, 90, 99], int(latency_max[slot]))
+            count, succeeded = int(requests[slot]), int(requests[slot]) - int(failed[slot])
+            series.append({
+                'elapsed': round(slot * self._width / 1e9 + duration, 3),
+                'requests': count,
+                'failed': int(failed[slot]),
+                'requests_per_second': count / duration,
+                'bytes_per_second': float(received[slot]) / duration,
+                'error_rate': int(failed[slot]) / count if count else 0.0,
+                'avg_response_time': float(latency_sum[slot]) / succeeded / 1e9 if succeeded else 0.0,
+                'p50_response_time': p50 / 1e9,
+                'p90_response_time': p90 / 1e9,
+                'p99_response_time': p99 / 1e9,
+                'max_response_time': int(latency_max[slot]) / 1e9,
+            })
+        return series
+
+    @staticmethod
+    def _row_percentiles(row: List[int], percentiles: List[float], maximum: int) -> List[int]:
+        """Percentiles of one heatmap row: bin upper bounds, capped at the interval's maximum"""
+        total = sum(row)
+        if not total:
+            return [0] * len(percentiles)
+
+        results = []
+        targets = [max(1, math.ceil(percentile / 100.0 * total)) for percentile in percentiles]
+        cumulative, position = 0, 0
+        for index, count in enumerate(row):
+            cumulative += count
+            while position < len(targets) and cumulative >= targets[position]:
+                results.append(min(_heat_upper(index) - 1, maximum))
+                position += 1
+            if position == len(targets):
+                break
+        return results
+
+    def _heatmap(self) -> Dict[str, Any]:
+        """Heatmap of successful latencies, merged down to at most HEATMAP_COLUMNS intervals"""
+        merge = -(-self._slots // HEATMAP_COLUMNS)
+        heat = self.heat.tolist() if self.vectorized else self.heat
+        columns = []
+        for first in range(0, self._slots, merge):
+            column = [0] * HEAT_BINS
+            for slot in range(first, min(first + merge, self._slots)):
+                for index, count in enumerate(heat[slot * HEAT_BINS:(slot + 1) * HEAT_BINS]):
+                    column[index] += count
+            columns.append(column)
+
+        used = [index for index in range(HEAT_BINS) if any(column[index] for column in columns)]
+        low, high = (used[0], used[-1] + 1) if used else (0, 0)
+        return {
+            'column_seconds': merge * self._width / 1e9,
+            'bins': [_heat_upper(index) / 1e9 for index in range(low, high)],
+            'counts': [column[low:high] for column in columns],
+        }
+
+    def _group_name(self, key: int) -> str:
+        """Display name of a group key"""
+        if self.group_by == 'status':
+            return str(key) if key else 'no response'
+        names = list(self.endpoints)
+        return names[key] if key < len(names) else f"#{key}"
+
+    def _result(self) -> TestResult:
+        """TestResult of the analyzed window"""
+        result = TestResult(
+            total_requests=self.total,
+            successful_requests=self.total - self.failed,
+            failed_requests=self.failed,
+            bytes_received=self.bytes,
+            status_codes=dict(sorted(self.status_codes.items())),
+        )
+        if self.total:
+            result.total_time = (self.last_done - self.first_sent) / 1e9
+        if result.total_time > 0:
+            result.requests_per_second = result.total_requests / result.total_time
+            result.bytes_per_second = result.bytes_received / result.total_time
+
+        for code, count in enumerate(self.error_counts):
+            if not count:
+                continue
+            errors = self.error_histograms[code]
+            p50, p99 = errors.percentiles([50, 99])
+            result.error_types[ERROR_NAMES[code]] = count
+            result.error_latencies[ERROR_NAMES[code]] = {
+                'count': errors.total_count,
+                'avg': errors.mean / 1e9,
+                'p50': p50 / 1e9,
+                'p99': p99 / 1e9,
+                'max': errors.max_value / 1e9,
+            }
+
+        histogram = self.histogram
+        if histogram.total_count:
+            p50, p90, p95, p99, p999 = histogram.percentiles([50, 90, 95, 99, 99.9])
+            result.min_response_time = histogram.min_value / 1e9
+            result.max_response_time = histogram.max_value / 1e9
+            result.avg_response_time = histogram.mean / 1e9
+            result.median_response_time = p50 / 1e9
+            result.p90_response_time = p90 / 1e9
+            result.p95_response_time = p95 / 1e9
+            result.p99_response_time = p99 / 1e9
+            result.p999_response_time = p999 / 1e9
+
+        if self.group_by == 'endpoint':
+            result.endpoint_stats = {self._group_name(key): stats.summary()
+                                     for key, stats in sorted(self.groups.items())}
+        result.timeseries = self._series()
+        return result
+
+    def _report(self) -> Dict[str, Any]:
+        """Assemble the report of the analyzed window"""
+        return {
+            'files': [record_file.path for record_file in self.files],
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'records_scanned': self.scanned,
+            'records_analyzed': self.total,
+            'window': {
+                'start': (self._low - self._first) / 1e9,
+                'end': (self._high - self._first) / 1e9,
+            },
+            'interval_seconds': self._width / 1e9,
+            'group_by': self.group_by,
+            'groups': {self._group_name(key): stats.summary() for key, stats in sorted(self.groups.items())},
+            'result': self._result().to_dict(),
+            'heatmap': self._heatmap(),
+        }
+
+
+def analyze(paths: Sequence[str], **options) -> Dict[str, Any]:
+    """
+    Analyze result files written by --record
+
+    Args:
+        paths: Result files of one run
+        **options: RecordAnalyzer options (start, end, group_by, ...)
+
+    Returns:
+        Report dict, see RecordAnalyzer.analyze
+    """
+    return RecordAnalyzer(paths, **options).analyze()
+
+
+def save(report: Dict[str, Any], path: str, fmt: Optional[str] = None) -> str:
+    """
+    Write a report as JSON or as a self-contained HTML page
+
+    Args:
+        report: Report from ``analyze``
+        path: Output file
+        fmt: 'html' or 'json' (default: inferred from the extension)
+
+    Returns:
+        Path of the written file
+    """
+    fmt = fmt or infer_report_format(path)
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"report format must be one of {', '.join(REPORT_FORMATS)}")
+
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'json':
+            json.dump(report, f, indent=2)
+        else:
+            f.write(render_html(report))
+    return path
+
+
+def _ms(seconds: float) -> str:
+    """Latency in milliseconds for display"""
+    return f"{seconds*1000:.1f} ms" if seconds < 0.01 else f"{seconds*1000:.0f} ms"
+
+
+def _svg_lines(series: List[Dict[str, float]], keys: Sequence[Tuple[str, str, float]], unit: str) -> str:
+    """Line chart of series keys, each given as (key, color, scale)"""
+    width, height, pad = 900, 200, 40
+    if not series:
+        return ''
+
+    end = series[-1]['elapsed']
+    top = max(max(point[key] * scale for point in series) for key, _, scale in keys) or 1
+    lines = []
+    for key, color, scale in keys:
+        points = ' '.join(
+            f"{pad + point['elapsed'] / end * (width - pad):.1f},"
+            f"{height - pad / 2 - point[key] * scale / top * (height - pad):.1f}"
+            for point in series)
+        lines.append(f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{points}"/>')
+
+    legend = ' '.join(f'<tspan fill="{color}">■ {html.escape(key)}</tspan>' for key, color, _ in keys)
+    return (f'<svg viewBox="0 0 {width} {height}" class="chart">'
+            f'<line x1="{pad}" y1="{height - pad / 2}" x2="{width}" y2="{height - pad / 2}" stroke="#555"/>'
+            f'<text x="2" y="{pad / 2 + 4}">{top:,.0f}{unit}</text><text x="2" y="{height - pad / 2}">0</text>'
+            f'<text x="{pad}" y="{height - 4}">0s</text>'
+            f'<text x="{width}" y="{height - 4}" text-anchor="end">{end:,.0f}s</text>'
+            f'<text x="{width}" y="12" text-anchor="end">{legend}</text>'
+            + ''.join(lines) + '</svg>')
+
+
+def _svg_heatmap(heatmap: Dict[str, Any]) -> str:
+    """Heatmap of latency bins over time; darker cells hold more requests"""
+    columns, bins = heatmap['counts'], heatmap['bins']
+    if not columns or not bins:
+        return '<p>No successful requests.</p>'
+
+    width, height, pad = 900, 320, 60
+    cell_width = (width - pad) / len(columns)
+    cell_height = (height - 20) / len(bins)
+    peak = math.log1p(max(max(column) for column in columns))
+    cells = []
+    for x, column in enumerate(columns):
+        for y, count in enumerate(column):
+            if count:
+                shade = 0.15 + 0.85 * math.log1p(count) / peak
+                cells.append(f'<rect x="{pad + x * cell_width:.1f}" y="{height - 20 - (y + 1) * cell_height:.1f}" '
+                             f'width="{cell_width + 0.3:.1f}" height="{cell_height + 0.3:.1f}" '
+                             f'fill="#e4572e" fill-opacity="{shade:.2f}"><title>{count:,}</title></rect>')
+
+    labels = []
+    for y in range(0, len(bins), max(1, len(bins) // 6)):
+        labels.append(f'<text x="2" y="{height - 20 - y * cell_height:.1f}">{_ms(bins[y])}</text>')
+    end = len(columns) * heatmap['column_seconds']
+    return (f'<svg viewBox="0 0 {width} {height}" class="chart">' + ''.join(cells) + ''.join(labels)
+            + f'<text x="{pad}" y="{height - 4}">0s</text>'
+            f'<text x="{width}" y="{height - 4}" text-anchor="end">{end:,.0f}s</text></svg>')
+
+
+def _table(headers: Sequence[str], rows: List[Sequence[Any]]) -> str:
+    """HTML table with escaped cells"""
+    head = ''.join(f'<th>{html.escape(str(header))}</th>' for header in headers)
+    body = ''.join('<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in row) + '</tr>' for row in rows)
+    return f'<table><tr>{head}</tr>{body}</table>'
+
+
+def render_html(report: Dict[str, Any]) -> str:
+    """Render a report as one HTML page with inline styles and charts"""
+    result = report['result']
+    total = result['total_requests'] or 1
+    series = result['timeseries']
+
+    summary = _table(['Metric', 'Value'], [
+        ['Files', ', '.join(report['files'])],
+        ['Window', f"{report['window']['start']:,.1f}s - {report['window']['end']:,.1f}s after the first request"],
+        ['Duration', f"{result['total_time']:,.2f} s"],
+        ['Total requests', f"{result['total_requests']:,}"],
+        ['Successful', f"{result['successful_requests']:,} ({result['successful_requests'] / total * 100:.2f}%)"],
+        ['Failed', f"{result['failed_requests']:,} ({result['failed_requests'] / total * 100:.2f}%)"],
+        ['Requests per second', f"{result['requests_per_second']:,.0f}"],
+        ['Data received', f"{result['bytes_received'] / 1e6:,.1f} MB ({result['bytes_per_second'] / 1e6:.2f} MB/s)"],
+    ])
+    latency = _table(['Min', 'Avg', 'P50', 'P90', 'P95', 'P99', 'P99.9', 'Max'], [[
+        _ms(result['min_response_time'] or 0), _ms(result['avg_response_time']), _ms(result['median_response_time']),
+        _ms(result['p90_response_time']), _ms(result['p95_response_time']), _ms(result['p99_response_time']),
+        _ms(result['p999_response_time']), _ms(result['max_response_time']),
+    ]])
+
+    sections = [
+        '<h2>Summary</h2>', summary,
+        '<h2>Response Times (successful requests)</h2>', latency,
+        f"<h2>Throughput ({report['interval_seconds']:g}s intervals)</h2>",
+        _svg_lines(series, [('requests_per_second', '#4e79a7', 1.0)], ' req/s'),
+        '<h2>Latency Over Time</h2>',
+        _svg_lines(series, [('p50_response_time', '#59a14f', 1000.0), ('p90_response_time', '#f28e2b', 1000.0),
+                            ('p99_response_time', '#e15759', 1000.0)], ' ms'),
+        '<h2>Latency Heatmap</h2>', _svg_heatmap(report['heatmap']),
+    ]
+
+    if report['groups']:
+        sections += [f"<h2>By {html.escape(report['group_by'])}</h2>", _table(
+            ['Group', 'Requests', 'Share', 'Failed', 'Avg', 'P50', 'P90', 'P99', 'Max'],
+            [[name, f"{stats['total_requests']:,}", f"{stats['total_requests'] / total * 100:.1f}%",
+              f"{stats['failed_requests'] / stats['total_requests'] * 100:.1f}%",
+              _ms(stats['avg_response_time']), _ms(stats['p50_response_time']), _ms(stats['p90_response_time']),
+              _ms(stats['p99_response_time']), _ms(stats['max_response_time'])]
+             for name, stats in report['groups'].items()])]
+
+    if result['status_codes']:
+        sections += ['<h2>Status Codes</h2>', _table(
+            ['Status', 'Count', 'Share'],
+            [[code, f"{count:,}", f"{count / total * 100:.2f}%"] for code, count in result['status_codes'].items()])]
+
+    if result['error_types']:
+        sections += ['<h2>Failures by Class</h2>', _table(
+            ['Class', 'Count', 'Share', 'Avg', 'P50', 'P99', 'Max'],
+            [[name, f"{count:,}", f"{count / total * 100:.2f}%"]
+             + [_ms(result['error_latencies'][name][key]) for key in ('avg', 'p50', 'p99', 'max')]
+             for name, count in sorted(result['error_types'].items(), key=lambda item: -item[1])])]
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>BSB Havoc Report</title>
+<style>
+body {{ font-family: -apple-system, "Segoe UI", Helvetica, Arial, sans-serif; background: #16181d; color: #e6e6e6; margin: 2em auto; max-width: 960px; }}
+h1 {{ color: #4ec9e8; }}
+h2 {{ color: #f2c14e; border-bottom: 1px solid #333; padding-bottom: 4px; margin-top: 1.6em; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ padding: 4px 10px; border-bottom: 1px solid #2a2d35; text-align: right; }}
+th:first-child, td:first-child {{ text-align: left; }}
+th {{ color: #9aa0aa; font-weight: normal; }}
+.chart {{ width: 100%; background: #1d2027; }}
+.chart text {{ fill: #9aa0aa; font-size: 11px; }}
+footer {{ color: #6b7080; margin-top: 2em; font-size: 12px; }}
+</style>
+</head>
+<body>
+<h1>🔥 BSB Havoc Report</h1>
+{''.join(sections)}
+<footer>{report['records_analyzed']:,} of {report['records_scanned']:,} records analyzed, generated {html.escape(report['created'])}</footer>
+</body>
+</html>
+"""
+
+
+def print_report(report: Dict[str, Any]):
+    """Print the summary of a report produced by ``analyze``"""
+    result = report['result']
+    total = result['total_requests'] or 1
+
+    print(f"{Fore.YELLOW}📊 SUMMARY STATISTICS:{Style.RESET_ALL}")
+    print(f"  {Fore.WHITE}• Window:{Style.RESET_ALL} {report['window']['start']:,.1f}s - {report['window']['end']:,.1f}s "
+          f"after the first request ({report['records_analyzed']:,} of {report['records_scanned']:,} records)")
+    print(f"  {Fore.WHITE}• Duration:{Style.RESET_ALL} {result['total_time']:.2f} seconds")
+    print(f"  {Fore.WHITE}• Total Requests:{Style.RESET_ALL} {result['total_requests']:,}")
+    print(f"  {Fore.WHITE}• Successful Requests:{Style.RESET_ALL} {result['successful_requests']:,} ({result['successful_requests']/total*100:.1f}%)")
+    print(f"  {Fore.WHITE}• Failed Requests:{Style.RESET_ALL} {result['failed_requests']:,} ({result['failed_requests']/total*100:.1f}%)")
+    print(f"  {Fore.WHITE}• Requests Per Second:{Style.RESET_ALL} {result['requests_per_second']:.0f}")
+    print(f"  {Fore.WHITE}• Data Received:{Style.RESET_ALL} {result['bytes_received']/1e6:,.1f} MB ({result['bytes_per_second']/1e6:.2f} MB/s)")
+
+    if result['min_response_time'] is not None:
+        print(f"\n{Fore.YELLOW}⏱️  RESPONSE TIME ANALYSIS:{Style.RESET_ALL}")
+        print(f"  {Fore.WHITE}• Minimum:{Style.RESET_ALL} {result['min_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• Maximum:{Style.RESET_ALL} {result['max_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• Average:{Style.RESET_ALL} {result['avg_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• Median:{Style.RESET_ALL} {result['median_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• 90th Percentile:{Style.RESET_ALL} {result['p90_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• 95th Percentile:{Style.RESET_ALL} {result['p95_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• 99th Percentile:{Style.RESET_ALL} {result['p99_response_time']*1000:.0f} ms")
+        print(f"  {Fore.WHITE}• 99.9th Percentile:{Style.RESET_ALL} {result['p999_response_time']*1000:.1f} ms")
+
+    series = result['timeseries']
+    if len(series) > 1:
+        worst = max(series, key=lambda point: point['p99_response_time'])
+        print(f"\n{Fore.YELLOW}📉 LATENCY OVER TIME ({report['interval_seconds']:g}s intervals):{Style.RESET_ALL}")
+        print(f"  {Fore.WHITE}{'Interval':<18}{'RPS':>10}{'Errors':>9}{'P50':>10}{'P99 (max)':>12}{'Max':>10}{Style.RESET_ALL}")
+        for segment in condense(series):
+            span = f"{segment['start']:.0f}s - {segment['end']:.0f}s"
+            print(f"  {span:<18}{segment['requests_per_second']:>10,.0f}{segment['error_rate']*100:>8.2f}%"
+                  f"{segment['p50_response_time']*1000:>8.0f}ms{segment['p99_response_time']*1000:>10.0f}ms"
+                  f"{segment['max_response_time']*1000:>8.0f}ms")
+        print(f"  {Fore.WHITE}• Slowest Interval:{Style.RESET_ALL} ending {worst['elapsed']:.0f}s "
+              f"(p99 {worst['p99_response_time']*1000:.0f} ms, {worst['requests_per_second']:,.0f} req/s)")
+
+    if report['groups']:
+        groups = report['groups']
+        width = max(24, max(len(name) for name in groups) + 2)
+        print(f"\n{Fore.YELLOW}🗺️  BY {report['group_by'].upper()}:{Style.RESET_ALL}")
+        print(f"  {Fore.WHITE}{report['group_by'].capitalize():<{width}}{'Requests':>10}{'Share':>8}{'Failed':>8}"
+              f"{'Avg':>10}{'P50':>10}{'P99':>10}{Style.RESET_ALL}")
+        for name, stats in groups.items():
+            count = stats['total_requests']
+            print(f"  {name:<{width}}{count:>10,}{count/total*100:>7.1f}%{stats['failed_requests']/count*100:>7.1f}%"
+                  f"{stats['avg_response_time']*1000:>8.0f}ms{stats['p50_response_time']*1000:>8.0f}ms"
+                  f"{stats['p99_response_time']*1000:>8.0f}ms")
+
+    if result['status_codes']:
+        print(f"\n{Fore.YELLOW}📈 STATUS CODE DISTRIBUTION:{Style.RESET_ALL}")
+        for code, count in result['status_codes'].items():
+            color = Fore.GREEN if int(code) < 300 else Fore.YELLOW if int(code) < 400 else Fore.RED
+            print(f"  {color}{code}:{Style.RESET_ALL} {count:,} ({count/total*100:.1f}%)")
+
+    if result['error_types']:
+        print(f"\n{Fore.YELLOW}🧯 FAILURES BY CLASS:{Style.RESET_ALL}")
+        print(f"  {Fore.WHITE}{'Class':<20}{'Count':>10}{'Share':>8}{'Avg':>10}{'P50':>10}{'P99':>10}{'Max':>10}{Style.RESET_ALL}")
+        for name, count in sorted(result['error_types'].items(), key=lambda item: -item[1]):
+            latency = result['error_latencies'][name]
+            print(f"  {Fore.RED}{name:<20}{Style.RESET_ALL}{count:>10,}{count/total*100:>7.1f}%"
+                  f"{latency['avg']*1000:>8.0f}ms{latency['p50']*1000:>8.0f}ms"
+                  f"{latency['p99']*1000:>8.0f}ms{latency['max']*1000:>8.0f}ms")
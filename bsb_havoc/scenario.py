@@ -0,0 +1,206 @@
+"""
+BSB Havoc Scenario - Weighted Multi-Endpoint Traffic
+🗺️ Request templates compiled once, picked in O(1) per request
+"""
+
+import json
+import random
+from typing import Any, Dict, List, Optional
+
+from multidict import CIMultiDict
+from yarl import URL
+
+from .histogram import LatencyHistogram
+
+# Per-template histograms trade precision for memory so large scenarios stay small
+TEMPLATE_PRECISION = 2
+
+METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+
+# Binary request records store the template index in 16 bits
+MAX_TEMPLATES = 0xFFFF
+
+
+class RequestTemplate:
+    """🧩 One compiled request: URL, headers and body built at load time"""
+
+    __slots__ = ('name', 'method', 'url', 'headers', 'body', 'weight')
+
+    def __init__(self, name: str, method: str, url: URL, headers: CIMultiDict,
+                 body: Optional[bytes], weight: float):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.weight = weight
+
+
+class AliasTable:
+    """🎲 Walker/Vose alias table: weighted choice in constant time"""
+
+    def __init__(self, weights: List[float]):
+        """
+        Build the table
+
+        Args:
+            weights: Relative, non-negative weights with a positive sum
+        """
+        count = len(weights)
+        total = float(sum(weights))
+        if not count or total <= 0:
+            raise ValueError("weights must contain at least one positive value")
+
+        scaled = [weight * count / total for weight in weights]
+        self._prob = [1.0] * count
+        self._alias = list(range(count))
+        self._count = count
+        self._random = random.random
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low, high = small.pop(), large.pop()
+            self._prob[low] = scaled[low]
+            self._alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def pick(self) -> int:
+        """Return a random index, distributed according to the weights"""
+        u = self._random() * self._count
+        index = int(u)
+        return index if u - index < self._prob[index] else self._alias[index]
+
+
+class TemplateStats:
+    """📊 Counters and latency histogram for one request template"""
+
+    __slots__ = ('total', 'failed', 'histogram')
+
+    def __init__(self):
+        self.total = 0
+        self.failed = 0
+        self.histogram = LatencyHistogram(TEMPLATE_PRECISION)
+
+    def summary(self) -> Dict[str, float]:
+        """Summarize in seconds, like TestResult"""
+        histogram = self.histogram
+        p50, p90, p99 = histogram.percentiles([50, 90, 99])
+        return {
+            'total_requests': self.total,
+            'failed_requests': self.failed,
+            'avg_response_time': histogram.mean / 1e9,
+            'p50_response_time': p50 / 1e9,
+            'p90_response_time': p90 / 1e9,
+            'p99_response_time': p99 / 1e9,
+            'max_response_time': histogram.max_value / 1e9,
+        }
+
+    def drain(self) -> List:
+        """Serialize and reset"""
+        drained = [self.total, self.failed, self.histogram.to_dict()]
+        self.total = self.failed = 0
+        self.histogram.reset()
+        return drained
+
+    def merge(self, drained: List):
+        """Merge counters produced by ``drain`` on another engine"""
+        total, failed, histogram = drained
+        self.total += total
+        self.failed += failed
+        self.histogram.merge_dict(histogram)
+
+
+class Scenario:
+    """🗺️ Weighted set of request templates loaded from a scenario file
+
+    A scenario file is JSON::
+
+        {
+          "base_url": "https://api.example.com",
+          "headers": {"Authorization": "Bearer ..."},
+          "requests": [
+            {"name": "home", "path": "/", "weight": 10},
+            {"name": "search", "path": "/search?q=shoes", "weight": 5},
+            {"name": "login", "method": "POST", "path": "/login",
+             "json": {"user": "demo", "password": "demo"}, "weight": 1}
+          ]
+        }
+
+    Each request takes either ``path`` (joined to ``base_url``) or an
+    absolute ``url``, and optionally ``method``, ``headers``, and a
+    ``json`` or ``body`` payload. ``weight`` defaults to 1.
+    """
+
+    def __init__(self, spec: Dict[str, Any], base_url: Optional[str] = None):
+        """
+        Compile a scenario specification
+
+        Args:
+            spec: Parsed scenario file
+            base_url: Overrides the file's base_url
+        """
+        self.spec = spec
+        self.base_url = base_url or spec.get('base_url')
+        entries = spec.get('requests')
+        if not entries:
+            raise ValueError("scenario must define at least one request")
+        if len(entries) > MAX_TEMPLATES:
+            raise ValueError(f"scenario may define at most {MAX_TEMPLATES} requests")
+
+        default_headers = spec.get('headers', {})
+        self.templates: List[RequestTemplate] = [
+            self._compile(index, entry, default_headers) for index, entry in enumerate(entries)
+        ]
+        self.names = [template.name for template in self.templates]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("scenario request names must be unique")
+
+        self._table = AliasTable([template.weight for template in self.templates])
+
+    @classmethod
+    def load(cls, path: str, base_url: Optional[str] = None) -> 'Scenario':
+        """Load and compile a scenario file"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), base_url)
+
+    def _compile(self, index: int, entry: Dict[str, Any], default_headers: Dict[str, str]) -> RequestTemplate:
+        """Build a RequestTemplate from one scenario entry"""
+        name = entry.get('name') or f"request-{index + 1}"
+        method = entry.get('method', 'GET').upper()
+        if method not in METHODS:
+            raise ValueError(f"{name}: unsupported method {method}")
+
+        if 'url' in entry:
+            url = URL(entry['url'])
+        elif self.base_url:
+            url = URL(self.base_url.rstrip('/') + '/' + entry.get('path', '/').lstrip('/'))
+        else:
+            raise ValueError(f"{name}: needs a 'url', or a 'path' and a base_url")
+        if not url.is_absolute():
+            raise ValueError(f"{name}: URL {url} is not absolute")
+
+        headers = CIMultiDict(default_headers)
+        headers.update(entry.get('headers', {}))
+
+        if 'json' in entry:
+            body = json.dumps(entry['json'], separators=(',', ':')).encode()
+            headers.setdefault('Content-Type', 'application/json')
+        elif 'body' in entry:
+            body = entry['body'].encode() if isinstance(entry['body'], str) else bytes(entry['body'])
+        else:
+            body = None
+
+        weight = float(entry.get('weight', 1))
+        if weight < 0:
+            raise ValueError(f"{name}: weight must not be negative")
+
+        return RequestTemplate(name, method, url, headers, body, weight)
+
+    def pick(self) -> int:
+        """Index of the next template to send"""
+        return self._table.pick()
+
+    def __len__(self) -> int:
+        return len(self.templates)
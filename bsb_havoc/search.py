@@ -0,0 +1,321 @@
+"""
+BSB Havoc Search - Automatic Capacity Search
+🎯 Finds the highest load a target sustains within a latency SLO
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from colorama import Fore, Style
+
+from .engine import HavocEngine, TestResult
+from .sharding import ShardedHavocEngine
+
+SEARCH_MODES = ('concurrency', 'rate')
+
+# In rate mode a level fails when less than this share of the offered rate is served
+MIN_RATE_ACHIEVED = 0.9
+
+_SLO_TERM = re.compile(r'^\s*(p50|p90|p95|p99|p99\.9|errors)\s*<\s*([\d.]+)\s*(ms|s|%)?\s*$', re.IGNORECASE)
+_RPS_TERM = re.compile(r'^\s*rps\s*>\s*([\d.]+)\s*(?:/s)?\s*$', re.IGNORECASE)
+
+
+@dataclass
+class SLO:
+    """Service level objective a load level must meet to pass"""
+    max_p50: Optional[float] = None
+    max_p90: Optional[float] = None
+    max_p95: Optional[float] = None
+    max_p99: Optional[float] = None
+    max_p999: Optional[float] = None
+    max_error_rate: Optional[float] = None
+    min_rps: Optional[float] = None
+
+    def violations(self, result: TestResult) -> List[str]:
+        """
+        Check a result against the objective
+
+        Returns:
+            Human readable description of every violated threshold
+        """
+        violations = []
+        for name, limit, value in (
+            ('p50', self.max_p50, result.median_response_time),
+            ('p90', self.max_p90, result.p90_response_time),
+            ('p95', self.max_p95, result.p95_response_time),
+            ('p99', self.max_p99, result.p99_response_time),
+            ('p99.9', self.max_p999, result.p999_response_time),
+        ):
+            if limit is None:
+                continue
+            # Latencies cover successful requests only: without any, the percentiles read 0
+            if not result.successful_requests:
+                violations.append(f"{name} unknown: no successful requests")
+            elif value > limit:
+                violations.append(f"{name} {value*1000:.0f}ms > {limit*1000:.0f}ms")
+
+        if self.max_error_rate is not None:
+            error_rate = result.failed_requests / result.total_requests if result.total_requests else 1.0
+            if error_rate > self.max_error_rate:
+                violations.append(f"errors {error_rate*100:.2f}% > {self.max_error_rate*100:.2f}%")
+
+        if self.min_rps is not None and result.requests_per_second < self.min_rps:
+            violations.append(f"rps {result.requests_per_second:,.0f} < {self.min_rps:,.0f}")
+
+        return violations
+
+    def describe(self) -> str:
+        """Short human readable form, e.g. 'p99<200ms, errors<0.1%'"""
+        terms = []
+        for name, limit in (('p50', self.max_p50), ('p90', self.max_p90), ('p95', self.max_p95),
+                            ('p99', self.max_p99), ('p99.9', self.max_p999)):
+            if limit is not None:
+                terms.append(f"{name}<{limit*1000:g}ms")
+        if self.max_error_rate is not None:
+            terms.append(f"errors<{self.max_error_rate*100:g}%")
+        if self.min_rps is not None:
+            terms.append(f"rps>{self.min_rps:g}")
+        return ', '.join(terms) or 'none'
+
+
+def parse_slo(text: str) -> SLO:
+    """
+    Parse an SLO such as "p99<200ms,errors<0.1%,rps>1000"
+
+    Latencies accept ms (default) or s, error rates accept % or a fraction,
+    and rps sets the lowest acceptable throughput.
+    """
+    fields = {'p50': 'max_p50', 'p90': 'max_p90', 'p95': 'max_p95', 'p99': 'max_p99', 'p99.9': 'max_p999'}
+    slo = SLO()
+
+    for term in filter(None, (part.strip() for part in text.split(','))):
+        rps = _RPS_TERM.match(term)
+        if rps:
+            slo.min_rps = float(rps.group(1))
+            continue
+
+        match = _SLO_TERM.match(term)
+        if not match:
+            raise ValueError(f"Invalid SLO term '{term}' (expected e.g. p99<200ms, errors<0.1% or rps>1000)")
+
+        name, value, unit = match.group(1).lower(), float(match.group(2)), (match.group(3) or '').lower()
+        if name == 'errors':
+            slo.max_error_rate = value / 100 if unit == '%' else value
+        else:
+            setattr(slo, fields[name], value if unit == 's' else value / 1000)
+
+    return slo
+
+
+@dataclass
+class SearchStep:
+    """Outcome of one measurement window"""
+    level: float
+    result: TestResult
+    violations: List[str]
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations
+
+    @property
+    def error_rate(self) -> float:
+        total = self.result.total_requests
+        return self.result.failed_requests / total if total else 0.0
+
+
+@dataclass
+class SearchResult:
+    """Throughput/latency curve and knee point of a capacity search"""
+    mode: str
+    slo: SLO
+    steps: List[SearchStep] = field(default_factory=list)
+
+    @property
+    def knee(self) -> Optional[SearchStep]:
+        """Highest passing level, or None when even the first level failed"""
+        passing = [step for step in self.steps if step.passed]
+        return max(passing, key=lambda step: step.level) if passing else None
+
+
+class CapacitySearch:
+    """🎯 Raises the load window by window until the SLO breaks
+
+    Load grows geometrically (or linearly with ``step``) until a level
+    violates the SLO or ``max_level`` is reached, then the gap between
+    the last passing and first failing level is bisected.
+    """
+
+    def __init__(self, target_url: str, slo: SLO, mode: str = 'concurrency',
+                 start: float = 10, max_level: float = 10000, growth: float = 2.0,
+                 step: float = 0, window: float = 10.0, precision: float = 0.05,
+                 max_concurrent: int = 1000, processes: int = 1,
+                 engine_options: Optional[Dict[str, Any]] = None, verbose: bool = True):
+        """
+        Initialize the search
+
+        Args:
+            target_url: Target website URL
+            slo: Objective every passing level must meet
+            mode: 'concurrency' to search workers, 'rate' to search arrival rates
+            start: First load level
+            max_level: Highest load level tried
+            growth: Factor between levels while ramping up
+            step: Fixed increment between levels (overrides growth)
+            window: Seconds each level is measured for
+            precision: Stop bisecting when the gap is below this share of the level
+            max_concurrent: In-flight cap used in rate mode
+            processes: Worker processes per window
+            engine_options: Extra keyword arguments for every engine
+            verbose: Print progress and the final curve
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"mode must be one of {', '.join(SEARCH_MODES)}")
+        if start <= 0 or max_level < start:
+            raise ValueError("start must be positive and no greater than max_level")
+        if step <= 0 and growth <= 1:
+            raise ValueError("growth must be greater than 1")
+
+        self.target_url = target_url
+        self.slo = slo
+        self.mode = mode
+        self.start = start
+        self.max_level = max_level
+        self.growth = growth
+        self.step = step
+        self.window = window
+        self.precision = precision
+        self.max_concurrent = max_concurrent
+        self.processes = processes
+        self.engine_options = dict(engine_options or {})
+        self.verbose = verbose
+        self._engine: Optional[HavocEngine] = None
+        self._stopped = False
+
+    def _create_engine(self, level: float) -> HavocEngine:
+        """Build a fresh, quiet engine for one load level"""
+        options = dict(self.engine_options, handle_signals=False)
+        if self.mode == 'rate':
+            concurrency, options['rate'] = self.max_concurrent, level
+        else:
+            concurrency = int(level)
+
+        if self.processes > 1:
+            return ShardedHavocEngine(self.target_url, concurrency, self.processes, **options)
+        return HavocEngine(self.target_url, concurrency, **options)
+
+    def _normalize(self, level: float) -> float:
+        """Concurrency levels are whole workers"""
+        return float(max(1, round(level))) if self.mode == 'concurrency' else level
+
+    async def _measure(self, level: float) -> SearchStep:
+        """Run one window at ``level`` and judge it against the SLO"""
+        self._engine = self._create_engine(level)
+        result = await self._engine.run_window(self.window)
+        self._engine = None
+
+        violations = self.slo.violations(result)
+        if self.mode == 'rate' and result.requests_per_second < level * MIN_RATE_ACHIEVED:
+            violations.append(f"served {result.requests_per_second:.0f} of {level:.0f} req/s")
+
+        step = SearchStep(level, result, violations)
+        if self.verbose:
+            self._print_step(step)
+        return step
+
+    def stop(self):
+        """Abort the search after the current window"""
+        self._stopped = True
+        if self._engine:
+            self._engine.is_running = False
+
+    async def run(self) -> SearchResult:
+        """
+        Run the search
+
+        Returns:
+            SearchResult with every measured level and the knee point
+        """
+        search = SearchResult(self.mode, self.slo)
+        passed: Optional[float] = None
+        failed: Optional[float] = None
+        level = self._normalize(self.start)
+
+        # Ramp up until the SLO breaks
+        while level <= self.max_level and not self._stopped:
+            step = await self._measure(level)
+            search.steps.append(step)
+            if not step.passed:
+                failed = level
+                break
+            passed = level
+            next_level = self._normalize(level + self.step if self.step > 0 else level * self.growth)
+            if next_level <= level:
+                next_level = level + 1
+            level = next_level
+
+        # Narrow down the knee between the last pass and the first failure
+        while passed is not None and failed is not None and not self._stopped:
+            middle = self._normalize((passed + failed) / 2)
+            if middle in (passed, failed) or (failed - passed) <= passed * self.precision:
+                break
+            step = await self._measure(middle)
+            search.steps.append(step)
+            if step.passed:
+                passed = middle
+            else:
+                failed = middle
+
+        search.steps.sort(key=lambda step: step.level)
+        if self.verbose:
+            self._print_summary(search)
+        return search
+
+    def _format_level(self, level: float) -> str:
+        if self.mode == 'rate':
+            return f"{level:,.0f} req/s"
+        return f"{level:,.0f} workers"
+
+    def _print_step(self, step: SearchStep):
+        result = step.result
+        verdict = f"{Fore.GREEN}PASS" if step.passed else f"{Fore.RED}FAIL ({'; '.join(step.violations)})"
+        print(f"{Fore.CYAN}🎯 {self._format_level(step.level):>18}{Style.RESET_ALL} | "
+              f"RPS: {result.requests_per_second:>8,.0f} | "
+              f"P50: {result.median_response_time*1000:>6.0f}ms | "
+              f"P99: {result.p99_response_time*1000:>6.0f}ms | "
+              f"ERR: {step.error_rate*100:>5.2f}% | {verdict}{Style.RESET_ALL}")
+
+    def _print_summary(self, search: SearchResult):
+        if not search.steps:
+            return
+
+        print(f"\n{'='*80}")
+        print(f"{Fore.CYAN}{Style.BRIGHT}🎯 BSB HAVOC - CAPACITY SEARCH RESULTS{Style.RESET_ALL}")
+        print(f"{'='*80}")
+        print(f"  {Fore.WHITE}• Target URL:{Style.RESET_ALL} {self.target_url}")
+        print(f"  {Fore.WHITE}• SLO:{Style.RESET_ALL} {self.slo.describe()}")
+        print(f"  {Fore.WHITE}• Window:{Style.RESET_ALL} {self.window:g} seconds per level")
+
+        print(f"\n{Fore.YELLOW}📈 THROUGHPUT / LATENCY CURVE:{Style.RESET_ALL}")
+        print(f"  {Fore.WHITE}{'Level':>18}{'RPS':>10}{'P50':>10}{'P90':>10}{'P99':>10}{'Errors':>9}  Verdict{Style.RESET_ALL}")
+        for step in search.steps:
+            result = step.result
+            color = Fore.GREEN if step.passed else Fore.RED
+            print(f"  {self._format_level(step.level):>18}{result.requests_per_second:>10,.0f}"
+                  f"{result.median_response_time*1000:>8.0f}ms{result.p90_response_time*1000:>8.0f}ms"
+                  f"{result.p99_response_time*1000:>8.0f}ms{step.error_rate*100:>8.2f}%  "
+                  f"{color}{'PASS' if step.passed else 'FAIL'}{Style.RESET_ALL}")
+
+        knee = search.knee
+        print()
+        if knee is None:
+            print(f"{Fore.RED}❌ The SLO was violated at the lowest level tried ({self._format_level(search.steps[0].level)}){Style.RESET_ALL}")
+        else:
+            print(f"{Fore.MAGENTA}{Style.BRIGHT}🏁 Knee point: {self._format_level(knee.level)} → "
+                  f"{knee.result.requests_per_second:,.0f} req/s at p99 {knee.result.p99_response_time*1000:.0f}ms{Style.RESET_ALL}")
+            if self._stopped:
+                print(f"{Fore.YELLOW}⚠️  Search stopped early: the knee may lie higher{Style.RESET_ALL}")
+            elif knee is search.steps[-1] and knee.level >= self.max_level:
+                print(f"{Fore.YELLOW}⚠️  Reached the maximum level without breaking the SLO{Style.RESET_ALL}")
+        print(f"{'='*80}\n")
@@ -0,0 +1,211 @@
+"""
+BSB Havoc Sharding - Multi-Process Load Generation
+⚡ One event loop per core, one merged set of results
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import time
+from typing import Any, Dict, List, Optional
+
+from .engine import HavocEngine
+from .rawhttp import install_uvloop, running_uvloop
+from .recorder import shard_path
+
+# How often each shard ships its statistics to the parent (seconds)
+SHARD_REPORT_INTERVAL = 0.25
+
+# How long to wait for shards to flush their last statistics (seconds)
+SHARD_SHUTDOWN_TIMEOUT = 10.0
+
+# How long spawning and importing may take before the shards are given up on (seconds)
+SHARD_STARTUP_TIMEOUT = 60.0
+
+# Queued by a shard once it is up and waiting for the start signal
+SHARD_READY = 'ready'
+
+
+def _split_concurrency(max_concurrent: int, processes: int) -> List[int]:
+    """Spread the concurrency budget as evenly as possible across processes"""
+    share, extra = divmod(max_concurrent, processes)
+    return [share + (1 if i < extra else 0) for i in range(processes)]
+
+
+def _split_budget(max_requests: Optional[int], shares: List[int]) -> List[int]:
+    """Split a request budget in proportion to each process's concurrency (empty: no budget)"""
+    if max_requests is None:
+        return []
+    total = sum(shares)
+    budgets = [max_requests * share // total for share in shares]
+    for index in range(max_requests - sum(budgets)):
+        budgets[index] += 1
+    return budgets
+
+
+async def _run_shard(engine: HavocEngine, stats_queue, start_event, stop_event):
+    """Drive one engine until the parent asks it to stop"""
+    # Every shard starts together, once the slowest one has spawned
+    stats_queue.put(SHARD_READY)
+    await asyncio.get_running_loop().run_in_executor(None, start_event.wait)
+
+    engine.is_running = True
+    workers = await engine._start_load()
+
+    try:
+        while not stop_event.is_set():
+            await asyncio.sleep(SHARD_REPORT_INTERVAL)
+            stats_queue.put(engine._drain_stats())
+    finally:
+        engine.is_running = False
+        await engine._stop_load(workers)
+        stats_queue.put(engine._drain_stats())
+        stats_queue.put(None)
+
+
+def _shard_main(target_url: str, max_concurrent: int, engine_kwargs: Dict[str, Any], stats_queue, start_event,
+                stop_event, use_uvloop: bool = False):
+    """Entry point of a shard process"""
+    # The parent owns Ctrl+C handling and tells shards when to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    # Shards run on the same kind of event loop as the parent
+    if use_uvloop:
+        install_uvloop()
+
+    engine = HavocEngine(target_url, max_concurrent, handle_signals=False, **engine_kwargs)
+    asyncio.run(_run_shard(engine, stats_queue, start_event, stop_event))
+
+
+class ShardedHavocEngine(HavocEngine):
+    """⚡ Multi-Process Havoc Engine - every core generates load"""
+
+    def __init__(self, target_url: str, max_concurrent: int = 1000, processes: Optional[int] = None,
+                 handle_signals: bool = True, **engine_kwargs):
+        """
+        Initialize the Sharded Havoc Engine
+
+        Args:
+            target_url: Target website URL
+            max_concurrent: Maximum concurrent connections across all processes
+            processes: Number of worker processes (default: CPU count)
+            handle_signals: Install SIGINT/SIGTERM handlers in this process
+            **engine_kwargs: Options passed on to every shard's HavocEngine
+        """
+        super().__init__(target_url, max_concurrent, handle_signals=handle_signals, **engine_kwargs)
+        self.engine_kwargs = engine_kwargs
+        self.processes = max(1, min(processes or os.cpu_count() or 1, max_concurrent))
+        self._context = multiprocessing.get_context('spawn')
+        self._stats_queue = None
+        self._start_event = None
+        self._stop_event = None
+        self._shards: List[multiprocessing.Process] = []
+
+    def _files_description(self, path: str) -> str:
+        """Each shard writes its own file"""
+        return f"{shard_path(path, 0)} … {shard_path(path, self.processes - 1)} (one per process)"
+
+    async def _collect(self):
+        """Merge statistics shipped by the shards into this engine"""
+        while True:
+            self._drain_queue()
+            await asyncio.sleep(0.1)
+
+    def _drain_queue(self) -> int:
+        """
+        Merge every statistics message currently queued
+
+        Returns:
+            Number of shards that reported they are finished
+        """
+        finished = 0
+        while True:
+            try:
+                stats: Optional[Dict] = self._stats_queue.get_nowait()
+            except queue.Empty:
+                return finished
+
+            if stats is None:
+                finished += 1
+            else:
+                self._merge_stats(stats)
+
+    async def _start_load(self) -> List[asyncio.Task]:
+        """Spawn the shard processes, start them together and collect their statistics"""
+        self._stats_queue = self._context.Queue()
+        self._start_event = self._context.Event()
+        self._stop_event = self._context.Event()
+        use_uvloop = running_uvloop()
+
+        shares = _split_concurrency(self.max_concurrent, self.processes)
+        budgets = _split_budget(self.max_requests, shares)
+        for index, concurrency in enumerate(shares):
+            # Each shard runs its slice of the arrival schedule and request budget
+            shard_kwargs = dict(self.engine_kwargs)
+            if self.rate:
+                shard_kwargs['rate'] = self.rate * concurrency / self.max_concurrent
+            if budgets:
+                shard_kwargs['max_requests'] = budgets[index]
+            if self.record_path:
+                shard_kwargs['record_path'] = shard_path(self.record_path, index)
+            if self.profile_path:
+                shard_kwargs['profile_path'] = shard_path(self.profile_path, index)
+            if self.payload and self.payload.per_request:
+                shard_kwargs['payload'] = self.payload.interleave(index, self.processes)
+
+            process = self._context.Process(
+                target=_shard_main,
+                args=(self.target_url, concurrency, shard_kwargs, self._stats_queue, self._start_event,
+                      self._stop_event, use_uvloop),
+                daemon=True
+            )
+            process.start()
+            self._shards.append(process)
+
+        await self._await_shards()
+        return [asyncio.create_task(self._collect())]
+
+    async def _await_shards(self):
+        """Wait until every shard is ready, then release them all at once"""
+        ready = 0
+        deadline = time.time() + SHARD_STARTUP_TIMEOUT
+        while ready < len(self._shards):
+            try:
+                message = self._stats_queue.get_nowait()
+            except queue.Empty:
+                if time.time() >= deadline or not all(shard.is_alive() for shard in self._shards):
+                    for shard in self._shards:
+                        shard.terminate()
+                    self._shards = []
+                    raise RuntimeError("worker processes failed to start")
+                await asyncio.sleep(0.01)
+                continue
+            if message == SHARD_READY:
+                ready += 1
+
+        self._start_event.set()
+
+    async def _stop_load(self, tasks: List[asyncio.Task]):
+        """Stop the shards and merge their final statistics"""
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._stop_event.set()
+
+        finished = 0
+        deadline = time.time() + SHARD_SHUTDOWN_TIMEOUT + self.drain
+        while finished < len(self._shards) and time.time() < deadline:
+            finished += self._drain_queue()
+            if not any(shard.is_alive() for shard in self._shards):
+                finished += self._drain_queue()
+                break
+            await asyncio.sleep(0.05)
+
+        for shard in self._shards:
+            shard.join(timeout=1)
+            if shard.is_alive():
+                shard.terminate()
+        self._shards = []
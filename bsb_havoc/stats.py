@@ -0,0 +1,88 @@
+"""
+BSB Havoc Stats - Hot-Path Request Counters
+🧮 Preallocated counters bumped per request, folded into results per tick
+"""
+
+from array import array
+from typing import Dict, List
+
+from .errors import ERROR_HTTP_5XX, ERROR_NAMES
+
+# HTTP status codes have three digits, so each gets its own slot; slot 0 counts failures
+STATUS_SLOTS = 1000
+
+# Names of the buckets returned by StatShard.status_classes()
+STATUS_CLASSES = ('failed', '1xx', '2xx', '3xx', '4xx', '5xx')
+
+_ZEROS = bytes(8 * STATUS_SLOTS)
+
+
+class StatShard:
+    """🧮 Request counters owned by one engine's event loop
+
+    Workers only index into a preallocated array and add to a few slots,
+    with no dict lookups or dataclass attribute chains. The shard is
+    folded into a TestResult once per monitor tick (and before results
+    are drained or finalized), then starts again from zero.
+    """
+
+    __slots__ = ('status_counts', 'error_counts', 'bytes_received', 'bytes_sent', 'late_requests',
+                 'max_schedule_lag')
+
+    def __init__(self):
+        self.status_counts = array('q', _ZEROS)
+        self.error_counts = array('q', bytes(8 * len(ERROR_NAMES)))
+        self.bytes_received = 0
+        self.bytes_sent = 0
+        self.late_requests = 0
+        self.max_schedule_lag = 0.0
+
+    @property
+    def total(self) -> int:
+        """Requests counted since the last fold"""
+        return sum(self.status_counts)
+
+    def status_codes(self) -> Dict[int, int]:
+        """Responses per status code (failures excluded)"""
+        return {code: count for code, count in enumerate(self.status_counts) if count and code}
+
+    def status_classes(self) -> List[int]:
+        """Counts per STATUS_CLASSES bucket"""
+        classes = [0] * len(STATUS_CLASSES)
+        for code, count in enumerate(self.status_counts):
+            if count:
+                classes[code // 100 if code else 0] += count
+        return classes
+
+    def fold_into(self, results):
+        """
+        Add the counters to a TestResult and reset the shard
+
+        Args:
+            results: TestResult receiving the counts
+        """
+        counts = self.status_counts
+        total = sum(counts)
+        if total:
+            # Server errors got a response but still count as failed requests
+            failed = counts[0] + self.error_counts[ERROR_HTTP_5XX]
+            results.total_requests += total
+            results.failed_requests += failed
+            results.successful_requests += total - failed
+            status_codes = results.status_codes
+            for code, count in self.status_codes().items():
+                status_codes[code] = status_codes.get(code, 0) + count
+            self.status_counts = array('q', _ZEROS)
+
+            error_types = results.error_types
+            for code, count in enumerate(self.error_counts):
+                if count:
+                    error_types[ERROR_NAMES[code]] = error_types.get(ERROR_NAMES[code], 0) + count
+            self.error_counts = array('q', bytes(8 * len(ERROR_NAMES)))
+
+        results.bytes_received += self.bytes_received
+        results.bytes_sent += self.bytes_sent
+        results.late_requests += self.late_requests
+        results.max_schedule_lag = max(results.max_schedule_lag, self.max_schedule_lag)
+        self.bytes_received = self.bytes_sent = self.late_requests = 0
+        self.max_schedule_lag = 0.0
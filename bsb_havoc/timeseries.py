@@ -0,0 +1,228 @@
+"""
+BSB Havoc Time Series - Rolling Live Metrics
+📉 Per-interval buckets for windowed percentiles and a per-second run history
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .histogram import LatencyHistogram
+
+# Windows the live monitor can summarize, in seconds
+LIVE_WINDOWS = (1, 10, 60)
+
+# Significant digits of the latency histogram kept for every interval
+INTERVAL_PRECISION = 2
+
+
+class _Interval:
+    """One tick worth of traffic"""
+
+    __slots__ = ('duration', 'requests', 'failed', 'bytes', 'latency')
+
+    def __init__(self, duration: float, requests: int, failed: int, received: int, latency: Dict):
+        self.duration = duration
+        self.requests = requests
+        self.failed = failed
+        self.bytes = received
+        self.latency = latency
+
+
+class RollingMetrics:
+    """📉 Ring buffer of per-interval counters and latency histograms
+
+    Nothing is recorded per request: on every tick the engine's latency
+    histogram is diffed against a copy taken on the previous tick, and
+    the counters are read from the folded TestResult. The last
+    ``max(LIVE_WINDOWS)`` intervals are kept for windowed statistics; a
+    compact summary and a coarse latency histogram of every interval are
+    kept for the final report and for comparing runs.
+    """
+
+    def __init__(self, histogram: LatencyHistogram, capacity: int = max(LIVE_WINDOWS), interval: float = 1.0):
+        """
+        Start tracking
+
+        Args:
+            histogram: The engine's latency histogram
+            capacity: Intervals kept for windowed statistics
+            interval: Seconds between regular ticks
+        """
+        self.histogram = histogram
+        self.interval = interval
+        self.series: List[Dict[str, float]] = []
+        self.interval_histograms: List[Dict] = []
+        self._intervals: Deque[_Interval] = deque(maxlen=capacity)
+        self._previous = histogram.copy()
+        self._started = time.time()
+        self._last_tick = self._started
+        self._last_counts: Tuple[int, int, int] = (0, 0, 0)
+        self._phase_start = 0
+
+    def tick(self, results, now: Optional[float] = None):
+        """
+        Close the current interval
+
+        Args:
+            results: The engine's TestResult, with hot-path counters folded in
+            now: Wall-clock time of the tick (default: now)
+        """
+        now = time.time() if now is None else now
+        duration = now - self._last_tick
+        if duration <= 0:
+            return
+
+        counts = (results.total_requests, results.failed_requests, results.bytes_received)
+        requests, failed, received = (value - before for value, before in zip(counts, self._last_counts))
+        latency = self.histogram.delta(self._previous)
+
+        interval = _Interval(duration, requests, failed, received, latency)
+        self._intervals.append(interval)
+        self.series.append(self._summarize([interval], round(now - self._started, 3)))
+        self.interval_histograms.append(self._coarsen(latency))
+
+        self._previous = self.histogram.copy()
+        self._last_tick = now
+        self._last_counts = counts
+
+    def close(self, results, now: Optional[float] = None):
+        """
+        Close the last interval of a phase
+
+        A phase rarely ends on a tick. Its final interval, when shorter than
+        a tick, joins the previous interval of the phase instead of becoming
+        a row whose rates come from a handful of requests.
+
+        Args:
+            results: The engine's TestResult, with hot-path counters folded in
+            now: Wall-clock time the phase ended (default: now)
+        """
+        now = time.time() if now is None else now
+        duration = now - self._last_tick
+        if duration >= self.interval or len(self.series) <= self._phase_start:
+            self.tick(results, now)
+            return
+        if duration <= 0:
+            return
+
+        counts = (results.total_requests, results.failed_requests, results.bytes_received)
+        requests, failed, received = (value - before for value, before in zip(counts, self._last_counts))
+        latency = LatencyHistogram(self.histogram.precision, self.histogram.lowest, self.histogram.highest)
+
+        interval = self._intervals[-1]
+        latency.merge_dict(interval.latency)
+        latency.merge_dict(self.histogram.delta(self._previous))
+        interval.duration += duration
+        interval.requests += requests
+        interval.failed += failed
+        interval.bytes += received
+        interval.latency = latency.to_dict()
+        self.series[-1] = self._summarize([interval], round(now - self._started, 3))
+        self.interval_histograms[-1] = self._coarsen(interval.latency)
+
+        self._previous = self.histogram.copy()
+        self._last_tick = now
+        self._last_counts = counts
+
+    def rebase(self):
+        """Carry on after the engine's results and latency histogram were reset"""
+        self._previous = self.histogram.copy()
+        self._last_counts = (0, 0, 0)
+        self._phase_start = len(self.series)
+
+    def history(self, start: int = 0, end: Optional[int] = None) -> Tuple[List[Dict[str, float]], List[Dict]]:
+        """
+        Per-interval summaries and coarse histograms of part of the run
+
+        Args:
+            start: Index of the first interval
+            end: Index after the last interval (default: up to the latest)
+
+        Returns:
+            Tuple of (series, interval histograms), elapsed times counted from
+            the start of interval ``start``
+        """
+        offset = self.series[start - 1]['elapsed'] if start else 0.0
+        series = [dict(point, elapsed=round(point['elapsed'] - offset, 3)) for point in self.series[start:end]]
+        return series, self.interval_histograms[start:end]
+
+    def _coarsen(self, latency: Dict) -> Dict:
+        """Re-bin an interval's latencies at INTERVAL_PRECISION to keep the history small"""
+        if self.histogram.precision <= INTERVAL_PRECISION:
+            return latency
+
+        coarse = LatencyHistogram(INTERVAL_PRECISION, self.histogram.lowest, self.histogram.highest)
+        for index, count in latency['buckets']:
+            low, width = self.histogram._range_of(index)
+            coarse.record(low + width // 2, count)
+        coarse.total_sum = latency['sum']
+        return coarse.to_dict()
+
+    def window(self, seconds: float) -> Dict[str, float]:
+        """Summarize the most recent intervals covering ``seconds``"""
+        intervals, covered = [], 0.0
+        for interval in reversed(self._intervals):
+            if covered >= seconds - 1e-6:
+                break
+            intervals.append(interval)
+            covered += interval.duration
+        return self._summarize(intervals)
+
+    def _summarize(self, intervals: List[_Interval], elapsed: Optional[float] = None) -> Dict[str, float]:
+        """Merge intervals into rates, error rate and latency percentiles (seconds)"""
+        duration = sum(interval.duration for interval in intervals)
+        requests = sum(interval.requests for interval in intervals)
+        failed = sum(interval.failed for interval in intervals)
+        received = sum(interval.bytes for interval in intervals)
+
+        histogram = LatencyHistogram(self.histogram.precision, self.histogram.lowest, self.histogram.highest)
+        for interval in intervals:
+            histogram.merge_dict(interval.latency)
+        p50, p90, p99 = histogram.percentiles([50, 90, 99])
+
+        summary = {
+            'requests': requests,
+            'failed': failed,
+            'requests_per_second': requests / duration if duration else 0.0,
+            'bytes_per_second': received / duration if duration else 0.0,
+            'error_rate': failed / requests if requests else 0.0,
+            'avg_response_time': histogram.mean / 1e9,
+            'p50_response_time': p50 / 1e9,
+            'p90_response_time': p90 / 1e9,
+            'p99_response_time': p99 / 1e9,
+            'max_response_time': histogram.max_value / 1e9,
+        }
+        if elapsed is not None:
+            summary = dict({'elapsed': elapsed}, **summary)
+        return summary
+
+
+def condense(series: List[Dict[str, float]], rows: int = 12) -> List[Dict[str, float]]:
+    """
+    Fold a per-second series into at most ``rows`` consecutive segments
+
+    Each segment reports its start and end time, mean throughput and error
+    rate, the median of its per-second p50s and its worst per-second p99
+    and max, so spikes such as GC pauses survive the folding.
+    """
+    if not series:
+        return []
+
+    size = max(1, -(-len(series) // rows))
+    segments = []
+    for start in range(0, len(series), size):
+        chunk = series[start:start + size]
+        requests = sum(point['requests'] for point in chunk)
+        medians = sorted(point['p50_response_time'] for point in chunk)
+        previous = series[start - 1]['elapsed'] if start else 0.0
+        segments.append({
+            'start': previous,
+            'end': chunk[-1]['elapsed'],
+            'requests_per_second': requests / max(chunk[-1]['elapsed'] - previous, 1e-9),
+            'error_rate': sum(point['failed'] for point in chunk) / requests if requests else 0.0,
+            'p50_response_time': medians[len(medians) // 2],
+            'p99_response_time': max(point['p99_response_time'] for point in chunk),
+            'max_response_time': max(point['max_response_time'] for point in chunk),
+        })
+    return segments
@@ -0,0 +1,140 @@
+"""
+BSB Havoc Tracing - Per-Phase Request Latency
+🔬 Splits every request into DNS, connect, pool wait, TTFB and body time
+"""
+
+import time
+from typing import Dict, Tuple
+
+import aiohttp
+
+from .histogram import LatencyHistogram, DEFAULT_PRECISION
+
+# Request phases, in the order they happen
+PHASES = ('dns', 'pool_wait', 'connect', 'acquire', 'ttfb', 'body')
+
+PHASE_LABELS = {
+    'dns': 'DNS Resolution',
+    'pool_wait': 'Pool Wait',
+    'connect': 'Connect + TLS',
+    'acquire': 'Connection Acquisition',
+    'ttfb': 'Time To First Byte',
+    'body': 'Body Transfer',
+}
+
+_clock = time.perf_counter_ns
+
+
+class PhaseTracer:
+    """🔬 Records a latency histogram per request phase from aiohttp trace hooks
+
+    ``dns``, ``pool_wait`` and ``connect`` are only recorded when they
+    happen (a cache miss, a full pool, a new connection). ``acquire``
+    covers everything between the request starting and a connection
+    being ready. ``ttfb`` and ``body`` are recorded for every response.
+    aiohttp performs the TCP and TLS handshakes in one step, so
+    ``connect`` covers both.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION):
+        """
+        Initialize the tracer
+
+        Args:
+            precision: Significant digits kept by each phase histogram
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {
+            phase: LatencyHistogram(precision) for phase in PHASES
+        }
+
+        config = aiohttp.TraceConfig()
+        config.on_request_start.append(self._on_request_start)
+        config.on_connection_queued_start.append(self._on_queued_start)
+        config.on_connection_queued_end.append(self._on_queued_end)
+        config.on_connection_create_start.append(self._on_create_start)
+        config.on_connection_create_end.append(self._on_connection_ready)
+        config.on_connection_reuseconn.append(self._on_connection_ready)
+        config.on_dns_resolvehost_start.append(self._on_dns_start)
+        config.on_dns_resolvehost_end.append(self._on_dns_end)
+        config.on_request_headers_sent.append(self._on_headers_sent)
+        config.on_request_end.append(self._on_request_end)
+        self.trace_config = config
+
+    # Hooks only stamp the per-request context; histograms are updated
+    # once per request in _on_request_end to keep the hot path short.
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.start = _clock()
+        ctx.dns = ctx.connect = ctx.queued = 0
+        ctx.ready = ctx.sent = 0
+
+    async def _on_queued_start(self, session, ctx, params):
+        ctx.queued = _clock()
+
+    async def _on_queued_end(self, session, ctx, params):
+        self.histograms['pool_wait'].record(_clock() - ctx.queued)
+
+    async def _on_create_start(self, session, ctx, params):
+        ctx.connect = _clock()
+
+    async def _on_dns_start(self, session, ctx, params):
+        ctx.dns = _clock()
+
+    async def _on_dns_end(self, session, ctx, params):
+        ctx.dns = _clock() - ctx.dns
+
+    async def _on_connection_ready(self, session, ctx, params):
+        ctx.ready = _clock()
+        if ctx.connect:
+            # DNS resolution happens inside connection creation
+            self.histograms['connect'].record(ctx.ready - ctx.connect - ctx.dns)
+            if ctx.dns:
+                self.histograms['dns'].record(ctx.dns)
+            ctx.connect = ctx.dns = 0
+
+    async def _on_headers_sent(self, session, ctx, params):
+        ctx.sent = _clock()
+
+    async def _on_request_end(self, session, ctx, params):
+        if ctx.ready:
+            self.histograms['acquire'].record(ctx.ready - ctx.start)
+        if ctx.sent:
+            self.histograms['ttfb'].record(_clock() - ctx.sent)
+
+    def record_body(self, duration: int):
+        """Record the time spent reading a response body, in nanoseconds"""
+        self.histograms['body'].record(duration)
+
+    def totals(self) -> Dict[str, Tuple[int, int]]:
+        """Return ``(count, sum_ns)`` per phase, for interval averages"""
+        return {phase: (h.total_count, h.total_sum) for phase, h in self.histograms.items()}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarize each recorded phase in seconds"""
+        summary = {}
+        for phase, histogram in self.histograms.items():
+            if not histogram.total_count:
+                continue
+            p50, p90, p99 = histogram.percentiles([50, 90, 99])
+            summary[phase] = {
+                'count': histogram.total_count,
+                'avg': histogram.mean / 1e9,
+                'p50': p50 / 1e9,
+                'p90': p90 / 1e9,
+                'p99': p99 / 1e9,
+                'max': histogram.max_value / 1e9,
+            }
+        return summary
+
+    def drain(self) -> Dict[str, Dict]:
+        """Serialize and reset every phase histogram"""
+        drained = {}
+        for phase, histogram in self.histograms.items():
+            drained[phase] = histogram.to_dict()
+            histogram.reset()
+        return drained
+
+    def merge(self, drained: Dict[str, Dict]):
+        """Merge phase histograms produced by ``drain`` on another tracer"""
+        for phase, data in drained.items():
+            self.histograms[phase].merge_dict(data)
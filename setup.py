@@ -51,6 +51,9 @@ setup(
         "colorama>=0.4.6",
         "asyncio>=3.4.3",
     ],
+    extras_require={
+        "report": ["numpy>=1.17"],
+    },
     entry_points={
         "console_scripts": [
             "bsb-havoc=bsb_havoc.cli:main",
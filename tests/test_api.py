@@ -0,0 +1,119 @@
+"""
+Tests for the embeddable Python API
+"""
+
+import asyncio
+import signal
+import socket
+
+import pytest
+from aiohttp import web
+
+from bsb_havoc import LoadTest, Snapshot, run_load_test
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def against_target(body):
+    """Run ``body(url)`` with a loopback target up"""
+    async def hello(request):
+        return web.Response(text='ok')
+
+    async def check():
+        app = web.Application()
+        app.router.add_get('/', hello)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        port = free_port()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+        try:
+            return await body(f'http://127.0.0.1:{port}/')
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(check())
+
+
+def test_snapshots_stream_without_side_effects(capsys):
+    handler = signal.getsignal(signal.SIGINT)
+
+    async def body(url):
+        seen = []
+        async with LoadTest(url, concurrency=4, duration=0.5, interval=0.1) as test:
+            async for snapshot in test:
+                seen.append(snapshot)
+        return test, seen
+
+    test, seen = against_target(body)
+    assert len(seen) >= 3
+    assert all(isinstance(snapshot, Snapshot) and snapshot.phase == 'steady' for snapshot in seen)
+    assert seen == test.snapshots
+    assert seen[-1].total_requests <= test.result.total_requests
+    assert test.result.failed_requests == 0
+    assert capsys.readouterr().out == ''
+    assert signal.getsignal(signal.SIGINT) is handler
+
+
+def test_stop_condition_ends_the_test():
+    async def body(url):
+        async with LoadTest(url, concurrency=4, interval=0.05,
+                            stop_when=lambda snapshot: snapshot.total_requests >= 50) as test:
+            return test, await test.wait()
+
+    test, result = against_target(body)
+    assert test.snapshots[-1].total_requests >= 50
+    assert all(snapshot.total_requests < 50 for snapshot in test.snapshots[:-1])
+    assert result is test.result and result.total_requests >= 50
+
+
+def test_leaving_the_block_stops_the_load():
+    async def body(url):
+        async with LoadTest(url, concurrency=4, interval=0.05) as test:
+            await asyncio.sleep(0.3)
+        return test
+
+    result = against_target(body).result
+    assert result.total_requests > 0
+    assert result.total_time < 1
+
+
+def test_run_load_test_with_callback():
+    calls = []
+
+    async def collect(snapshot):
+        calls.append(snapshot.elapsed)
+
+    async def body(url):
+        return await run_load_test(url, concurrency=2, max_requests=25, interval=0.05, on_snapshot=collect)
+
+    result = against_target(body)
+    assert result.total_requests == 25
+    assert calls == sorted(calls)
+
+
+def test_tests_run_side_by_side():
+    async def body(url):
+        return await asyncio.gather(run_load_test(url, concurrency=2, max_requests=20, interval=0.05),
+                                    run_load_test(url, concurrency=3, max_requests=30, interval=0.05))
+
+    first, second = against_target(body)
+    assert (first.total_requests, second.total_requests) == (20, 30)
+
+
+def test_misuse_is_rejected():
+    async def check():
+        with pytest.raises(ValueError):
+            await run_load_test('http://127.0.0.1:9/')
+        test = LoadTest('http://127.0.0.1:9/')
+        with pytest.raises(RuntimeError):
+            await test.__anext__()
+        with pytest.raises(RuntimeError):
+            await test.wait()
+
+    asyncio.run(check())
+    with pytest.raises(ValueError):
+        LoadTest('http://127.0.0.1:9/', interval=0)
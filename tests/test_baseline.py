@@ -0,0 +1,141 @@
+"""
+Tests for stored runs and their statistical comparison
+"""
+
+import random
+
+import pytest
+
+from bsb_havoc import baseline
+from bsb_havoc.histogram import LatencyHistogram
+
+
+def synthetic_run(name, latency_ms=10.0, rps=1000, error_rate=0.0, seconds=30, jitter=0.1, seed=1,
+                  history=True):
+    """Run summary whose latencies scatter log-normally around ``latency_ms``"""
+    rng = random.Random(seed)
+    whole = LatencyHistogram(2)
+    series, intervals = [], []
+    failed_total = 0
+    for second in range(seconds):
+        interval = LatencyHistogram(2)
+        requests = int(rps * rng.uniform(1 - jitter, 1 + jitter))
+        for _ in range(requests):
+            interval.record(int(latency_ms * 1e6 * rng.lognormvariate(0, 0.3)))
+        failed = sum(rng.random() < error_rate for _ in range(requests))
+        failed_total += failed
+        whole.merge(interval)
+        series.append({'elapsed': second + 1.0, 'requests': requests, 'failed': failed})
+        intervals.append(interval.to_dict())
+
+    return {
+        'format': baseline.SUMMARY_FORMAT,
+        'name': name,
+        'created': f"2026-01-01T00:00:{seconds:02d}",
+        'target_url': 'http://127.0.0.1/',
+        'result': {
+            'total_time': float(seconds),
+            'total_requests': whole.total_count,
+            'failed_requests': failed_total,
+            'requests_per_second': whole.total_count / seconds,
+            'p99_response_time': whole.percentile(99) / 1e9,
+            'timeseries': series if history else [],
+        },
+        'histogram': whole.to_dict(),
+        'intervals': intervals if history else [],
+    }
+
+
+def rows(report):
+    return {row['metric']: row for row in report['rows']}
+
+
+def compare(reference, candidate, **options):
+    return baseline.compare(reference, candidate, resamples=200, **options)
+
+
+def test_same_build_is_unchanged():
+    report = compare(synthetic_run('a', seed=1), synthetic_run('b', seed=2))
+    assert report['verdict'] == 'unchanged'
+    assert report['resamples'] == 200
+    for row in report['rows']:
+        assert row['low'] <= row['high']
+
+
+def test_slower_build_regressed():
+    report = compare(synthetic_run('a'), synthetic_run('b', latency_ms=15.0, seed=2))
+    assert report['verdict'] == 'regressed'
+    metrics = rows(report)
+    for metric in ('p50', 'p90', 'p99', 'mean'):
+        assert metrics[metric]['verdict'] == 'regressed'
+        assert metrics[metric]['change'] == pytest.approx(0.5, abs=0.1)
+        assert metrics[metric]['low'] > 0
+    assert metrics['rps']['verdict'] == 'unchanged'
+
+
+def test_faster_build_improved():
+    report = compare(synthetic_run('a', latency_ms=20.0), synthetic_run('b', latency_ms=10.0, rps=1500, seed=2))
+    metrics = rows(report)
+    assert report['verdict'] == 'improved'
+    assert metrics['p50']['verdict'] == 'improved'
+    assert metrics['rps']['verdict'] == 'improved'
+
+
+def test_lower_throughput_regressed():
+    report = compare(synthetic_run('a', rps=1000), synthetic_run('b', rps=700, seed=2))
+    assert rows(report)['rps']['verdict'] == 'regressed'
+    assert report['verdict'] == 'regressed'
+
+
+def test_error_rate_compared_in_points():
+    report = compare(synthetic_run('a'), synthetic_run('b', error_rate=0.02, seed=2))
+    error_rate = rows(report)['error_rate']
+    assert error_rate['verdict'] == 'regressed'
+    assert error_rate['change'] == pytest.approx(0.02, abs=0.005)
+
+
+def test_change_within_tolerance_is_unchanged():
+    report = compare(synthetic_run('a'), synthetic_run('b', latency_ms=10.3, seed=2), tolerance=0.2)
+    assert report['verdict'] == 'unchanged'
+
+
+def test_noisy_change_needs_a_significant_interval():
+    # Throughput swings wildly from second to second: a large point change alone is not a verdict
+    reference = synthetic_run('a', rps=20, jitter=0.9, seconds=8)
+    candidate = synthetic_run('b', latency_ms=11.0, rps=20, jitter=0.9, seconds=8, seed=5)
+    report = compare(reference, candidate, tolerance=0.05)
+    rps = rows(report)['rps']
+    assert rps['change'] > 0.05
+    assert rps['low'] < 0 < rps['high']
+    assert rps['verdict'] == 'unchanged'
+    for row in report['rows']:
+        if row['verdict'] != 'unchanged':
+            assert row['low'] > 0 or row['high'] < 0
+
+
+def test_without_history_only_tolerance_applies():
+    report = compare(synthetic_run('a', history=False), synthetic_run('b', latency_ms=15.0, seed=2, history=False))
+    assert report['resamples'] == 0
+    assert report['verdict'] == 'regressed'
+    assert rows(report)['p50']['low'] is None
+
+
+def test_comparison_is_reproducible():
+    reference, candidate = synthetic_run('a'), synthetic_run('b', latency_ms=11.0, seed=2)
+    assert compare(reference, candidate) == compare(reference, candidate)
+
+
+def test_save_load_and_list(tmp_path):
+    directory = str(tmp_path / 'results')
+    assert baseline.list_runs(directory) == []
+
+    path = baseline.save(synthetic_run('main', seconds=3), directory)
+    baseline.save(synthetic_run('feature.1', seconds=5), directory)
+    assert baseline.load('main', directory)['name'] == 'main'
+    assert baseline.load(path)['name'] == 'main'
+    assert [run['name'] for run in baseline.list_runs(directory)] == ['main', 'feature.1']
+
+    with pytest.raises(ValueError):
+        baseline.save(synthetic_run('../escape', seconds=1), directory)
+    with pytest.raises(FileNotFoundError):
+        baseline.load('missing', directory)
@@ -0,0 +1,103 @@
+"""
+Tests for the CLI exit codes
+"""
+
+import asyncio
+import os
+import re
+import signal
+import socket
+
+import pytest
+
+from bsb_havoc import cli, engine
+from bsb_havoc.search import CapacitySearch, SearchStep, parse_slo
+
+
+def closed_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def run(monkeypatch, *argv):
+    # colorama's deinit would restore the stdout of an earlier test's capture
+    monkeypatch.setattr(cli, 'colorama_deinit', lambda: None)
+    monkeypatch.setattr(cli, 'colorama_init', lambda **options: None)
+    monkeypatch.setattr(cli.sys, 'argv', ['bsb-havoc', *argv])
+    return asyncio.run(cli.BSBHavocCLI().run())
+
+
+def plain(output):
+    return re.sub(r'\x1b\[[0-9;]*m', '', output)
+
+
+def test_thresholds_passed(capsys):
+    result = engine.TestResult(total_requests=100, successful_requests=100, p95_response_time=0.1)
+    assert cli.BSBHavocCLI().check_thresholds(parse_slo("p95<300ms,errors<1%"), result) == cli.EXIT_PASSED
+    assert "THRESHOLDS PASSED" in capsys.readouterr().out
+
+
+def test_thresholds_failed(capsys):
+    result = engine.TestResult(total_requests=100, successful_requests=95, failed_requests=5, p95_response_time=0.5)
+    assert cli.BSBHavocCLI().check_thresholds(parse_slo("p95<300ms,errors<1%"), result) == cli.EXIT_THRESHOLDS_FAILED
+    output = capsys.readouterr().out
+    assert "p95 500ms > 300ms" in output
+    assert "errors 5.00% > 1.00%" in output
+
+
+@pytest.mark.parametrize('argv', [
+    [],
+    ['search'],
+    ['search', '--slo', 'p98<10ms', 'http://127.0.0.1:9/'],
+    ['report'],
+    ['report', 'missing-record-file.bin'],
+    ['compare', 'only-one-run'],
+    ['bench', '--cases', 'no-such-case'],
+])
+def test_errors_exit_with_error_status(monkeypatch, argv):
+    assert run(monkeypatch, *argv) == cli.EXIT_ERROR
+
+
+@pytest.mark.parametrize('command', ['', 'search', 'bench', 'agent', 'compare', 'report'])
+def test_help_exits_cleanly(monkeypatch, command):
+    assert run(monkeypatch, *filter(None, [command, '--help'])) == cli.EXIT_PASSED
+
+
+def test_thresholds_fail_when_nothing_succeeds(monkeypatch, capsys):
+    # Every request to a closed port fails, so no latency was measured at all
+    status = run(monkeypatch, '--headless', '-d', '1', '-c', '5', '--threshold', 'p95<300ms',
+                 f'http://127.0.0.1:{closed_port()}/')
+    assert status == cli.EXIT_THRESHOLDS_FAILED
+    output = plain(capsys.readouterr().out)
+    assert "THRESHOLDS FAILED" in output
+    assert "no successful requests" in output
+
+
+def test_report_without_requests(monkeypatch, capsys):
+    assert run(monkeypatch, '--headless', '-n', '0', f'http://127.0.0.1:{closed_port()}/') == cli.EXIT_PASSED
+    output = plain(capsys.readouterr().out)
+    assert "Successful Requests: 0 (0.0%)" in output
+    assert "Failed Requests: 0 (0.0%)" in output
+
+
+def test_interrupted_search_prints_the_partial_curve(monkeypatch, capsys):
+    measured = []
+
+    async def measure(self, level):
+        measured.append(level)
+        if len(measured) == 3:
+            os.kill(os.getpid(), signal.SIGINT)
+        return SearchStep(level, engine.TestResult(total_requests=100, successful_requests=100,
+                                                   requests_per_second=level, p99_response_time=0.01), [])
+
+    monkeypatch.setattr(CapacitySearch, '_measure', measure)
+    handler = signal.getsignal(signal.SIGINT)
+    status = run(monkeypatch, 'search', '--slo', 'p99<100ms', '--start', '10', '--max', '10000',
+                 f'http://127.0.0.1:{closed_port()}/')
+    assert status == cli.EXIT_PASSED
+    assert measured == [10, 20, 40]
+    output = plain(capsys.readouterr().out)
+    assert "THROUGHPUT / LATENCY CURVE" in output
+    assert "Search stopped early" in output
+    assert signal.getsignal(signal.SIGINT) is handler
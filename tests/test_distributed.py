@@ -0,0 +1,88 @@
+"""
+Tests for the controller/agent mode over loopback TCP
+"""
+
+import asyncio
+import socket
+
+import pytest
+from aiohttp import web
+
+from bsb_havoc.distributed import DistributedHavocEngine, HavocAgent, decode_options, encode_options, parse_address
+from bsb_havoc.payloads import PayloadPool
+from bsb_havoc.scenario import Scenario
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_parse_address():
+    assert parse_address('10.0.0.5:9600') == ('10.0.0.5', 9600)
+    assert parse_address('10.0.0.5') == ('10.0.0.5', 9500)
+    assert parse_address(':9600') == ('127.0.0.1', 9600)
+    with pytest.raises(ValueError):
+        parse_address('host:port')
+
+
+def test_options_survive_the_wire():
+    scenario = Scenario({'base_url': 'http://127.0.0.1:9', 'requests': [{'name': 'home', 'path': '/'}]})
+    options = decode_options(encode_options({'scenario': scenario, 'rate': 50.0, 'headless': True,
+                                             'payload': PayloadPool.from_template('{{seq}}')}))
+    assert options['rate'] == 50.0
+    assert 'headless' not in options
+    assert options['scenario'].spec == scenario.spec
+    assert options['payload'].template == '{{seq}}'
+
+
+def test_agents_merge_into_one_result():
+    received = []
+
+    async def echo(request):
+        received.append(await request.read())
+        return web.Response(text='ok')
+
+    async def check():
+        app = web.Application()
+        app.router.add_post('/', echo)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        port = free_port()
+        await web.TCPSite(runner, '127.0.0.1', port).start()
+
+        agents = [HavocAgent(port=free_port(), once=True, verbose=False) for _ in range(2)]
+        serving = [asyncio.ensure_future(agent.serve()) for agent in agents]
+        await asyncio.sleep(0.1)
+
+        engine = DistributedHavocEngine(f'http://127.0.0.1:{port}/', 4, [f'127.0.0.1:{agent.port}' for agent in agents],
+                                        handle_signals=False, headless=True, max_requests=40, method='POST',
+                                        payload=PayloadPool.from_template('{{seq}}'))
+        try:
+            result = await engine.run_window(1.0)
+            # Agents started with once exit after their test
+            await asyncio.wait_for(asyncio.gather(*serving), timeout=5)
+        finally:
+            await runner.cleanup()
+        return engine, result
+
+    engine, result = asyncio.run(check())
+    assert result.total_requests == result.successful_requests == 40
+    assert result.status_codes == {200: 40}
+    assert engine.histogram.total_count == 40
+    assert engine.lost_agents == []
+    assert sorted(int(body) for body in received) == list(range(1, 41))
+
+
+def test_unreachable_agent():
+    async def check():
+        engine = DistributedHavocEngine('http://127.0.0.1:9/', 4, [f'127.0.0.1:{free_port()}'],
+                                        handle_signals=False, headless=True)
+        await engine.run_window(0.5)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(check())
+
+    with pytest.raises(ValueError):
+        DistributedHavocEngine('http://127.0.0.1:9/', 1, ['127.0.0.1:1', '127.0.0.1:2'], handle_signals=False)
@@ -0,0 +1,166 @@
+"""
+Tests for the load engine against a loopback target
+"""
+
+import asyncio
+import re
+import socket
+
+from aiohttp import web
+
+from bsb_havoc.engine import HavocEngine
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def plain(output):
+    return re.sub(r'\x1b\[[0-9;]*m', '', output)
+
+
+async def serve(handler=None):
+    async def hello(request):
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_route('*', '/', handler or hello)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = free_port()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner, f'http://127.0.0.1:{port}/'
+
+
+def run(duration=0.5, handler=None, **options):
+    """Run a headless engine through its phases and return it"""
+    async def check():
+        runner, url = await serve(handler)
+        engine = HavocEngine(url, options.pop('max_concurrent', 4), handle_signals=False, headless=True, **options)
+        try:
+            async for _ in engine.snapshots(duration=duration, interval=0.1):
+                pass
+        finally:
+            await runner.cleanup()
+        return engine
+
+    return asyncio.run(check())
+
+
+def test_connections_reported_for_phased_runs(capsys):
+    # Keep-alive connections open during warmup and are only reused afterwards
+    engine = run(warmup=0.3, drain=0.2)
+    results = engine.results
+    assert set(results.load_phases) == {'warmup', 'steady', 'drain'}
+    assert results.connections_opened == 4
+    assert results.connections_reused > results.total_requests
+    assert results.connections_closed <= results.connections_opened
+
+    engine._display_final_results()
+    output = plain(capsys.readouterr().out)
+    assert "CONNECTIONS (KEEPALIVE)" in output
+    assert "Opened: 4" in output
+
+
+def test_open_loop_holds_the_arrival_rate():
+    results = run(duration=1.0, rate=200, max_concurrent=20).results
+    assert results.target_rate == 200
+    assert 150 <= results.total_requests <= 230
+    assert results.late_requests == 0
+
+
+def test_open_loop_counts_queueing_behind_a_slow_server():
+    async def slow(request):
+        await asyncio.sleep(0.1)
+        return web.Response(text='ok')
+
+    # Two workers serve 20 req/s of the 100 req/s schedule, so sends fall further behind
+    results = run(duration=1.0, handler=slow, rate=100, max_concurrent=2).results
+    assert results.late_requests > 5
+    assert results.max_schedule_lag > 0.3
+    # Latency counts from the intended send time, not from when a worker got round to it
+    assert results.max_response_time > 0.4
+    assert results.median_response_time > 0.15
+
+
+def test_close_mode_opens_a_connection_per_request():
+    results = run(duration=5.0, connection_mode='close', max_requests=40).results
+    assert results.total_requests == 40
+    assert results.connections_opened == 40
+    assert results.connections_reused == 0
+
+
+def test_pool_size_caps_connections():
+    results = run(duration=5.0, max_concurrent=8, pool_size=2, max_requests=100).results
+    assert results.total_requests == 100
+    assert results.connections_opened == 2
+    assert results.connections_reused == 98
+
+
+def test_connections_retire_after_max_requests():
+    results = run(duration=5.0, max_concurrent=1, max_conn_requests=5, max_requests=20).results
+    assert results.connections_opened == 4
+    assert results.connections_reused == 16
+
+
+def test_connector_settings():
+    async def check(**options):
+        engine = HavocEngine('http://127.0.0.1:9/', 4, handle_signals=False, **options)
+        await engine._create_session()
+        connector = engine.session.connector
+        await engine.session.close()
+        return connector
+
+    cached = asyncio.run(check(dns_cache_ttl=30, pool_size=3, keepalive_timeout=7))
+    assert cached.use_dns_cache and cached.limit == 4 and cached.limit_per_host == 3
+    assert not cached.force_close
+    assert not asyncio.run(check(dns_cache_ttl=0)).use_dns_cache
+    assert asyncio.run(check(connection_mode='close')).force_close
+
+
+def test_trace_phases_split_the_latency(capsys):
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return web.Response(text='ok')
+
+    engine = run(duration=5.0, handler=slow, max_concurrent=2, trace_phases=True, max_requests=20)
+    phases = engine.results.phase_latencies
+    assert phases['connect']['count'] == 2
+    for phase in ('acquire', 'ttfb', 'body'):
+        assert phases[phase]['count'] == 20
+    assert 0.05 <= phases['ttfb']['p50'] < 0.1
+    assert phases['acquire']['p50'] < 0.05
+    assert phases['ttfb']['p50'] <= engine.results.median_response_time
+
+    engine._display_final_results()
+    assert "Time To First Byte" in plain(capsys.readouterr().out)
+
+
+async def chunked(request):
+    """64 KiB body sent in 4 KiB chunks"""
+    response = web.StreamResponse()
+    await response.prepare(request)
+    for _ in range(16):
+        await response.write(b'x' * 4096)
+        await asyncio.sleep(0.001)
+    await response.write_eof()
+    return response
+
+
+def test_body_bytes_are_counted():
+    buffered = run(duration=5.0, handler=chunked, max_requests=20).results
+    streamed = run(duration=5.0, handler=chunked, max_requests=20, stream_body=True).results
+    for results in (buffered, streamed):
+        assert results.total_requests == results.successful_requests == 20
+        assert results.bytes_received == 20 * 65536
+    assert streamed.connections_opened == 4
+
+
+def test_max_body_bytes_abandons_the_rest():
+    results = run(duration=5.0, handler=chunked, max_requests=20, max_body_bytes=1000).results
+    assert results.successful_requests == 20
+    assert 20 * 1000 <= results.bytes_received <= 20 * 16384
+    # A connection left in the middle of a body cannot be reused
+    assert results.connections_opened == 20
@@ -0,0 +1,101 @@
+"""
+Tests for the request failure classes
+"""
+
+import asyncio
+import errno
+import socket
+import ssl
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from bsb_havoc import errors
+from bsb_havoc.engine import HavocEngine
+
+CONNECTION_KEY = SimpleNamespace(host='127.0.0.1', port=9, ssl=None)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize('error, code', [
+    (errors.PoolTimeoutError(), errors.ERROR_POOL_EXHAUSTED),
+    (errors.ConnectTimeoutError(), errors.ERROR_CONNECT_TIMEOUT),
+    (asyncio.TimeoutError(), errors.ERROR_READ_TIMEOUT),
+    (ssl.SSLError(), errors.ERROR_TLS),
+    (socket.gaierror(), errors.ERROR_DNS),
+    (ConnectionRefusedError(), errors.ERROR_CONNECT_REFUSED),
+    (aiohttp.ClientConnectorError(CONNECTION_KEY, ConnectionRefusedError(errno.ECONNREFUSED, 'refused')),
+     errors.ERROR_CONNECT_REFUSED),
+    (aiohttp.ClientConnectorError(CONNECTION_KEY, socket.gaierror(-2, 'unknown host')), errors.ERROR_DNS),
+    (aiohttp.ServerDisconnectedError(), errors.ERROR_CONNECTION_RESET),
+    (ConnectionResetError(), errors.ERROR_CONNECTION_RESET),
+    (OSError(errno.EPIPE, 'broken pipe'), errors.ERROR_CONNECTION_RESET),
+    (aiohttp.ClientConnectionError(), errors.ERROR_CONNECTION),
+    (aiohttp.ClientPayloadError(), errors.ERROR_CLIENT),
+    (OSError(errno.EHOSTUNREACH, 'unreachable'), errors.ERROR_CONNECTION),
+    (ValueError(), errors.ERROR_OTHER),
+])
+def test_classify_error(error, code):
+    assert errors.classify_error(error) == code
+
+
+def test_codes_index_their_names():
+    assert errors.ERROR_NAMES[errors.ERROR_NONE] == 'none'
+    assert errors.ERROR_NAMES[errors.ERROR_HTTP_5XX] == 'http_5xx'
+    assert errors.ERROR_NAMES[errors.ERROR_POOL_EXHAUSTED] == 'pool_exhausted'
+
+
+def run(url, handler=None, **options):
+    async def check():
+        runner = None
+        if handler:
+            app = web.Application()
+            app.router.add_get('/', handler)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, '127.0.0.1', int(url.rsplit(':', 1)[1].strip('/'))).start()
+        engine = HavocEngine(url, 2, handle_signals=False, headless=True, max_requests=10, **options)
+        try:
+            await engine.run_window(1.0)
+        finally:
+            if runner:
+                await runner.cleanup()
+        return engine.results
+
+    return asyncio.run(check())
+
+
+def test_refused_connections():
+    results = run(f'http://127.0.0.1:{free_port()}/')
+    assert results.failed_requests == results.total_requests == 10
+    assert results.error_types == {'connect_refused': 10}
+    assert results.error_latencies['connect_refused']['count'] == 10
+
+
+def test_server_errors_are_their_own_class():
+    async def broken(request):
+        await asyncio.sleep(0.02)
+        return web.Response(status=503)
+
+    results = run(f'http://127.0.0.1:{free_port()}/', broken)
+    assert results.failed_requests == 10
+    assert results.status_codes == {503: 10}
+    assert results.error_types == {'http_5xx': 10}
+    assert results.error_latencies['http_5xx']['p50'] >= 0.02
+
+
+def test_read_timeouts():
+    async def stuck(request):
+        await asyncio.sleep(0.5)
+        return web.Response(text='late')
+
+    results = run(f'http://127.0.0.1:{free_port()}/', stuck, request_timeout=0.1)
+    assert results.error_types.keys() == {'read_timeout'}
+    assert results.error_latencies['read_timeout']['p50'] == pytest.approx(0.1, abs=0.05)
@@ -0,0 +1,83 @@
+"""
+Tests for the load generator self-monitoring
+"""
+
+import asyncio
+import time
+
+from bsb_havoc.health import LAG_SATURATION, LoopProbe
+
+
+def probed(body):
+    """Run ``body`` on a probed event loop and return the probe"""
+    async def check():
+        probe = LoopProbe()
+        probe.start()
+        await body(probe)
+        await probe.stop()
+        return probe
+
+    return asyncio.run(check())
+
+
+def test_idle_loop_is_healthy():
+    async def idle(probe):
+        await asyncio.sleep(0.3)
+
+    summary = probed(idle).summary()
+    assert summary['loop_lag_p50'] < LAG_SATURATION
+    assert summary['cpu_utilization'] < 0.5
+    assert not summary['saturated']
+    assert summary['ready_queue_peak'] is not None
+
+
+def test_blocking_call_shows_as_lag():
+    lags = []
+
+    async def stall(probe):
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        lags.append(probe.interval()[0])
+        lags.append(probe.interval()[0])
+
+    summary = probed(stall).summary()
+    assert summary['loop_lag_max'] >= 0.15
+    assert lags[0] >= 0.15
+    assert lags[1] == 0
+
+
+def test_busy_loop_is_saturated():
+    async def spin(probe):
+        # Callbacks that each hold the loop for 30ms, back to back
+        deadline = time.perf_counter() + 0.6
+        while time.perf_counter() < deadline:
+            busy = time.perf_counter() + 0.03
+            while time.perf_counter() < busy:
+                pass
+            await asyncio.sleep(0)
+
+    summary = probed(spin).summary()
+    assert summary['loop_lag_p90'] >= LAG_SATURATION
+    assert summary['cpu_peak'] > 0.5
+    assert summary['saturated']
+
+
+def test_drain_and_merge():
+    async def stall(probe):
+        await asyncio.sleep(0.05)
+        time.sleep(0.1)
+        await asyncio.sleep(0.05)
+
+    shard = probed(stall)
+    samples = shard.lag.total_count
+    drained = shard.drain()
+    assert shard.summary() == {}
+
+    merged = LoopProbe()
+    merged.merge(drained)
+    merged.merge(drained)
+    assert merged.lag.total_count == 2 * samples
+    assert merged.summary()['loop_lag_max'] >= 0.08
+    assert merged.interval()[0] >= 0.08
+    assert LoopProbe().summary() == {}
@@ -0,0 +1,144 @@
+"""
+Tests for the mergeable latency histogram
+"""
+
+import json
+import math
+import random
+
+import pytest
+
+from bsb_havoc.histogram import LatencyHistogram
+
+
+def exact_percentile(values, percentile):
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percentile / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@pytest.fixture
+def values():
+    rng = random.Random(7)
+    return [int(rng.lognormvariate(16, 1.2)) for _ in range(20000)]
+
+
+def test_empty_histogram():
+    histogram = LatencyHistogram()
+    assert histogram.total_count == 0
+    assert histogram.mean == 0.0
+    assert histogram.percentiles([50, 99]) == [0, 0]
+
+
+def test_percentiles_within_precision(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    wanted = [0, 50, 90, 99, 99.9, 100]
+    for percentile, value in zip(wanted, histogram.percentiles(wanted)):
+        expected = exact_percentile(values, percentile)
+        assert abs(value - expected) <= expected / 10 ** histogram.precision + 1
+
+    assert histogram.percentile(100) == max(values)
+    assert histogram.min_value == min(values)
+    assert histogram.mean == sum(values) / len(values)
+
+
+def test_percentiles_keep_requested_order(values):
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    assert histogram.percentiles([99, 50]) == histogram.percentiles([50, 99])[::-1]
+
+
+def test_record_with_count():
+    single, counted = LatencyHistogram(), LatencyHistogram()
+    for _ in range(5):
+        single.record(1500)
+    counted.record(1500, 5)
+    assert counted.to_dict() == single.to_dict()
+
+
+def test_record_clamps_out_of_range():
+    histogram = LatencyHistogram(highest=1_000_000)
+    histogram.record(-5)
+    histogram.record(10_000_000)
+    assert histogram.min_value == 0
+    assert histogram.max_value == 10_000_000
+    assert histogram.total_count == 2
+
+
+def test_merge_equals_recording_everything(values):
+    whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for index, value in enumerate(values):
+        whole.record(value)
+        (left if index % 3 else right).record(value)
+
+    left.merge(right)
+    assert left.to_dict() == whole.to_dict()
+
+
+def test_merge_rejects_other_settings():
+    with pytest.raises(ValueError):
+        LatencyHistogram(3).merge(LatencyHistogram(2))
+    with pytest.raises(ValueError):
+        LatencyHistogram(3).merge_dict(LatencyHistogram(2).to_dict())
+
+
+def test_to_dict_round_trip(values):
+    histogram = LatencyHistogram(2)
+    for value in values:
+        histogram.record(value)
+
+    data = json.loads(json.dumps(histogram.to_dict()))
+    restored = LatencyHistogram.from_dict(data)
+    assert restored.to_dict() == histogram.to_dict()
+    assert restored.percentiles([50, 99]) == histogram.percentiles([50, 99])
+
+
+def test_merge_dict_equals_merge(values):
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in values[:100]:
+        first.record(value)
+    for value in values[100:]:
+        second.record(value)
+
+    merged = first.copy()
+    merged.merge(second)
+    first.merge_dict(second.to_dict())
+    assert first.to_dict() == merged.to_dict()
+
+
+def test_copy_is_independent():
+    histogram = LatencyHistogram()
+    histogram.record(1000)
+    clone = histogram.copy()
+    histogram.record(2000)
+    assert clone.total_count == 1
+    assert histogram.total_count == 2
+
+
+def test_delta_since_copy(values):
+    histogram = LatencyHistogram()
+    for value in values[:500]:
+        histogram.record(value)
+    previous = histogram.copy()
+    later = LatencyHistogram()
+    for value in values[500:]:
+        histogram.record(value)
+        later.record(value)
+
+    delta = histogram.delta(previous)
+    assert delta['count'] == later.total_count
+    assert delta['sum'] == later.total_sum
+    assert delta['buckets'] == later.to_dict()['buckets']
+
+
+def test_delta_after_reset_is_everything():
+    histogram = LatencyHistogram()
+    histogram.record(1000, 10)
+    previous = histogram.copy()
+    histogram.reset()
+    histogram.record(5000)
+    assert histogram.delta(previous) == histogram.to_dict()
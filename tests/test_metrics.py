@@ -0,0 +1,182 @@
+"""
+Tests for the OpenMetrics exposition across load phases
+"""
+
+import asyncio
+import socket
+
+from aiohttp import ClientSession, web
+
+from bsb_havoc import metrics
+from bsb_havoc.engine import HavocEngine
+from bsb_havoc.errors import ERROR_NONE, ERROR_READ_TIMEOUT
+from bsb_havoc.scenario import Scenario
+from bsb_havoc.timeseries import RollingMetrics
+
+# Families whose samples must never go down during a run
+COUNTER_SUFFIXES = ('_total', '_count', '_sum', '_bucket')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def samples(text):
+    """Parse exposition text into {sample with labels: value}"""
+    assert text.endswith('# EOF\n')
+    parsed = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            parsed[name] = float(value)
+    return parsed
+
+
+def counters(text):
+    return {name: value for name, value in samples(text).items()
+            if name.split('{')[0].endswith(COUNTER_SUFFIXES)}
+
+
+def assert_monotonic(before, after):
+    for name, value in before.items():
+        assert after.get(name, 0) >= value, f"{name} went from {value} to {after.get(name)}"
+
+
+def scenario():
+    return Scenario({'base_url': 'http://127.0.0.1:9', 'requests': [
+        {'name': 'home', 'path': '/'}, {'name': 'search', 'path': '/search', 'weight': 2}]})
+
+
+def test_render_totals_plus_live():
+    async def check():
+        engine = HavocEngine('http://127.0.0.1:9/', 4, handle_signals=False)
+        totals = metrics.RunTotals()
+        engine._record(True, 2_000_000, 200, 100, ERROR_NONE)
+        engine._fold_stats()
+        first = samples(metrics.render(engine, totals))
+        totals.add(engine._drain_stats())
+        engine._record(True, 3_000_000, 200, 50, ERROR_NONE)
+        engine._fold_stats()
+        second = samples(metrics.render(engine, totals))
+
+        assert first['bsb_havoc_requests_total'] == 1
+        assert second['bsb_havoc_requests_total'] == 2
+        assert second['bsb_havoc_received_bytes_total'] == 150
+        assert second['bsb_havoc_request_duration_seconds_count'] == 2
+        assert second['bsb_havoc_request_duration_seconds_sum'] == 0.005
+        assert second['bsb_havoc_responses_total{code="200"}'] == 2
+
+    asyncio.run(check())
+
+
+def test_counters_survive_phase_boundaries():
+    async def check():
+        engine = HavocEngine('http://127.0.0.1:9/', 4, handle_signals=False, scenario=scenario(),
+                             metrics_port=free_port())
+        engine.rolling = RollingMetrics(engine.histogram)
+        scrapes = []
+
+        def scrape():
+            engine._collect_connection_stats()
+            engine._fold_stats()
+            scrapes.append(counters(metrics.render(engine, engine.metrics_server.totals)))
+
+        for phase in range(3):
+            for index in range(50):
+                engine._record(index % 10 != 0, 1_000_000 * (index + 1), 200 if index % 10 else None, 10,
+                               ERROR_NONE if index % 10 else ERROR_READ_TIMEOUT, index % 2)
+                if index % 20 == 0:
+                    scrape()
+            scrape()
+            engine._close_phase()
+            scrape()
+
+        for before, after in zip(scrapes, scrapes[1:]):
+            assert_monotonic(before, after)
+        last = scrapes[-1]
+        assert last['bsb_havoc_requests_total'] == 150
+        assert last['bsb_havoc_requests_failed_total'] == 15
+        assert last['bsb_havoc_errors_total{class="read_timeout"}'] == 15
+        assert last['bsb_havoc_request_duration_seconds_count'] == 135
+        assert last['bsb_havoc_endpoint_requests_total{endpoint="home"}'] == 75
+        assert last['bsb_havoc_event_loop_lag_seconds_count'] >= scrapes[0]['bsb_havoc_event_loop_lag_seconds_count']
+
+    asyncio.run(check())
+
+
+def test_scrapes_stay_monotonic_through_a_phased_run():
+    async def hello(request):
+        return web.Response(text='ok')
+
+    async def scrape(port):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b'GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n')
+        response = await reader.read()
+        writer.close()
+        return counters(response.split(b'\r\n\r\n', 1)[1].decode())
+
+    async def check():
+        app = web.Application()
+        app.router.add_get('/', hello)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        target_port, metrics_port = free_port(), free_port()
+        await web.TCPSite(runner, '127.0.0.1', target_port).start()
+
+        engine = HavocEngine(f'http://127.0.0.1:{target_port}/', 4, handle_signals=False, headless=True,
+                             metrics_port=metrics_port, warmup=0.4, ramp=0.4)
+        scrapes = []
+        try:
+            async for _ in engine.snapshots(duration=0.6, interval=0.1):
+                scrapes.append(await scrape(metrics_port))
+        finally:
+            await runner.cleanup()
+
+        assert len(scrapes) >= 10
+        assert set(engine.results.load_phases) == {'warmup', 'ramp', 'steady'}
+        for before, after in zip(scrapes, scrapes[1:]):
+            assert_monotonic(before, after)
+        phases = engine.results.load_phases
+        assert scrapes[-1]['bsb_havoc_requests_total'] > phases['warmup']['requests'] + phases['ramp']['requests']
+
+        # The endpoint goes away before the phases are merged into the final results
+        try:
+            await scrape(metrics_port)
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("metrics endpoint still answering after the run")
+
+    asyncio.run(check())
+
+
+def test_endpoint_serves_openmetrics():
+    async def check():
+        engine = HavocEngine('http://127.0.0.1:9/', 4, handle_signals=False, metrics_port=free_port())
+        server = engine.metrics_server
+        engine._record(True, 2_000_000, 200, 100, ERROR_NONE)
+        await server.start()
+        base = f'http://127.0.0.1:{server.port}'
+        try:
+            async with ClientSession() as session:
+                async with session.get(f'{base}/metrics') as response:
+                    assert response.status == 200
+                    assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+                    text = await response.text()
+                async with session.head(f'{base}/metrics?debug=1') as response:
+                    assert response.status == 200
+                    assert await response.read() == b''
+                async with session.get(f'{base}/favicon.ico') as response:
+                    assert response.status == 404
+                async with session.post(f'{base}/metrics') as response:
+                    assert response.status == 404
+        finally:
+            await server.stop()
+
+        assert server.scrapes == 2
+        assert '# TYPE bsb_havoc_requests counter' in text
+        assert samples(text)['bsb_havoc_requests_total'] == 1
+
+    asyncio.run(check())
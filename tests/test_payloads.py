@@ -0,0 +1,128 @@
+"""
+Tests for pre-encoded payload pools
+"""
+
+import json
+import time
+
+import pytest
+
+from bsb_havoc.payloads import PayloadPool, guess_content_type
+
+
+def test_static_template_is_one_body():
+    pool = PayloadPool.from_template('{"name":"demo"}')
+    assert pool.bodies == [b'{"name":"demo"}']
+    assert pool.content_type == 'application/json'
+    assert not pool.per_request
+    assert pool.body(0) is pool.body(1)
+
+
+def test_build_variables_render_each_body():
+    pool = PayloadPool.from_template('id={{index}} token={{ uuid }} n={{random}}', size=3)
+    assert len(pool.bodies) == 3
+    assert [body.split()[0] for body in pool.bodies] == [b'id=0', b'id=1', b'id=2']
+    assert len({body.split()[1] for body in pool.bodies}) == 3
+    assert pool.content_type == 'application/octet-stream'
+
+
+def test_shared_bodies_cycle():
+    pool = PayloadPool([b'a', b'b', b'c'])
+    assert [pool.body(worker) for worker in range(7)] == [b'a', b'b', b'c', b'a', b'b', b'c', b'a']
+
+
+def test_unknown_variable_is_rejected():
+    with pytest.raises(ValueError, match='nonce'):
+        PayloadPool.from_template('{{nonce}}')
+    with pytest.raises(ValueError):
+        PayloadPool.from_template('x', size=0)
+
+
+def test_fill_rewrites_fields_in_place():
+    pool = PayloadPool.from_template('{"id":"{{uuid}}","seq":{{seq}},"ref":"r{{seq}}","at":{{timestamp}}}')
+    assert pool.per_request
+
+    first = pool.body(0)
+    length = len(first)
+    document = json.loads(bytes(first))
+    assert document['seq'] == 1
+    assert document['ref'] == 'r000000000001'
+    assert abs(document['at'] - time.time() * 1000) < 60000
+
+    second = pool.body(0)
+    assert second is first
+    assert len(second) == length
+    assert json.loads(bytes(second))['seq'] == 2
+    assert json.loads(bytes(second))['id'] == document['id']
+
+
+def test_workers_get_their_own_buffers():
+    pool = PayloadPool.from_template('seq={{seq}} worker={{index}}')
+    first, second = pool.body(0), pool.body(1)
+    assert first is not second
+    assert first == b'seq=000000000001 worker=0'
+    assert second == b'seq=000000000002 worker=1'
+
+
+def test_fill_at_an_offset():
+    pool = PayloadPool.from_template('[{{seq}}]')
+    body, fields = pool.render(0)
+    buffer = bytearray(b'HEAD' + body)
+    pool.fill(buffer, fields, base=4)
+    assert buffer == b'HEAD[           1]'
+    assert json.loads(bytes(buffer[4:])) == [1]
+
+
+def test_fields_wrap_instead_of_growing():
+    pool = PayloadPool.from_template('{{seq}}')
+    pool.sequence = 10 ** 12 - 1
+    buffer = pool.body(0)
+    assert buffer == b'000000000000'
+    assert len(buffer) == 12
+
+
+def test_from_file(tmp_path):
+    array = tmp_path / 'bodies.json'
+    array.write_text('[{"a": 1}, {"b": 2}]')
+    pool = PayloadPool.from_file(str(array))
+    assert pool.bodies == [b'{"a":1}', b'{"b":2}']
+    assert pool.content_type == 'application/json'
+
+    lines = tmp_path / 'bodies.txt'
+    lines.write_bytes(b'one\r\n\ntwo\n')
+    assert PayloadPool.from_file(str(lines)).bodies == [b'one', b'two']
+
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'\n')
+    with pytest.raises(ValueError):
+        PayloadPool.from_file(str(empty))
+
+
+def test_to_dict_round_trip():
+    pool = PayloadPool([b'\x00\xffbinary'], 'application/x-test')
+    restored = PayloadPool.from_dict(json.loads(json.dumps(pool.to_dict())))
+    assert (restored.bodies, restored.content_type, restored.template) == (pool.bodies, pool.content_type, None)
+
+    template = PayloadPool.from_template('{{seq}}', content_type='text/plain')
+    assert PayloadPool.from_dict(template.to_dict()).template == '{{seq}}'
+
+
+def test_guess_content_type():
+    assert guess_content_type(b'  [1, 2]') == 'application/json'
+    assert guess_content_type(b'a=1') == 'application/octet-stream'
+
+
+def test_interleaved_pools_share_the_sequence():
+    pool = PayloadPool.from_template('{{seq}}')
+    shards = [pool.interleave(index, 3) for index in range(3)]
+    sent = [int(shard.body(0)) for shard in shards for _ in range(4)]
+    assert sorted(sent) == list(range(1, 13))
+
+    # Agents that shard their own slice again keep the values apart
+    agents = [pool.interleave(index, 2) for index in range(2)]
+    nested = [agent.interleave(index, 3) for agent in agents for index in range(3)]
+    sent = [int(shard.body(0)) for shard in nested for _ in range(5)]
+    assert sorted(sent) == list(range(1, 31))
+
+    restored = PayloadPool.from_dict(json.loads(json.dumps(pool.interleave(1, 3).to_dict())))
+    assert [int(restored.body(0)) for _ in range(2)] == [2, 5]
@@ -0,0 +1,213 @@
+"""
+Tests for the raw HTTP/1.1 response parser
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from bsb_havoc.rawhttp import RawConnection, RawHTTPError, RawRequest
+
+ORIGIN = ('http', '127.0.0.1', 80)
+
+
+class FakeTransport:
+    def __init__(self):
+        self.written = []
+        self.closed = False
+        self.aborted = False
+
+    def write(self, data):
+        self.written.append(data)
+
+    def writelines(self, lines):
+        self.written.extend(lines)
+
+    def close(self):
+        self.closed = True
+
+    def abort(self):
+        self.aborted = True
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def connect(loop, max_body_bytes=0):
+    client = SimpleNamespace(loop=loop, max_body_bytes=max_body_bytes, max_conn_requests=0,
+                             max_conn_age_ns=0, opened=0, reused=0, closed=0)
+    connection = RawConnection(client)
+    transport = FakeTransport()
+    connection.connection_made(transport)
+    return connection, transport
+
+
+def send(connection, is_head=False):
+    method = b'HEAD' if is_head else b'GET'
+    return connection.send(RawRequest(ORIGIN, method + b' / HTTP/1.1\r\nHost: x\r\n\r\n', is_head))
+
+
+def feed(connection, data, step=None):
+    """Deliver ``data`` at once, or in reads of ``step`` bytes"""
+    step = step or len(data)
+    for start in range(0, len(data), step):
+        connection.data_received(data[start:start + step])
+
+
+def outcome(future):
+    status, headers_ns, body_size = future.result()
+    assert headers_ns > 0
+    return status, body_size
+
+
+@pytest.mark.parametrize('step', [None, 1, 7])
+def test_content_length(loop, step):
+    connection, transport = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 11\r\n\r\nhello world', step)
+    assert outcome(future) == (200, 11)
+    assert connection.usable
+    assert not transport.closed
+
+
+@pytest.mark.parametrize('step', [None, 1, 5])
+def test_chunked(loop, step):
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n'
+                     b'5;ext=1\r\nhello\r\n6\r\n world\r\n0\r\nX-Trailer: yes\r\n\r\n', step)
+    assert outcome(future) == (200, 11)
+    assert connection.usable
+
+
+def test_chunked_only_as_final_coding(loop):
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nTransfer-Encoding: gzip, Chunked\r\n\r\n3\r\nabc\r\n0\r\n\r\n')
+    assert outcome(future) == (200, 3)
+
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked, gzip\r\n\r\nraw bytes')
+    assert not future.done()
+    connection.connection_lost(None)
+    assert outcome(future) == (200, 9)
+
+
+def test_chunked_mentioned_elsewhere_is_ignored(loop):
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nSet-Cookie: mode=chunked\r\nContent-Length: 2\r\n\r\nok')
+    assert outcome(future) == (200, 2)
+
+
+def test_close_delimited(loop):
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.0 200 OK\r\n\r\nsome ', 4)
+    feed(connection, b'more data')
+    assert not future.done()
+    assert connection.retiring
+
+    connection.connection_lost(None)
+    assert outcome(future) == (200, 14)
+
+
+@pytest.mark.parametrize('value', [b'close', b'Close', b'keep-alive, close', b'  keep-alive ,  close  '])
+def test_connection_close_retires(loop, value):
+    connection, transport = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nConnection:' + value + b'\r\nContent-Length: 0\r\n\r\n')
+    assert outcome(future) == (200, 0)
+    assert connection.retiring
+    assert transport.closed
+
+
+def test_keep_alive_does_not_retire(loop):
+    connection, _ = connect(loop)
+    send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nConnection: keep-alive\r\nX-Close: close\r\nContent-Length: 0\r\n\r\n')
+    assert connection.usable
+
+
+def test_interim_responses_are_skipped(loop):
+    connection, _ = connect(loop)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 103 Early Hints\r\nLink: </a.css>\r\n\r\n')
+    assert not future.done()
+    feed(connection, b'HTTP/1.1 201 Created\r\nContent-Length: 2\r\n\r\nok')
+    assert outcome(future) == (201, 2)
+
+
+@pytest.mark.parametrize('status', [204, 304])
+def test_bodiless_statuses(loop, status):
+    connection, _ = connect(loop)
+    first, second = send(connection), send(connection)
+    feed(connection, b'HTTP/1.1 %d X\r\nContent-Length: 50\r\n\r\n' % status +
+         b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\nx')
+    assert outcome(first) == (status, 0)
+    assert outcome(second) == (200, 1)
+
+
+def test_head_response_has_no_body(loop):
+    connection, _ = connect(loop)
+    head, get = send(connection, is_head=True), send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 5000\r\n\r\n'
+                     b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n1\r\nx\r\n0\r\n\r\n')
+    assert outcome(head) == (200, 0)
+    assert outcome(get) == (200, 1)
+
+
+def test_pipelined_responses_resolve_in_order(loop):
+    connection, transport = connect(loop)
+    futures = [send(connection) for _ in range(3)]
+    assert len(transport.written) == 3
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 1\r\n\r\na'
+                     b'HTTP/1.1 404 Not Found\r\nContent-Length: 2\r\n\r\nbb'
+                     b'HTTP/1.1 500 Error\r\nContent-Length: 0\r\n\r\n', 3)
+    assert [outcome(future) for future in futures] == [(200, 1), (404, 2), (500, 0)]
+    assert connection.client.reused == 2
+
+
+def test_malformed_status_line_aborts(loop):
+    connection, transport = connect(loop)
+    future = send(connection)
+    feed(connection, b'SPDY/3 200 OK\r\n\r\n')
+    assert isinstance(future.exception(), RawHTTPError)
+    assert transport.aborted
+
+
+def test_unsolicited_data_aborts(loop):
+    connection, transport = connect(loop)
+    send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\nextra')
+    assert transport.aborted
+
+
+def test_max_body_drops_a_lone_request(loop):
+    connection, transport = connect(loop, max_body_bytes=4)
+    future = send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n' + b'x' * 10, 5)
+    assert outcome(future)[0] == 200
+    assert 4 <= outcome(future)[1] < 100
+    assert transport.aborted
+
+
+def test_max_body_keeps_pipelined_requests(loop):
+    connection, transport = connect(loop, max_body_bytes=4)
+    first, second = send(connection), send(connection)
+    feed(connection, b'HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n' +
+         b'20\r\n' + b'x' * 32 + b'\r\n0\r\n\r\n', 6)
+    assert first.done()
+    assert 4 <= outcome(first)[1] < 32
+    assert not second.done()
+
+    feed(connection, b'HTTP/1.1 200 OK\r\nContent-Length: 3\r\n\r\nabc')
+    assert outcome(second) == (200, 3)
+    assert not transport.aborted
+    assert connection.usable
@@ -0,0 +1,123 @@
+"""
+Tests for the per-request result recorder
+"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from bsb_havoc import recorder
+from bsb_havoc.engine import HavocEngine
+from bsb_havoc.errors import ERROR_HTTP_5XX, ERROR_NONE, ERROR_READ_TIMEOUT
+from bsb_havoc.recorder import ResultRecorder, read_binary
+
+RECORDS = [
+    (1_700_000_000_000_000_000, 2_500_000, 200, 512, ERROR_NONE, 0),
+    (1_700_000_000_100_000_000, 30_000_000, 503, 20, ERROR_HTTP_5XX, 1),
+    (1_700_000_000_200_000_000, 5_000_000_000, None, 0, ERROR_READ_TIMEOUT, 1),
+]
+
+
+def write(path, records=RECORDS, **options):
+    results = ResultRecorder(str(path), **options)
+    for record in records:
+        results.record(*record)
+    results.close()
+    return results
+
+
+def test_binary_round_trip(tmp_path):
+    path = tmp_path / 'run.bin'
+    written = write(path, batch_size=2, endpoints=['home', 'search'])
+    assert (written.format, written.recorded, written.dropped) == ('binary', 3, 0)
+    assert list(read_binary(str(path))) == RECORDS
+
+    with open(path, 'rb') as f:
+        assert recorder.read_binary_header(f) == (recorder.BINARY_VERSION, {'endpoints': ['home', 'search']})
+
+
+def test_binary_clamps_huge_bodies(tmp_path):
+    path = tmp_path / 'run.havoc'
+    write(path, [(1, 2, 200, 1 << 40, ERROR_NONE, 0)])
+    assert list(read_binary(str(path))) == [(1, 2, 200, 0xFFFFFFFF, ERROR_NONE, 0)]
+
+
+def test_ndjson_lines(tmp_path):
+    path = tmp_path / 'run.ndjson'
+    write(path, endpoints=['home', 'search'])
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0] == {'ts': 1_700_000_000.0, 'latency_ms': 2.5, 'status': 200, 'bytes': 512, 'error': None,
+                        'endpoint': 'home'}
+    assert lines[1]['error'] == 'http_5xx'
+    assert (lines[2]['status'], lines[2]['error'], lines[2]['endpoint']) == (None, 'read_timeout', 'search')
+
+
+def test_not_a_result_file(tmp_path):
+    path = tmp_path / 'run.bin'
+    path.write_bytes(b'{"ts": 1}\n')
+    with pytest.raises(ValueError):
+        list(read_binary(str(path)))
+    with pytest.raises(ValueError):
+        ResultRecorder(str(path), fmt='csv')
+
+
+def test_slow_disk_drops_whole_batches(tmp_path):
+    results = ResultRecorder(str(tmp_path / 'run.bin'), batch_size=1, max_pending=1)
+    released = threading.Event()
+    real_write = results._file.write
+
+    def stuck_write(data):
+        released.wait()
+        return real_write(data)
+
+    results._file.write = stuck_write
+    results.record(*RECORDS[0])
+    while not results._queue.empty():
+        time.sleep(0.001)
+
+    # One batch is being written, one waits in the queue, the rest have nowhere to go
+    for record in RECORDS * 2:
+        results.record(*record)
+    assert (results.recorded, results.dropped) == (2, 5)
+    released.set()
+    results.close()
+    assert len(list(read_binary(results.path))) == 2
+
+
+def test_file_names():
+    assert recorder.infer_format('results.BIN') == 'binary'
+    assert recorder.infer_format('results.jsonl') == 'ndjson'
+    assert recorder.shard_path('out/results.bin', 2) == 'out/results.2.bin'
+
+
+def test_engine_records_every_request(tmp_path):
+    path = str(tmp_path / 'run.bin')
+
+    async def hello(request):
+        return web.Response(text='hello')
+
+    async def check():
+        app = web.Application()
+        app.router.add_get('/', hello)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        engine = HavocEngine(f'http://127.0.0.1:{port}/', 4, handle_signals=False, headless=True,
+                             record_path=path, max_requests=30)
+        try:
+            await engine.run_window(1.0)
+        finally:
+            await runner.cleanup()
+
+    before = time.time_ns()
+    asyncio.run(check())
+    records = list(read_binary(path))
+    assert len(records) == 30
+    assert all(status == 200 and size == 5 and error == ERROR_NONE for _, _, status, size, error, _ in records)
+    assert all(before <= timestamp <= time.time_ns() for timestamp, *_ in records)
@@ -0,0 +1,158 @@
+"""
+Tests for the offline record analyzer
+"""
+
+import json
+import random
+
+import pytest
+
+from bsb_havoc import report
+from bsb_havoc.errors import ERROR_CONNECTION_RESET, ERROR_HTTP_5XX, ERROR_NONE, ERROR_READ_TIMEOUT
+from bsb_havoc.recorder import ResultRecorder
+
+START_NS = 1_700_000_000 * 10 ** 9
+RECORDS = 5000
+ENDPOINTS = ['home', 'search', 'login']
+
+requires_numpy = pytest.mark.skipif(report.numpy is None, reason="NumPy is not installed")
+
+
+def generate(count=RECORDS, seconds=20.0, seed=3):
+    """Records spread over ``seconds``: mostly 200s, some 404s, 5xx, timeouts and resets"""
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        timestamp = START_NS + int(index * seconds * 1e9 / count)
+        latency = int(rng.lognormvariate(15.5, 0.8))
+        roll = rng.random()
+        if roll < 0.02:
+            status, error = None, ERROR_READ_TIMEOUT
+        elif roll < 0.03:
+            status, error = None, ERROR_CONNECTION_RESET
+        elif roll < 0.06:
+            status, error = 503, ERROR_HTTP_5XX
+        elif roll < 0.10:
+            status, error = 404, ERROR_NONE
+        else:
+            status, error = 200, ERROR_NONE
+        records.append((timestamp, latency, status, rng.randrange(100, 5000) if status else 0,
+                        error, rng.randrange(len(ENDPOINTS))))
+    return records
+
+
+def write(path, records, endpoints=ENDPOINTS):
+    recorder = ResultRecorder(str(path), batch_size=512, endpoints=endpoints)
+    for record in records:
+        recorder.record(*record)
+    recorder.close()
+    assert recorder.dropped == 0
+    return str(path)
+
+
+def analyze(paths, **options):
+    summary = report.analyze(paths, chunk_records=700, **options)
+    summary.pop('created')
+    return summary
+
+
+@pytest.fixture
+def records():
+    return generate()
+
+
+@pytest.fixture
+def binary(tmp_path, records):
+    return write(tmp_path / 'run.bin', records)
+
+
+@requires_numpy
+@pytest.mark.parametrize('options', [{}, {'group_by': 'status'}, {'start': 2.5, 'end': 14.0}])
+def test_numpy_and_python_agree(binary, options):
+    vectorized = analyze([binary], vectorized=True, **options)
+    plain = analyze([binary], vectorized=False, **options)
+    assert json.dumps(vectorized, sort_keys=True) == json.dumps(plain, sort_keys=True)
+
+
+@requires_numpy
+def test_numpy_and_python_agree_on_ndjson(tmp_path, records):
+    path = write(tmp_path / 'run.ndjson', records)
+    assert analyze([path], vectorized=True) == analyze([path], vectorized=False)
+
+
+@pytest.mark.parametrize('vectorized', [pytest.param(True, marks=requires_numpy), False])
+def test_totals_match_the_records(binary, records, vectorized):
+    summary = analyze([binary], vectorized=vectorized)
+    result = summary['result']
+    failed = [record for record in records if record[4] != ERROR_NONE]
+    assert summary['records_scanned'] == summary['records_analyzed'] == len(records)
+    assert result['total_requests'] == len(records)
+    assert result['failed_requests'] == len(failed)
+    assert result['successful_requests'] == len(records) - len(failed)
+    assert result['bytes_received'] == sum(record[3] for record in records)
+    assert result['status_codes'] == {str(code): sum(1 for record in records if record[2] == code)
+                                      for code in (200, 404, 503)}
+    assert result['error_types']['read_timeout'] == sum(1 for record in records if record[4] == ERROR_READ_TIMEOUT)
+
+    groups = summary['groups']
+    assert summary['group_by'] == 'endpoint'
+    assert sorted(groups) == sorted(ENDPOINTS)
+    assert sum(group['total_requests'] for group in groups.values()) == len(records)
+
+    successes = sorted(record[1] for record in records if record[4] == ERROR_NONE)
+    p50 = result['median_response_time'] * 1e9
+    assert p50 == pytest.approx(successes[len(successes) // 2], rel=0.01)
+
+
+def test_time_series_covers_the_window(binary, records):
+    summary = analyze([binary], vectorized=False, start=5.0, end=15.0)
+    assert summary['window'] == {'start': 5.0, 'end': 15.0}
+    analyzed = [record for record in records if 5e9 <= record[0] - START_NS < 15e9]
+    assert summary['records_analyzed'] == len(analyzed)
+    series = summary['result']['timeseries']
+    assert len(series) == 10
+    assert sum(point['requests'] for point in series) == len(analyzed)
+
+
+def test_shards_analyze_like_one_file(tmp_path, records):
+    whole = analyze([write(tmp_path / 'run.bin', records)], vectorized=False)
+    shards = [write(tmp_path / f'run.{index}.bin', records[index::3]) for index in range(3)]
+    combined = analyze(shards, vectorized=False)
+    for summary in (whole, combined):
+        summary.pop('files')
+    assert combined == whole
+
+
+def test_ndjson_matches_binary(tmp_path, records):
+    binary = analyze([write(tmp_path / 'run.bin', records)], vectorized=False)
+    ndjson = analyze([write(tmp_path / 'run.ndjson', records)], vectorized=False)
+    for key in ('total_requests', 'failed_requests', 'bytes_received', 'status_codes', 'error_types'):
+        assert ndjson['result'][key] == binary['result'][key]
+    assert ndjson['result']['p99_response_time'] == pytest.approx(binary['result']['p99_response_time'], rel=0.01)
+
+
+def test_invalid_analyses(tmp_path, binary):
+    empty = write(tmp_path / 'empty.bin', [])
+    with pytest.raises(ValueError):
+        report.analyze([empty])
+    with pytest.raises(ValueError):
+        report.analyze([binary], start=5, end=5)
+    with pytest.raises(ValueError):
+        report.analyze([binary], group_by='minute')
+
+    anonymous = write(tmp_path / 'anonymous.bin', generate(100), endpoints=None)
+    with pytest.raises(ValueError):
+        report.analyze([anonymous], group_by='endpoint')
+
+
+def test_save_json_and_html(tmp_path, binary):
+    summary = report.analyze([binary], vectorized=False)
+    json_path = report.save(summary, str(tmp_path / 'report.json'))
+    with open(json_path, encoding='utf-8') as f:
+        assert json.load(f)['records_analyzed'] == RECORDS
+
+    html_path = report.save(summary, str(tmp_path / 'report.html'))
+    with open(html_path, encoding='utf-8') as f:
+        page = f.read()
+    assert page.lstrip().lower().startswith('<!doctype html')
+    assert '<svg' in page
@@ -0,0 +1,107 @@
+"""
+Tests for weighted scenarios and their alias table
+"""
+
+import json
+import random
+from collections import Counter
+
+import pytest
+
+from bsb_havoc.scenario import AliasTable, Scenario, TemplateStats
+
+PICKS = 100000
+
+
+def frequencies(table, count=PICKS):
+    table._random = random.Random(11).random
+    picks = Counter(table.pick() for _ in range(count))
+    return [picks[index] / count for index in range(table._count)]
+
+
+@pytest.mark.parametrize('weights', [[1], [1, 1], [10, 5, 1], [0.2, 0.3, 0.5], [7, 0, 3], [1, 99]])
+def test_alias_table_follows_weights(weights):
+    total = sum(weights)
+    for seen, weight in zip(frequencies(AliasTable(weights)), weights):
+        assert seen == pytest.approx(weight / total, abs=0.01)
+
+
+def test_alias_table_probabilities_are_exact():
+    # Every column's own share plus what other columns alias to it adds up to its weight
+    weights = [10, 5, 1, 4]
+    table = AliasTable(weights)
+    shares = [0.0] * len(weights)
+    for index, (probability, alias) in enumerate(zip(table._prob, table._alias)):
+        shares[index] += probability
+        shares[alias] += 1.0 - probability
+    total = sum(weights)
+    assert shares == pytest.approx([weight * len(weights) / total for weight in weights])
+
+
+def test_zero_weight_is_never_picked():
+    assert frequencies(AliasTable([0, 1, 0]), 5000) == [0, 1, 0]
+
+
+@pytest.mark.parametrize('weights', [[], [0, 0]])
+def test_alias_table_needs_a_positive_weight(weights):
+    with pytest.raises(ValueError):
+        AliasTable(weights)
+
+
+def test_scenario_compiles_templates():
+    scenario = Scenario({
+        'base_url': 'https://api.example.com/v1/',
+        'headers': {'Authorization': 'Bearer token'},
+        'requests': [
+            {'name': 'home', 'path': '/', 'weight': 10},
+            {'path': 'search?q=shoes', 'headers': {'authorization': 'Bearer other'}},
+            {'name': 'login', 'method': 'post', 'url': 'http://auth.example.com/login',
+             'json': {'user': 'demo'}, 'weight': 0.5},
+        ],
+    })
+    home, search, login = scenario.templates
+    assert scenario.names == ['home', 'request-2', 'login']
+    assert str(home.url) == 'https://api.example.com/v1/'
+    assert str(search.url) == 'https://api.example.com/v1/search?q=shoes'
+    assert search.headers['Authorization'] == 'Bearer other'
+    assert (login.method, login.body) == ('POST', b'{"user":"demo"}')
+    assert login.headers['Content-Type'] == 'application/json'
+    assert [template.weight for template in scenario.templates] == [10, 1, 0.5]
+
+
+def test_scenario_picks_by_weight(tmp_path):
+    path = tmp_path / 'scenario.json'
+    path.write_text(json.dumps({'requests': [
+        {'name': 'often', 'url': 'http://127.0.0.1/a', 'weight': 3},
+        {'name': 'rarely', 'url': 'http://127.0.0.1/b', 'weight': 1},
+    ]}))
+    scenario = Scenario.load(str(path))
+    assert frequencies(scenario._table) == pytest.approx([0.75, 0.25], abs=0.01)
+
+
+@pytest.mark.parametrize('spec', [
+    {},
+    {'requests': [{'path': '/'}]},
+    {'requests': [{'url': 'http://x/', 'method': 'BREW'}]},
+    {'requests': [{'url': 'http://x/', 'weight': -1}]},
+    {'requests': [{'url': 'relative/path'}]},
+    {'requests': [{'name': 'a', 'url': 'http://x/'}, {'name': 'a', 'url': 'http://x/b'}]},
+])
+def test_invalid_scenarios(spec):
+    with pytest.raises(ValueError):
+        Scenario(spec)
+
+
+def test_template_stats_drain_and_merge():
+    stats, merged = TemplateStats(), TemplateStats()
+    for latency in (1_000_000, 2_000_000, 3_000_000):
+        stats.total += 1
+        stats.histogram.record(latency)
+    stats.failed = 1
+
+    merged.merge(stats.drain())
+    assert (stats.total, stats.failed, stats.histogram.total_count) == (0, 0, 0)
+    summary = merged.summary()
+    assert summary['total_requests'] == 3
+    assert summary['failed_requests'] == 1
+    assert summary['avg_response_time'] == pytest.approx(0.002)
@@ -0,0 +1,93 @@
+"""
+Tests for the multi-process engine
+"""
+
+import asyncio
+import socket
+
+import pytest
+from aiohttp import web
+
+from bsb_havoc.payloads import PayloadPool
+from bsb_havoc.recorder import shard_path
+from bsb_havoc.sharding import ShardedHavocEngine, _split_budget, _split_concurrency
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def serve(received=None):
+    async def hello(request):
+        return web.Response(text='ok')
+
+    async def echo(request):
+        received.append(await request.read())
+        return web.Response(text='ok')
+
+    app = web.Application()
+    app.router.add_get('/', hello)
+    app.router.add_post('/', echo)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    port = free_port()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    return runner, f'http://127.0.0.1:{port}/'
+
+
+def test_work_is_split_between_shards():
+    assert _split_concurrency(10, 3) == [4, 3, 3]
+    assert sum(_split_budget(10, [4, 3, 3])) == 10
+    assert _split_budget(None, [4, 3, 3]) == []
+    assert shard_path('run.bin', 1) != shard_path('run.bin', 0)
+
+
+def test_shards_merge_into_one_result():
+    async def check():
+        runner, url = await serve()
+        engine = ShardedHavocEngine(url, 4, processes=2, handle_signals=False, headless=True)
+        try:
+            result = await engine.run_window(1.0)
+        finally:
+            await runner.cleanup()
+        return engine, result
+
+    engine, result = asyncio.run(check())
+    assert result.total_requests > 0
+    assert result.failed_requests == 0
+    assert result.status_codes == {200: result.total_requests}
+    assert engine.histogram.total_count == result.successful_requests
+    # Spawning the shards happens before the window opens, not inside it
+    assert result.total_time == pytest.approx(1.0, abs=0.3)
+    assert result.requests_per_second == pytest.approx(result.total_requests / result.total_time)
+
+
+def test_budget_is_shared_between_shards():
+    async def check():
+        runner, url = await serve()
+        engine = ShardedHavocEngine(url, 4, processes=2, handle_signals=False, headless=True, max_requests=30)
+        try:
+            result = await engine.run_window(2.0)
+        finally:
+            await runner.cleanup()
+        return result
+
+    assert asyncio.run(check()).total_requests == 30
+
+
+def test_shards_send_distinct_sequence_numbers():
+    received = []
+
+    async def check():
+        runner, url = await serve(received)
+        engine = ShardedHavocEngine(url, 4, processes=2, handle_signals=False, headless=True, max_requests=40,
+                                    method='POST', payload=PayloadPool.from_template('{{seq}}'))
+        try:
+            await engine.run_window(2.0)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(check())
+    assert sorted(int(body) for body in received) == list(range(1, 41))
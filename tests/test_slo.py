@@ -0,0 +1,116 @@
+"""
+Tests for SLO parsing and checking, and the capacity search built on it
+"""
+
+import asyncio
+
+import pytest
+
+from bsb_havoc import engine
+from bsb_havoc.search import SLO, CapacitySearch, SearchResult, SearchStep, parse_slo
+
+
+def result(**values):
+    defaults = dict(total_requests=1000, failed_requests=0, requests_per_second=500.0,
+                    median_response_time=0.010, p90_response_time=0.020, p95_response_time=0.030,
+                    p99_response_time=0.050, p999_response_time=0.100)
+    defaults.update(values)
+    defaults.setdefault('successful_requests', defaults['total_requests'] - defaults['failed_requests'])
+    return engine.TestResult(**defaults)
+
+
+def test_parse_every_term():
+    slo = parse_slo("p50<10ms, p90<20, p95<0.5s, p99<200ms, p99.9<1s, errors<0.1%, rps>1000")
+    assert slo == SLO(max_p50=0.010, max_p90=0.020, max_p95=0.5, max_p99=0.2, max_p999=1.0,
+                      max_error_rate=0.001, min_rps=1000.0)
+
+
+def test_parse_is_lenient_about_case_and_spacing():
+    slo = parse_slo(" P99 < 200 MS ,ERRORS<0.01,, RPS > 50/s ")
+    assert slo.max_p99 == pytest.approx(0.2)
+    assert slo.max_error_rate == 0.01
+    assert slo.min_rps == 50.0
+
+
+def test_parse_empty():
+    assert parse_slo("") == SLO()
+    assert SLO().describe() == 'none'
+
+
+@pytest.mark.parametrize('text', ["p98<10ms", "p99>10ms", "errors<", "latency<1s", "rps<100"])
+def test_parse_rejects_invalid_terms(text):
+    with pytest.raises(ValueError):
+        parse_slo(text)
+
+
+def test_describe_round_trips():
+    slo = parse_slo("p95<300ms,errors<1%,rps>200")
+    assert slo.describe() == "p95<300ms, errors<1%, rps>200"
+    assert parse_slo(slo.describe()) == slo
+
+
+def test_result_within_slo():
+    assert parse_slo("p99<100ms,errors<1%,rps>100").violations(result()) == []
+
+
+def test_every_violation_is_reported():
+    slo = parse_slo("p50<5ms,p99<40ms,p99.9<50ms,errors<1%,rps>1000")
+    violations = slo.violations(result(failed_requests=50))
+    assert [violation.split()[0] for violation in violations] == ['p50', 'p99', 'p99.9', 'errors', 'rps']
+    assert "errors 5.00% > 1.00%" in violations
+
+
+def test_limits_are_inclusive():
+    assert parse_slo("p99<50ms").violations(result(p99_response_time=0.050)) == []
+
+
+def test_latency_limits_fail_without_successes():
+    slo = parse_slo("p50<10ms,p99<100ms,errors<100%")
+    violations = slo.violations(result(failed_requests=1000, median_response_time=0, p99_response_time=0))
+    assert violations == ["p50 unknown: no successful requests", "p99 unknown: no successful requests"]
+
+
+def test_error_rate_fails_without_requests():
+    violations = parse_slo("errors<1%").violations(result(total_requests=0))
+    assert violations == ["errors 100.00% > 1.00%"]
+
+
+def test_knee_is_highest_passing_level():
+    search = SearchResult('concurrency', SLO())
+    search.steps = [SearchStep(10, result(), []), SearchStep(40, result(), ['p99']),
+                    SearchStep(20, result(), [])]
+    assert search.knee.level == 20
+
+    search.steps = [SearchStep(10, result(), ['p99'])]
+    assert search.knee is None
+
+
+class ScriptedSearch(CapacitySearch):
+    """Capacity search whose levels pass up to ``capacity`` without running load"""
+
+    def __init__(self, capacity, stop_after=None, **options):
+        super().__init__('http://127.0.0.1/', parse_slo("p99<100ms"), verbose=False, **options)
+        self.capacity = capacity
+        self.stop_after = stop_after
+        self.measured = []
+
+    async def _measure(self, level):
+        self.measured.append(level)
+        if len(self.measured) == self.stop_after:
+            self.stop()
+        return SearchStep(level, result(), [] if level <= self.capacity else ['p99'])
+
+
+def test_search_narrows_down_the_knee():
+    search = ScriptedSearch(300, start=10, max_level=10000)
+    found = asyncio.run(search.run())
+    assert search.measured[:6] == [10, 20, 40, 80, 160, 320]
+    assert 300 * (1 - search.precision) <= found.knee.level <= 300
+
+
+def test_stop_ends_the_search_and_keeps_max_level():
+    search = ScriptedSearch(300, stop_after=2, start=10, max_level=10000)
+    found = asyncio.run(search.run())
+    assert search.measured == [10, 20]
+    assert found.knee.level == 20
+    assert search.max_level == 10000
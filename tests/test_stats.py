@@ -0,0 +1,72 @@
+"""
+Tests for the hot-path request counters
+"""
+
+import asyncio
+
+from bsb_havoc import engine
+from bsb_havoc.errors import ERROR_CONNECT_REFUSED, ERROR_HTTP_5XX, ERROR_NONE, ERROR_READ_TIMEOUT
+from bsb_havoc.stats import STATUS_CLASSES, StatShard
+
+
+def shard():
+    stats = StatShard()
+    stats.status_counts[200] += 7
+    stats.status_counts[404] += 2
+    stats.status_counts[503] += 1
+    stats.error_counts[ERROR_HTTP_5XX] += 1
+    stats.status_counts[0] += 3
+    stats.error_counts[ERROR_READ_TIMEOUT] += 3
+    stats.bytes_received = 1000
+    stats.bytes_sent = 50
+    stats.late_requests = 4
+    stats.max_schedule_lag = 0.25
+    return stats
+
+
+def test_shard_counts():
+    stats = shard()
+    assert stats.total == 13
+    assert stats.status_codes() == {200: 7, 404: 2, 503: 1}
+    assert dict(zip(STATUS_CLASSES, stats.status_classes())) == \
+        {'failed': 3, '1xx': 0, '2xx': 7, '3xx': 0, '4xx': 2, '5xx': 1}
+
+
+def test_fold_adds_up_and_resets():
+    results = engine.TestResult(max_schedule_lag=0.5)
+    for _ in range(2):
+        stats = shard()
+        stats.fold_into(results)
+        assert stats.total == 0 and not any(stats.error_counts)
+        assert (stats.bytes_received, stats.late_requests, stats.max_schedule_lag) == (0, 0, 0.0)
+
+    assert (results.total_requests, results.successful_requests, results.failed_requests) == (26, 18, 8)
+    assert results.status_codes == {200: 14, 404: 4, 503: 2}
+    assert results.error_types == {'read_timeout': 6, 'http_5xx': 2}
+    assert (results.bytes_received, results.bytes_sent, results.late_requests) == (2000, 100, 8)
+    assert results.max_schedule_lag == 0.5
+
+
+def test_folding_an_empty_shard_changes_nothing():
+    results = engine.TestResult()
+    StatShard().fold_into(results)
+    assert results == engine.TestResult()
+
+
+def test_engine_records_into_the_shard():
+    async def check():
+        havoc = engine.HavocEngine('http://127.0.0.1:9/', 4, handle_signals=False)
+        havoc._record(True, 1_000_000, 200, 10, ERROR_NONE)
+        havoc._record(True, 2_000_000, 500, 5, ERROR_NONE)
+        havoc._record(False, 3_000_000, None, 0, ERROR_CONNECT_REFUSED)
+        assert havoc.results.total_requests == 0
+        havoc._fold_stats()
+        return havoc
+
+    havoc = asyncio.run(check())
+    results = havoc.results
+    assert (results.total_requests, results.successful_requests, results.failed_requests) == (3, 1, 2)
+    assert results.status_codes == {200: 1, 500: 1}
+    assert results.error_types == {'http_5xx': 1, 'connect_refused': 1}
+    assert results.bytes_received == 15
+    assert havoc.histogram.total_count == 1
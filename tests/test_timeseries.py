@@ -0,0 +1,103 @@
+"""
+Tests for the rolling live metrics and the run history
+"""
+
+import pytest
+
+from bsb_havoc import engine
+from bsb_havoc.histogram import LatencyHistogram
+from bsb_havoc.timeseries import RollingMetrics, condense
+
+
+class Traffic:
+    """Feeds a histogram and TestResult the way the engine folds its counters"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.results = engine.TestResult()
+        self.rolling = RollingMetrics(self.histogram, interval=1.0)
+        self.start = self.rolling._started
+
+    def send(self, requests, latency_ms=10, failed=0):
+        for _ in range(requests - failed):
+            self.histogram.record(latency_ms * 1_000_000)
+        self.results.total_requests += requests
+        self.results.failed_requests += failed
+        self.results.bytes_received += requests * 100
+
+    def reset(self):
+        self.histogram.reset()
+        self.results = engine.TestResult()
+        self.rolling.rebase()
+
+
+def test_every_tick_is_a_row():
+    traffic = Traffic()
+    for second, requests in enumerate([100, 200, 300], 1):
+        traffic.send(requests, latency_ms=second * 10, failed=requests // 10)
+        traffic.rolling.tick(traffic.results, traffic.start + second)
+
+    series = traffic.rolling.series
+    assert [point['elapsed'] for point in series] == [1.0, 2.0, 3.0]
+    assert [point['requests_per_second'] for point in series] == pytest.approx([100, 200, 300])
+    assert series[1]['error_rate'] == pytest.approx(0.1)
+    assert series[2]['p50_response_time'] == pytest.approx(0.03, rel=0.01)
+    assert len(traffic.rolling.interval_histograms) == 3
+
+    window = traffic.rolling.window(2)
+    assert window['requests'] == 500
+    assert window['requests_per_second'] == pytest.approx(250)
+
+
+def test_short_final_interval_joins_the_previous_row():
+    traffic = Traffic()
+    traffic.send(100)
+    traffic.rolling.tick(traffic.results, traffic.start + 1)
+    traffic.send(1, latency_ms=50)
+    traffic.rolling.close(traffic.results, traffic.start + 1.001)
+
+    series = traffic.rolling.series
+    assert len(series) == 1
+    assert series[0]['elapsed'] == pytest.approx(1.001)
+    assert series[0]['requests'] == 101
+    assert series[0]['requests_per_second'] == pytest.approx(101 / 1.001)
+    assert series[0]['max_response_time'] == pytest.approx(0.05, rel=0.01)
+    assert LatencyHistogram.from_dict(traffic.rolling.interval_histograms[0]).total_count == 101
+    assert traffic.rolling.window(1)['requests'] == 101
+
+
+def test_full_final_interval_is_its_own_row():
+    traffic = Traffic()
+    traffic.send(100)
+    traffic.rolling.tick(traffic.results, traffic.start + 1)
+    traffic.send(150)
+    traffic.rolling.close(traffic.results, traffic.start + 2.5)
+    assert [point['requests_per_second'] for point in traffic.rolling.series] == pytest.approx([100, 100])
+
+
+def test_rows_do_not_merge_across_phases():
+    traffic = Traffic()
+    traffic.send(100)
+    traffic.rolling.close(traffic.results, traffic.start + 1)
+    traffic.reset()
+
+    # The next phase ends before its first tick: its only row stays its own
+    traffic.send(5)
+    traffic.rolling.close(traffic.results, traffic.start + 1.2)
+    series, histograms = traffic.rolling.history(1)
+    assert [point['requests'] for point in traffic.rolling.series] == [100, 5]
+    assert series[0]['elapsed'] == pytest.approx(0.2)
+    assert series[0]['requests_per_second'] == pytest.approx(25)
+    assert len(histograms) == 1
+
+
+def test_condense_keeps_spikes():
+    series = [{'elapsed': float(second), 'requests': 100, 'failed': 0, 'p50_response_time': 0.01,
+               'p99_response_time': 0.5 if second == 7 else 0.02, 'max_response_time': 0.6 if second == 7 else 0.03}
+              for second in range(1, 25)]
+    segments = condense(series, rows=6)
+    assert len(segments) == 6
+    assert segments[0]['start'] == 0.0 and segments[-1]['end'] == 24.0
+    assert all(segment['requests_per_second'] == pytest.approx(100) for segment in segments)
+    assert max(segments, key=lambda segment: segment['p99_response_time'])['start'] == 4.0
+    assert condense([]) == []